@@ -5,7 +5,8 @@ from sklearn.model_selection import train_test_split
 import pickle
 import os
 from strategy_tables import BasicStrategy
-from card_counting import CardCounter
+from card_counting import CardCounter, CountTracker
+from dealer_outcomes import player_win_probability
 
 class AICoach:
     def __init__(self):
@@ -196,7 +197,7 @@ class AICoach:
         
         # Calculate win probability estimate
         win_probability = self._estimate_win_probability(
-            player_total, dealer_value, action, true_count
+            player_total, dealer_value, action, is_soft
         )
         
         # Generate reasoning
@@ -213,35 +214,9 @@ class AICoach:
         }
     
     def _estimate_win_probability(self, player_total: int, dealer_value: int, 
-                                action: str, true_count: float) -> float:
-        """Estimate win probability for given situation"""
-        # Base probabilities from basic strategy tables
-        base_probs = {
-            'hit': 0.45,
-            'stand': 0.42,
-            'double': 0.48,
-            'split': 0.46
-        }
-        
-        base_prob = base_probs.get(action.lower(), 0.45)
-        
-        # Adjust for player total
-        if player_total >= 17:
-            base_prob += 0.1
-        elif player_total <= 11:
-            base_prob += 0.05
-        
-        # Adjust for dealer upcard
-        if dealer_value in [2, 3, 4, 5, 6]:  # Dealer weak
-            base_prob += 0.1
-        elif dealer_value in [9, 10, 11]:  # Dealer strong
-            base_prob -= 0.1
-        
-        # Adjust for count
-        count_adjustment = true_count * 0.02
-        base_prob += count_adjustment
-        
-        return max(0.1, min(0.9, base_prob))
+                                action: str, is_soft: bool = False) -> float:
+        """Win probability for the action, looked up from the dealer outcome tables"""
+        return player_win_probability(player_total, dealer_value, action, is_soft)
     
     def _generate_reasoning(self, action: str, basic_action: str, player_total: int, 
                           dealer_value: int, true_count: float, confidence: float) -> str:
@@ -270,9 +245,9 @@ class AICoach:
         
         return "; ".join(reasons)
     
-    def get_count_info(self, dealt_cards: List) -> Dict:
+    def get_count_info(self, dealt_cards: List, tracker: Optional[CountTracker] = None) -> Dict:
         """Get card counting information"""
-        return self.card_counter.get_count_info(dealt_cards)
+        return self.card_counter.get_count_info(dealt_cards, tracker=tracker)
     
     def get_basic_strategy_chart(self) -> Dict:
         """Get basic strategy chart data for visualization"""
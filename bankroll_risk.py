@@ -0,0 +1,191 @@
+"""
+Bankroll paths and risk of ruin.
+
+A game is described by how often each true count comes up, the bet a ramp
+places at that count, and the distribution of net results (in initial bets)
+of a hand played at it.  Thousands of bankroll paths are simulated at once
+as a paths x hands matrix, one chunk of hands at a time: results are drawn
+in one vectorized choice over every (count, result) pair and turned into
+bankroll paths with cumulative sums, and ruin, doubling and drawdowns are
+read off the paths with array reductions.
+"""
+
+import math
+import numpy as np
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+DEFAULT_QUANTILES = (0.5, 0.9, 0.95, 0.99)
+
+# Slices of the guide table used to sample hand results
+GUIDE_CELLS = 1024
+
+
+class BetRamp:
+    """Bet size by true count: steps map the lowest true count of a step to its bet"""
+
+    def __init__(self, steps: Dict[float, float], min_bet: float = 1.0):
+        self.min_bet = min_bet
+        self.thresholds = np.array(sorted(steps), dtype=float)
+        self.step_bets = np.array([steps[threshold] for threshold in self.thresholds], dtype=float)
+
+    def bets(self, true_counts) -> np.ndarray:
+        """Bet for each true count (min_bet below the lowest step)"""
+        step = np.searchsorted(self.thresholds, np.asarray(true_counts, dtype=float), side='right') - 1
+        return np.where(step >= 0, self.step_bets[np.maximum(step, 0)], self.min_bet)
+
+    def bet(self, true_count: float) -> float:
+        return float(self.bets(true_count))
+
+
+def outcome_distributions(true_counts: np.ndarray, nets: np.ndarray,
+                          resolution: float = 1.0) -> Tuple[Dict[float, float], Dict[float, Dict[float, float]]]:
+    """Count frequencies and per-count result distributions from simulated hands.
+
+    true_counts and nets are per-hand arrays (nets in initial bets, e.g. from
+    BatchSimulator.play); counts are floored to multiples of resolution.
+    """
+    buckets = np.floor(np.asarray(true_counts) / resolution) * resolution
+    nets = np.asarray(nets, dtype=float)
+
+    frequencies = {}
+    distributions = {}
+    for bucket in np.unique(buckets).tolist():
+        bucket_nets = nets[buckets == bucket]
+        frequencies[bucket] = len(bucket_nets) / len(nets)
+        results, counts = np.unique(bucket_nets, return_counts=True)
+        distributions[bucket] = dict(zip(results.tolist(), (counts / counts.sum()).tolist()))
+    return frequencies, distributions
+
+
+def diffusion_risk_of_ruin(ev_per_hand: float, variance_per_hand: float, bankroll: float) -> float:
+    """Long-run risk of ruin of a game from its per-hand mean and variance"""
+    if ev_per_hand <= 0:
+        return 1.0
+    if variance_per_hand <= 0:
+        return 0.0
+    return math.exp(-2 * ev_per_hand * bankroll / variance_per_hand)
+
+
+class RiskSimulator:
+    def __init__(self, ramp: BetRamp, frequencies: Dict[float, float],
+                 distributions: Dict[float, Dict[float, float]]):
+        self.ramp = ramp
+
+        # Flatten to one categorical distribution over (true count, result) pairs
+        results = []
+        probabilities = []
+        total_frequency = sum(frequencies.values())
+        for true_count, frequency in frequencies.items():
+            bet = ramp.bet(true_count)
+            distribution = distributions[true_count]
+            scale = sum(distribution.values())
+            for net, probability in distribution.items():
+                results.append(bet * net)
+                probabilities.append(frequency / total_frequency * probability / scale)
+
+        # Pairs that move the bankroll by the same amount are one category
+        self.results, category = np.unique(np.array(results, dtype=float), return_inverse=True)
+        self.probabilities = np.bincount(category.ravel(), weights=probabilities)
+        self._cdf = np.cumsum(self.probabilities)
+        self._cdf[-1] = 1.0
+        # Guide table: first category whose cdf passes each of GUIDE_CELLS equal
+        # slices of [0, 1), so sampling needs a lookup instead of a binary search
+        self._guide = np.searchsorted(self._cdf, np.arange(GUIDE_CELLS) / GUIDE_CELLS, side='right')
+
+        self.ev_per_hand = float(self.probabilities @ self.results)
+        self.variance_per_hand = float(self.probabilities @ self.results ** 2) - self.ev_per_hand ** 2
+
+    @property
+    def n0(self) -> Optional[float]:
+        """Hands needed for the expected win to equal one standard deviation"""
+        if self.ev_per_hand <= 0:
+            return None
+        return self.variance_per_hand / self.ev_per_hand ** 2
+
+    def theoretical_risk_of_ruin(self, bankroll: float) -> float:
+        """Long-run risk of ruin from the diffusion approximation"""
+        return diffusion_risk_of_ruin(self.ev_per_hand, self.variance_per_hand, bankroll)
+
+    def sample(self, shape: Tuple[int, ...], rng: np.random.Generator) -> np.ndarray:
+        """Random hand results (in bankroll units) of the given shape"""
+        uniform = rng.random(shape)
+        category = self._guide[(uniform * GUIDE_CELLS).astype(np.intp)]
+        # Step forward to the category whose cdf range holds the draw (rarely more than once)
+        behind = uniform >= self._cdf[category]
+        while behind.any():
+            category += behind
+            behind = uniform >= self._cdf[category]
+        return self.results[category]
+
+    def simulate(self, bankroll: float, num_hands: int, num_paths: int = 10000,
+                 chunk_hands: int = 1000, seed: Optional[int] = None,
+                 quantiles: Sequence[float] = DEFAULT_QUANTILES,
+                 on_chunk: Optional[Callable[[], None]] = None) -> Dict:
+        """Play num_paths bankrolls for num_hands hands each.
+
+        A path is ruined when its bankroll reaches zero and stops playing
+        there.  Memory is num_paths x chunk_hands.  on_chunk is called after
+        every chunk and may raise to abandon the run.
+        """
+        rng = np.random.default_rng(seed)
+        rows = np.arange(num_paths)
+
+        current = np.full(num_paths, float(bankroll))
+        peak = current.copy()
+        max_drawdown = np.zeros(num_paths)
+        ruin_hand = np.full(num_paths, -1)
+        double_hand = np.full(num_paths, -1)
+        alive = np.ones(num_paths, dtype=bool)
+
+        for start in range(0, num_hands, chunk_hands):
+            size = min(chunk_hands, num_hands - start)
+            steps = self.sample((num_paths, size), rng)
+            steps[~alive] = 0
+            paths = current[:, None] + np.cumsum(steps, axis=1)
+
+            # Freeze paths at the hand that ruins them
+            broke = paths <= 0
+            ruined = alive & broke.any(axis=1)
+            first = np.argmax(broke, axis=1)
+            after_ruin = ruined[:, None] & (np.arange(size) > first[:, None])
+            paths = np.where(after_ruin, paths[rows, first][:, None], paths)
+            ruin_hand[ruined] = start + first[ruined] + 1
+            alive &= ~ruined
+
+            doubled = paths >= 2 * bankroll
+            reached = (double_hand < 0) & doubled.any(axis=1)
+            double_hand[reached] = start + np.argmax(doubled[reached], axis=1) + 1
+
+            running_peak = np.maximum(np.maximum.accumulate(paths, axis=1), peak[:, None])
+            max_drawdown = np.maximum(max_drawdown, (running_peak - paths).max(axis=1))
+            peak = running_peak[:, -1]
+            current = paths[:, -1]
+            if on_chunk is not None:
+                on_chunk()
+
+        risk_of_ruin = float(np.mean(~alive))
+        return {
+            'paths': num_paths,
+            'hands': num_hands,
+            'bankroll': bankroll,
+            'ev_per_hand': self.ev_per_hand,
+            'sd_per_hand': math.sqrt(self.variance_per_hand),
+            'n0': self.n0,
+            'risk_of_ruin': risk_of_ruin,
+            'risk_of_ruin_std_error': math.sqrt(risk_of_ruin * (1 - risk_of_ruin) / num_paths),
+            'theoretical_risk_of_ruin': self.theoretical_risk_of_ruin(bankroll),
+            'ruin_hand_quantiles': _quantiles(ruin_hand[ruin_hand > 0], quantiles),
+            'double_probability': float(np.mean(double_hand > 0)),
+            'time_to_double_quantiles': _quantiles(double_hand[double_hand > 0], quantiles),
+            'max_drawdown_quantiles': _quantiles(max_drawdown, quantiles),
+            'final_bankroll_mean': float(current.mean()),
+            'final_bankroll_quantiles': _quantiles(current, quantiles)
+        }
+
+
+def _quantiles(values: np.ndarray, quantiles: Sequence[float]) -> Optional[Dict[str, float]]:
+    """{'p50': ..., 'p90': ...} of values, or None when there are none"""
+    if len(values) == 0:
+        return None
+    points = np.quantile(values, quantiles)
+    return {f'p{round(q * 100):g}': float(point) for q, point in zip(quantiles, points)}
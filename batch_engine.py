@@ -0,0 +1,244 @@
+import numpy as np
+from typing import Dict, Optional, Tuple
+from ev_solver import RuleSet
+from strategy_tables import BasicStrategy
+from decision_table import DecisionTable, HIT, STAND, DOUBLE, SPLIT, SURRENDER
+
+# Blackjack values of one 52-card deck (Ace = 11, like Card.get_value)
+ONE_DECK_VALUES = np.array(
+    [2, 3, 4, 5, 6, 7, 8, 9] * 4 + [10] * 16 + [11] * 4, dtype=np.int8
+)
+
+# Hi-Lo tag indexed by card value
+HI_LO_TAGS = np.array([0, 0, 1, 1, 1, 1, 1, 0, 0, 0, -1, -1], dtype=np.int16)
+
+
+class BatchSimulator:
+    """
+    Vectorized blackjack engine that plays many hands at once.
+
+    Every hand is dealt from its own fixed-width slab of consecutive cards
+    cut from a shuffled shoe.  Cards are drawn from the slab in table order
+    (player, dealer up, player, dealer hole, then hits), so a hand plays out
+    exactly as it would at the table.  Slab cards a hand does not use are
+    burned face up, which keeps every hand's starting count known in advance
+    and lets count-based betting be computed for a whole shoe in one pass.
+    """
+
+    def __init__(self, basic_strategy: Optional[BasicStrategy] = None,
+                 hit_soft_17: bool = True, blackjack_payout: float = 1.5,
+                 cards_per_hand: int = 12, batch_size: int = 100000,
+                 double_after_split: bool = True, max_split_hands: int = 4,
+                 resplit_aces: bool = False, surrender: bool = True):
+        # Without a strategy, play the one solved for these table rules
+        self.basic_strategy = basic_strategy or BasicStrategy(RuleSet(
+            hit_soft_17=hit_soft_17, double_after_split=double_after_split,
+            surrender=surrender, blackjack_payout=blackjack_payout))
+        self.hit_soft_17 = hit_soft_17
+        self.blackjack_payout = blackjack_payout
+        self.double_after_split = double_after_split
+        self.max_split_hands = max_split_hands
+        self.resplit_aces = resplit_aces
+        self.surrender = surrender
+        self.cards_per_hand = cards_per_hand
+        self.batch_size = batch_size
+        self.decision_table = DecisionTable(self.basic_strategy)
+
+    def deal_slabs(self, num_hands: int, num_decks: int, penetration: float,
+                   rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+        """Cut shuffled shoes into one card slab per hand.
+
+        Returns the (num_hands, cards_per_hand) slab matrix and, per hand, the
+        number of cards already seen in the shoe before that hand.
+        """
+        shoe = np.tile(ONE_DECK_VALUES, num_decks)
+        width = self.cards_per_hand
+        hands_per_shoe = max(1, int(len(shoe) * penetration) // width)
+        num_shoes = -(-num_hands // hands_per_shoe)
+
+        shoes = np.tile(shoe, (num_shoes, 1))
+        rng.permuted(shoes, axis=1, out=shoes)
+        slabs = shoes[:, :hands_per_shoe * width].reshape(-1, width)[:num_hands]
+
+        cards_seen = (np.arange(num_hands) % hands_per_shoe) * width
+        return slabs, cards_seen
+
+    def running_counts(self, slabs: np.ndarray, cards_seen: np.ndarray) -> np.ndarray:
+        """Hi-Lo running count at the start of every hand (resets each shoe)"""
+        slab_counts = HI_LO_TAGS[slabs].sum(axis=1)
+        running = np.cumsum(slab_counts) - slab_counts
+        shoe_start = np.flatnonzero(cards_seen == 0)
+        shoe_offset = np.repeat(running[shoe_start], np.diff(np.append(shoe_start, len(slabs))))
+        return running - shoe_offset
+
+    def play(self, slabs: np.ndarray, true_counts: Optional[np.ndarray] = None,
+             decision_table: Optional[DecisionTable] = None,
+             rng: Optional[np.random.Generator] = None) -> Dict[str, np.ndarray]:
+        """Play every slab as one round and settle it against the dealer.
+
+        decision_table defaults to plain basic strategy; its count overlay,
+        if any, is applied with true_counts.  Pairs the strategy splits are
+        split up to max_split_hands hands (aces once unless resplit_aces, and
+        split aces take one card), doubling after a split follows
+        double_after_split, and late surrender is offered on the first two
+        cards when surrender is on.
+
+        A round plays one hand at a time, in table order, from its own slab:
+        split hands wait their turn as a per-round count (they all start with
+        the pair card) and finished hands go to fixed (rounds, max_split_hands)
+        buffers, so splitting allocates nothing per hand.
+
+        Returns per-round arrays: total bet (in initial bets, counting
+        doubles and splits), net result in initial bets, outcome (1 win,
+        -1 loss, 0 push), cards used and number of hands played.
+        """
+        table = decision_table or self.decision_table
+        n = len(slabs)
+        width = slabs.shape[1]
+        hard_value = np.where(slabs == 11, 1, slabs).astype(np.int16)
+        max_hands = self.max_split_hands
+
+        upcard = slabs[:, 1].astype(np.int16)
+        d_hard = hard_value[:, 1] + hard_value[:, 3]
+        d_aces = (slabs[:, 1] == 11).astype(np.int16) + (slabs[:, 3] == 11)
+        cursor = np.full(n, 4, dtype=np.int16)
+
+        # The hand each round is playing
+        p_hard = hard_value[:, 0] + hard_value[:, 2]
+        p_aces = (slabs[:, 0] == 11).astype(np.int16) + (slabs[:, 2] == 11)
+        num_cards = np.full(n, 2, dtype=np.int16)
+        doubled = np.zeros(n, dtype=bool)
+        is_pair = slabs[:, 0] == slabs[:, 2]
+
+        # Split state per round; every split hand starts with the pair card
+        pair_card = slabs[:, 0].astype(np.int16)
+        pair_hard_value = hard_value[:, 0]
+        split = np.zeros(n, dtype=bool)
+        num_hands = np.ones(n, dtype=np.int16)
+        hand_index = np.zeros(n, dtype=np.int16)
+        surrendered = np.zeros(n, dtype=bool)
+
+        # Finished hands: best total and bet multiplier (0 where there is no hand)
+        final_total = np.zeros((n, max_hands), dtype=np.int16)
+        final_bet = np.zeros((n, max_hands), dtype=np.int16)
+
+        player_bj = (p_aces > 0) & (p_hard == 11)
+        dealer_bj = (d_aces > 0) & (d_hard == 11)
+
+        def draw(idx):
+            nonlocal slabs, hard_value, width
+            short = cursor[idx] >= width
+            if short.any():
+                # Extremely long hands run past the slab; extend it with fresh cards
+                extra = (rng or np.random.default_rng()).choice(ONE_DECK_VALUES, size=(n, 4))
+                slabs = np.concatenate([slabs, extra], axis=1)
+                hard_value = np.where(slabs == 11, 1, slabs).astype(np.int16)
+                width = slabs.shape[1]
+            values = hard_value[idx, cursor[idx]]
+            cursor[idx] += 1
+            return values
+
+        def finish(idx):
+            """Store the current hands of rounds idx; returns the rounds moving to a next split hand"""
+            total, _ = _best_totals(p_hard[idx], p_aces[idx])
+            final_total[idx, hand_index[idx]] = total
+            final_bet[idx, hand_index[idx]] = np.where(doubled[idx], 2, 1)
+
+            following = idx[hand_index[idx] + 1 < num_hands[idx]]
+            hand_index[following] += 1
+            p_hard[following] = pair_hard_value[following]
+            p_aces[following] = pair_card[following] == 11
+            num_cards[following] = 1
+            doubled[following] = False
+            return following
+
+        # Player decisions: each pass, every active round draws at most one card
+        active = np.flatnonzero(~(player_bj | dealer_bj))
+        while len(active):
+            waiting = num_cards[active] == 1
+            receiving = active[waiting]
+            deciding = active[~waiting]
+
+            total, soft = _best_totals(p_hard[deciding], p_aces[deciding])
+            two_cards = num_cards[deciding] == 2
+            after_split = split[deciding]
+            split_aces = after_split & (pair_card[deciding] == 11)
+
+            can_double = two_cards & (~after_split | self.double_after_split)
+            can_split = (two_cards & is_pair[deciding] & (num_hands[deciding] < max_hands)
+                         & (~split_aces | self.resplit_aces))
+            pair_value = np.where(can_split, pair_card[deciding], 0)
+
+            action = table.decide(total, soft, upcard[deciding], can_double, pair_value,
+                                  true_counts[deciding] if true_counts is not None else None,
+                                  can_surrender=self.surrender & two_cards & ~after_split)
+
+            # Split aces take no more cards unless they are split again
+            action = np.where(split_aces & (action != SPLIT), STAND, action)
+            # A double the hand cannot take is a hit (the table never asks for one)
+            action = np.where((action == DOUBLE) & ~can_double, HIT, action)
+
+            splitting = deciding[action == SPLIT]
+            split[splitting] = True
+            num_hands[splitting] += 1
+            p_hard[splitting] = pair_hard_value[splitting]
+            p_aces[splitting] = pair_card[splitting] == 11
+            num_cards[splitting] = 1
+
+            double = (action == DOUBLE) & can_double
+            doubled[deciding[double]] = True
+            surrendering = deciding[action == SURRENDER]
+            surrendered[surrendering] = True
+
+            # Hits, doubles, and second cards for split hands
+            receiving = np.concatenate([receiving, splitting])
+            drawing = np.concatenate([deciding[(action == HIT) | double], receiving])
+            values = draw(drawing)
+            p_hard[drawing] += values
+            p_aces[drawing] += values == 1
+            num_cards[drawing] += 1
+            is_pair[receiving] = values[len(drawing) - len(receiving):] == pair_hard_value[receiving]
+
+            new_total, _ = _best_totals(p_hard[drawing], p_aces[drawing])
+            done = (new_total >= 21) | doubled[drawing]
+            finished = np.concatenate([deciding[action == STAND], surrendering, drawing[done]])
+            active = np.concatenate([drawing[~done], finish(finished)])
+
+        # Dealer plays out every round with a live hand
+        live = ((final_total <= 21) & (final_bet > 0)).any(axis=1)
+        active = np.flatnonzero(~(player_bj | dealer_bj) & ~surrendered & live)
+        while len(active):
+            total, soft = _best_totals(d_hard[active], d_aces[active])
+            hits = (total < 17) | (self.hit_soft_17 & (total == 17) & soft)
+            active = active[hits]
+            values = draw(active)
+            d_hard[active] += values
+            d_aces[active] += values == 1
+        d_total, _ = _best_totals(d_hard, d_aces)
+
+        # Settlement in units of the initial bet
+        hand_outcome = np.where(
+            final_total > 21, -1,
+            np.where(d_total[:, None] > 21, 1, np.sign(final_total - d_total[:, None]))
+        )
+        net = (hand_outcome * final_bet).sum(axis=1).astype(np.float64)
+        bet = np.maximum(final_bet.sum(axis=1), 1).astype(np.int16)
+
+        net[surrendered] = -0.5
+        net[dealer_bj] = -1
+        net[player_bj] = np.where(dealer_bj[player_bj], 0, self.blackjack_payout)
+
+        return {
+            'multiplier': bet,
+            'net': net,
+            'outcome': np.sign(net).astype(np.int8),
+            'cards_used': cursor,
+            'hands': num_hands,
+        }
+
+
+def _best_totals(hard: np.ndarray, aces: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Best hand total and soft flag from the hard total and ace count"""
+    soft = (aces > 0) & (hard + 10 <= 21)
+    return np.where(soft, hard + 10, hard), soft
+
@@ -1,83 +1,46 @@
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+from ev_solver import RuleSet, get_strategy_tables
 
 class BJABasicStrategy:
     """
-    Exact Basic Strategy implementation based on the BJA (Blackjack Apprenticeship) chart
+    Basic Strategy in the BJA (Blackjack Apprenticeship) chart layout, generated
+    by the EV solver for the given rules
     """
-    def __init__(self):
-        # Pair splitting strategy from the BJA chart
-        self.pair_strategy = {
-            # Format: pair_value: {dealer_upcard: action}
-            11: {2: 'split', 3: 'split', 4: 'split', 5: 'split', 6: 'split', 7: 'split', 8: 'split', 9: 'split', 10: 'split', 11: 'split'},  # A,A
-            10: {2: 'stand', 3: 'stand', 4: 'stand', 5: 'stand', 6: 'stand', 7: 'stand', 8: 'stand', 9: 'stand', 10: 'stand', 11: 'stand'},  # 10,10
-            9: {2: 'split', 3: 'split', 4: 'split', 5: 'split', 6: 'split', 7: 'stand', 8: 'split', 9: 'split', 10: 'stand', 11: 'stand'},   # 9,9
-            8: {2: 'split', 3: 'split', 4: 'split', 5: 'split', 6: 'split', 7: 'split', 8: 'split', 9: 'split', 10: 'split', 11: 'split'},   # 8,8
-            7: {2: 'split', 3: 'split', 4: 'split', 5: 'split', 6: 'split', 7: 'split', 8: 'hit', 9: 'hit', 10: 'hit', 11: 'hit'},         # 7,7
-            6: {2: 'split/hit', 3: 'split', 4: 'split', 5: 'split', 6: 'split', 7: 'hit', 8: 'hit', 9: 'hit', 10: 'hit', 11: 'hit'},       # 6,6
-            5: {2: 'double', 3: 'double', 4: 'double', 5: 'double', 6: 'double', 7: 'double', 8: 'double', 9: 'double', 10: 'hit', 11: 'hit'},  # 5,5 (treat as 10)
-            4: {2: 'hit', 3: 'hit', 4: 'split/hit', 5: 'split/hit', 6: 'split/hit', 7: 'hit', 8: 'hit', 9: 'hit', 10: 'hit', 11: 'hit'},    # 4,4
-            3: {2: 'split/hit', 3: 'split/hit', 4: 'split', 5: 'split', 6: 'split', 7: 'split', 8: 'hit', 9: 'hit', 10: 'hit', 11: 'hit'}, # 3,3
-            2: {2: 'split/hit', 3: 'split/hit', 4: 'split', 5: 'split', 6: 'split', 7: 'split', 8: 'hit', 9: 'hit', 10: 'hit', 11: 'hit'}, # 2,2
-        }
+    def __init__(self, rules: Optional[RuleSet] = None):
+        rules = rules or RuleSet()
+        tables = get_strategy_tables(rules)
+        
+        # Same rules without doubling after splits, to mark DAS-only splits
+        no_das_tables = get_strategy_tables(RuleSet(
+            rules.num_decks, rules.hit_soft_17, double_after_split=False,
+            surrender=rules.surrender, blackjack_payout=rules.blackjack_payout
+        ))
+        
+        # Pair splitting strategy; 'split/hit' means split only if doubling after split is allowed
+        self.pair_strategy = {}
+        for pair_value, row in tables['pairs'].items():
+            self.pair_strategy[int(pair_value)] = {}
+            for dealer_upcard, action in row.items():
+                if action == 'split' and no_das_tables['pairs'][pair_value][dealer_upcard] != 'split':
+                    action = 'split/hit'
+                self.pair_strategy[int(pair_value)][int(dealer_upcard)] = action
         
-        # Soft totals strategy from the BJA chart
+        # Soft totals strategy (soft 13 = A,2 through soft 20 = A,9)
         self.soft_strategy = {
-            # A,9 (soft 20): Always stand
-            20: {2: 'stand', 3: 'stand', 4: 'stand', 5: 'stand', 6: 'stand', 7: 'stand', 8: 'stand', 9: 'stand', 10: 'stand', 11: 'stand'},
-            # A,8 (soft 19): Always stand  
-            19: {2: 'stand', 3: 'stand', 4: 'stand', 5: 'stand', 6: 'stand', 7: 'stand', 8: 'stand', 9: 'stand', 10: 'stand', 11: 'stand'},
-            # A,7 (soft 18): Double vs 3-6, stand vs 2,7,8, hit vs 9,10,A
-            18: {2: 'stand', 3: 'double', 4: 'double', 5: 'double', 6: 'double', 7: 'stand', 8: 'stand', 9: 'hit', 10: 'hit', 11: 'hit'},
-            # A,6 (soft 17): Double vs 3-6, otherwise hit
-            17: {2: 'hit', 3: 'double', 4: 'double', 5: 'double', 6: 'double', 7: 'hit', 8: 'hit', 9: 'hit', 10: 'hit', 11: 'hit'},
-            # A,5 (soft 16): Double vs 4-6, otherwise hit
-            16: {2: 'hit', 3: 'hit', 4: 'double', 5: 'double', 6: 'double', 7: 'hit', 8: 'hit', 9: 'hit', 10: 'hit', 11: 'hit'},
-            # A,4 (soft 15): Double vs 4-6, otherwise hit
-            15: {2: 'hit', 3: 'hit', 4: 'double', 5: 'double', 6: 'double', 7: 'hit', 8: 'hit', 9: 'hit', 10: 'hit', 11: 'hit'},
-            # A,3 (soft 14): Double vs 5-6, otherwise hit
-            14: {2: 'hit', 3: 'hit', 4: 'hit', 5: 'double', 6: 'double', 7: 'hit', 8: 'hit', 9: 'hit', 10: 'hit', 11: 'hit'},
-            # A,2 (soft 13): Double vs 5-6, otherwise hit
-            13: {2: 'hit', 3: 'hit', 4: 'hit', 5: 'double', 6: 'double', 7: 'hit', 8: 'hit', 9: 'hit', 10: 'hit', 11: 'hit'},
+            int(total): {int(upcard): action for upcard, action in row.items()}
+            for total, row in tables['soft'].items() if 13 <= int(total) <= 20
         }
         
-        # Hard totals strategy from the BJA chart
+        # Hard totals strategy
         self.hard_strategy = {
-            # 17-21: Always stand
-            17: {2: 'stand', 3: 'stand', 4: 'stand', 5: 'stand', 6: 'stand', 7: 'stand', 8: 'stand', 9: 'stand', 10: 'stand', 11: 'stand'},
-            18: {2: 'stand', 3: 'stand', 4: 'stand', 5: 'stand', 6: 'stand', 7: 'stand', 8: 'stand', 9: 'stand', 10: 'stand', 11: 'stand'},
-            19: {2: 'stand', 3: 'stand', 4: 'stand', 5: 'stand', 6: 'stand', 7: 'stand', 8: 'stand', 9: 'stand', 10: 'stand', 11: 'stand'},
-            20: {2: 'stand', 3: 'stand', 4: 'stand', 5: 'stand', 6: 'stand', 7: 'stand', 8: 'stand', 9: 'stand', 10: 'stand', 11: 'stand'},
-            21: {2: 'stand', 3: 'stand', 4: 'stand', 5: 'stand', 6: 'stand', 7: 'stand', 8: 'stand', 9: 'stand', 10: 'stand', 11: 'stand'},
-            
-            # 16: Stand vs 2-6, hit vs 7-A
-            16: {2: 'stand', 3: 'stand', 4: 'stand', 5: 'stand', 6: 'stand', 7: 'hit', 8: 'hit', 9: 'hit', 10: 'hit', 11: 'hit'},
-            # 15: Stand vs 2-6, hit vs 7-A  
-            15: {2: 'stand', 3: 'stand', 4: 'stand', 5: 'stand', 6: 'stand', 7: 'hit', 8: 'hit', 9: 'hit', 10: 'hit', 11: 'hit'},
-            # 14: Stand vs 2-6, hit vs 7-A
-            14: {2: 'stand', 3: 'stand', 4: 'stand', 5: 'stand', 6: 'stand', 7: 'hit', 8: 'hit', 9: 'hit', 10: 'hit', 11: 'hit'},
-            # 13: Stand vs 2-6, hit vs 7-A
-            13: {2: 'stand', 3: 'stand', 4: 'stand', 5: 'stand', 6: 'stand', 7: 'hit', 8: 'hit', 9: 'hit', 10: 'hit', 11: 'hit'},
-            # 12: Hit vs 2,3 and 7-A, stand vs 4-6
-            12: {2: 'hit', 3: 'hit', 4: 'stand', 5: 'stand', 6: 'stand', 7: 'hit', 8: 'hit', 9: 'hit', 10: 'hit', 11: 'hit'},
-            
-            # 11: Double vs all except A
-            11: {2: 'double', 3: 'double', 4: 'double', 5: 'double', 6: 'double', 7: 'double', 8: 'double', 9: 'double', 10: 'double', 11: 'hit'},
-            # 10: Double vs 2-9, hit vs 10,A
-            10: {2: 'double', 3: 'double', 4: 'double', 5: 'double', 6: 'double', 7: 'double', 8: 'double', 9: 'double', 10: 'hit', 11: 'hit'},
-            # 9: Double vs 3-6, otherwise hit
-            9: {2: 'hit', 3: 'double', 4: 'double', 5: 'double', 6: 'double', 7: 'hit', 8: 'hit', 9: 'hit', 10: 'hit', 11: 'hit'},
-            
-            # 5-8: Always hit
-            8: {2: 'hit', 3: 'hit', 4: 'hit', 5: 'hit', 6: 'hit', 7: 'hit', 8: 'hit', 9: 'hit', 10: 'hit', 11: 'hit'},
-            7: {2: 'hit', 3: 'hit', 4: 'hit', 5: 'hit', 6: 'hit', 7: 'hit', 8: 'hit', 9: 'hit', 10: 'hit', 11: 'hit'},
-            6: {2: 'hit', 3: 'hit', 4: 'hit', 5: 'hit', 6: 'hit', 7: 'hit', 8: 'hit', 9: 'hit', 10: 'hit', 11: 'hit'},
-            5: {2: 'hit', 3: 'hit', 4: 'hit', 5: 'hit', 6: 'hit', 7: 'hit', 8: 'hit', 9: 'hit', 10: 'hit', 11: 'hit'},
+            int(total): {int(upcard): action for upcard, action in row.items()}
+            for total, row in tables['hard'].items() if int(total) >= 5
         }
         
         # Late surrender strategy (if available)
         self.surrender_strategy = {
-            16: {9: 'surrender', 10: 'surrender', 11: 'surrender'},  # 16 vs 9,10,A
-            15: {10: 'surrender'},  # 15 vs 10 only
+            int(total): {int(upcard): action for upcard, action in row.items()}
+            for total, row in tables['surrender'].items() if total.isdigit()
         }
     
     def get_action(self, player_total: int, dealer_upcard: int, is_soft: bool = False, 
@@ -1,5 +1,29 @@
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 import numpy as np
+from shoe import RANKS
+
+# Rank codes 0-12 follow shoe.RANKS ('2'..'10', 'J', 'Q', 'K', 'A'), so a card
+# id's rank code is card_id % 13
+RANK_CODES = {rank: code for code, rank in enumerate(RANKS)}
+
+# Blackjack value of each rank code (Ace = 11)
+RANK_VALUES = np.array([2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10, 11], dtype=np.int8)
+
+# Probability of each rank code in a full shoe
+RANK_PROBABILITIES = np.full(13, 1 / 13)
+
+# Suits 0 and 1 (hearts, diamonds) are red
+RED_SUITS = (0, 1)
+
+
+def rank_code(card) -> int:
+    """Rank code of a card object or a blackjack value (10 maps to the '10' rank)"""
+    if hasattr(card, 'rank'):
+        return RANK_CODES[card.rank]
+    if card == 1 or card == 11:
+        return RANK_CODES['A']
+    return min(card, 10) - 2
+
 
 class CardCounter:
     def __init__(self):
@@ -35,21 +59,70 @@ class CardCounter:
         self.running_count = 0
         self.cards_seen = 0
         self.current_system = 'Hi-Lo'
+        
+        # Tag matrices: one column per system, rows indexed by rank code or card id
+        self.system_names = list(self.counting_systems)
+        self.rank_tags = np.array(
+            [[self.counting_systems[system][value] for system in self.system_names]
+             for value in RANK_VALUES.tolist()],
+            dtype=np.int16
+        )
+        self.card_tags = np.tile(self.rank_tags, (4, 1))
+        red_7 = self.system_names.index('Red 7')
+        for suit in range(4):
+            if suit not in RED_SUITS:
+                self.card_tags[suit * 13 + RANK_CODES['7'], red_7] = 0  # Only red 7s count
+        
+        # Simulated index tables per system, loaded on first use
+        self._generated_deviations = {}
+    
+    def system_index(self, system: str) -> int:
+        """Column of a system in the tag matrices"""
+        return self.system_names.index(system)
+    
+    def count_histogram(self, histogram: np.ndarray) -> np.ndarray:
+        """Running counts for every system from rank histograms.
+        
+        histogram has 13 rank counts (or one row of 13 per hand/shoe); the
+        result has one column per system in system_names order.
+        """
+        return np.asarray(histogram) @ self.rank_tags
+    
+    def count_ranks(self, ranks: np.ndarray) -> np.ndarray:
+        """Running counts for every system from an array of rank codes"""
+        return self.count_histogram(np.bincount(np.asarray(ranks).ravel(), minlength=13))
+    
+    def count_card_ids(self, card_ids) -> np.ndarray:
+        """Running counts for every system from shoe card ids (exact Red 7)"""
+        ids = np.frombuffer(card_ids, dtype=np.uint8) if isinstance(card_ids, (bytes, bytearray)) \
+            else np.asarray(card_ids)
+        return np.bincount(ids.ravel(), minlength=52) @ self.card_tags
     
+    def count_dealt(self, cards: List) -> np.ndarray:
+        """Running counts for every system from dealt cards.
+        
+        Cards with a card_id count exactly; blackjack values and other cards
+        without a suit count by rank, so every such 7 counts in Red 7.
+        """
+        card_ids = [card.card_id for card in cards if hasattr(card, 'card_id')]
+        ranks = [rank_code(card) for card in cards if not hasattr(card, 'card_id')]
+        return self.count_card_ids(np.array(card_ids, dtype=np.intp)) + \
+            self.count_ranks(np.array(ranks, dtype=np.intp))
+    
+    def running_counts(self, ranks: np.ndarray) -> np.ndarray:
+        """Running count after each card of a rank-code sequence, for every system"""
+        return np.cumsum(self.rank_tags[np.asarray(ranks)], axis=0)
+    
+
     def reset_count(self):
         """Reset the running count"""
         self.running_count = 0
         self.cards_seen = 0
     
     def count_card(self, card, system: str = 'Hi-Lo'):
-        """Count a single card"""
-        card_value = card.get_value() if hasattr(card, 'get_value') else card
-        
-        # Convert face cards to 10, Ace to 11
-        if card_value > 10:
-            card_value = 10
-        
-        count_value = self.counting_systems[system].get(card_value, 0)
+        """Count a single card (by rank unless it has a card_id, see count_dealt)"""
+        tags = self.card_tags[card.card_id] if hasattr(card, 'card_id') else self.rank_tags[rank_code(card)]
+        count_value = int(tags[self.system_index(system)])
         self.running_count += count_value
         self.cards_seen += 1
         
@@ -69,21 +142,22 @@ class CardCounter:
         decks_remaining = max(0.5, (52 * num_decks - self.cards_seen) / 52)
         return self.running_count / decks_remaining
     
-    def get_count_info(self, dealt_cards: List, num_decks: int = 6) -> Dict:
-        """Get comprehensive count information"""
-        # Reset and recount all dealt cards
-        temp_running_count = 0
-        
-        for card in dealt_cards:
-            card_value = card.get_value() if hasattr(card, 'get_value') else card
-            if card_value > 10:
-                card_value = 10
-            
-            count_value = self.counting_systems[self.current_system].get(card_value, 0)
-            temp_running_count += count_value
+    def get_count_info(self, dealt_cards: Optional[List] = None, num_decks: int = 6,
+                       tracker: Optional['CountTracker'] = None) -> Dict:
+        """Get comprehensive count information
+        
+        With a tracker attached to the shoe this is O(1); otherwise the
+        dealt cards are recounted with count_dealt.
+        """
+        if tracker is not None:
+            temp_running_count = tracker.running_count(self.current_system)
+            cards_seen = tracker.cards_seen
+            num_decks = tracker.num_decks
+        else:
+            temp_running_count = int(self.count_dealt(dealt_cards)[self.system_index(self.current_system)])
+            cards_seen = len(dealt_cards)
         
         # Calculate true count
-        cards_seen = len(dealt_cards)
         decks_remaining = max(0.5, (52 * num_decks - cards_seen) / 52)
         true_count = temp_running_count / decks_remaining
         
@@ -94,7 +168,7 @@ class CardCounter:
         # Determine betting recommendation
         betting_recommendation = self._get_betting_recommendation(true_count)
         
-        return {
+        count_info = {
             'running_count': temp_running_count,
             'true_count': true_count,
             'cards_seen': cards_seen,
@@ -104,6 +178,10 @@ class CardCounter:
             'betting_recommendation': betting_recommendation,
             'advantage_estimate': self._estimate_player_advantage(true_count)
         }
+        if tracker is not None:
+            count_info['side_counts'] = tracker.side_counts()
+        
+        return count_info
     
     def _get_betting_recommendation(self, true_count: float) -> Dict:
         """Get betting recommendation based on true count"""
@@ -164,20 +242,28 @@ class CardCounter:
         return readable_values
     
     def get_deviation_recommendations(self, player_total: int, dealer_upcard: int, 
-                                    true_count: float, system: str = 'Hi-Lo') -> Dict:
+                                    true_count: float, system: str = 'Hi-Lo',
+                                    is_soft: bool = False) -> Dict:
         """Get playing deviation recommendations based on count"""
         deviations = self._get_system_deviations(system)
         
-        situation_key = (player_total, dealer_upcard)
+        situation_key = ('soft', player_total, dealer_upcard) if is_soft else (player_total, dealer_upcard)
         
         if situation_key in deviations:
             deviation = deviations[situation_key]
             
-            if true_count >= deviation['threshold']:
+            if deviation.get('direction', 'above') == 'below':
+                applies = true_count <= deviation['threshold']
+                comparison = 'is at or below'
+            else:
+                applies = true_count >= deviation['threshold']
+                comparison = 'exceeds'
+            
+            if applies:
                 return {
                     'recommended_action': deviation['deviation_action'],
                     'basic_strategy_action': deviation['basic_action'],
-                    'reason': f"True count {true_count:.1f} exceeds threshold of {deviation['threshold']:+.1f}",
+                    'reason': f"True count {true_count:.1f} {comparison} threshold of {deviation['threshold']:+.1f}",
                     'expected_value_gain': deviation.get('ev_gain', 0),
                     'deviation_applies': True
                 }
@@ -189,6 +275,11 @@ class CardCounter:
     
     def _get_system_deviations(self, system: str) -> Dict:
         """Get playing deviations for counting system"""
+        # Indices generated by deviation_indices.py take precedence when present
+        generated = self._load_generated_deviations(system)
+        if generated:
+            return generated
+        
         # Common Hi-Lo deviations (situation: (player_total, dealer_upcard))
         hi_lo_deviations = {
             (16, 10): {
@@ -274,6 +365,27 @@ class CardCounter:
             
             return adjusted_deviations
     
+    def _load_generated_deviations(self, system: str) -> Dict:
+        """Simulated indices for a system keyed like the built-in table ({} if none)"""
+        if system not in self._generated_deviations:
+            from deviation_indices import load_deviation_table  # Imports this module
+            
+            deviations = {}
+            for entry in load_deviation_table(system) or []:
+                key = (entry['total'], entry['upcard'])
+                if entry['hand'] == 'soft':
+                    key = ('soft',) + key
+                # Entries are sorted by EV gain, so keep the first play per situation
+                deviations.setdefault(key, {
+                    'basic_action': entry['basic_action'],
+                    'deviation_action': entry['deviation_action'],
+                    'threshold': entry['index'],
+                    'direction': entry['direction'],
+                    'ev_gain': round(entry['ev_gain'], 4)
+                })
+            self._generated_deviations[system] = deviations
+        return self._generated_deviations[system]
+    
     def _get_system_efficiency_multiplier(self, system: str) -> float:
         """Get efficiency multiplier for different counting systems"""
         efficiency_ratings = {
@@ -344,33 +456,22 @@ class CardCounter:
             'accuracy_by_penetration': {}
         }
         
-        total_error = 0
-        max_error = 0
-        perfect_hands = 0
+        penetrations = [0.25, 0.5, 0.75]
+        cards_dealt = [int(52 * 6 * penetration) for penetration in penetrations]  # 6-deck game
         
-        # Simulate hands with different penetration levels
-        for penetration in [0.25, 0.5, 0.75]:
-            cards_dealt = int(52 * 6 * penetration)  # 6-deck game
-            
-            # Simulate random card distribution
-            cards = []
-            for _ in range(cards_dealt):
-                card_value = np.random.choice([2,3,4,5,6,7,8,9,10,10,10,10,11])
-                cards.append(card_value)
-            
-            # Calculate perfect count
-            perfect_count = sum(self.counting_systems['Hi-Lo'].get(card, 0) for card in cards)
-            
-            # Simulate player counting with errors
-            player_count = perfect_count + np.random.randint(-2, 3)  # Random error
-            
-            error = abs(perfect_count - player_count)
-            total_error += error
-            max_error = max(max_error, error)
-            
-            if error == 0:
-                perfect_hands += 1
-            
+        # Simulate random card distributions as rank histograms, one row per level
+        histograms = np.stack([np.random.multinomial(n, RANK_PROBABILITIES) for n in cards_dealt])
+        
+        # Perfect Hi-Lo count for every level in one matrix product
+        perfect_counts = self.count_histogram(histograms)[:, self.system_index('Hi-Lo')]
+        
+        # Simulate player counting with errors
+        errors = np.abs(np.random.randint(-2, 3, size=len(penetrations)))
+        total_error = int(errors.sum())
+        max_error = int(errors.max())
+        perfect_hands = int(np.count_nonzero(errors == 0))
+        
+        for penetration, perfect_count in zip(penetrations, perfect_counts.tolist()):
             results['accuracy_by_penetration'][f'{penetration:.0%}'] = {
                 'perfect_count': perfect_count,
                 'typical_error': np.random.randint(0, 3),
@@ -382,3 +483,55 @@ class CardCounter:
         results['max_error'] = max_error
         
         return results
+
+
+class CountTracker:
+    """
+    Incremental count state for one shoe.
+
+    Attach it with shoe.attach(tracker): every dealt card updates the running
+    count of each system, the cards seen, the side counts and the
+    remaining-composition histogram, and a shuffle resets everything.  All
+    queries are O(1).
+    """
+
+    def __init__(self, num_decks: int = 6, card_counter: Optional[CardCounter] = None):
+        counter = card_counter or CardCounter()
+        self.num_decks = num_decks
+        self.system_names = counter.system_names
+        self._card_tags = [tuple(row) for row in counter.card_tags.tolist()]
+        self.reset()
+
+    def reset(self):
+        self.running_counts = [0] * len(self.system_names)
+        self.cards_seen = 0
+        self.rank_seen = [0] * 13
+
+    def card_dealt(self, card_id: int):
+        counts = self.running_counts
+        for index, tag in enumerate(self._card_tags[card_id]):
+            counts[index] += tag
+        self.rank_seen[card_id % 13] += 1
+        self.cards_seen += 1
+
+    def running_count(self, system: str = 'Hi-Lo') -> int:
+        return self.running_counts[self.system_names.index(system)]
+
+    def decks_remaining(self) -> float:
+        return max(0.5, (52 * self.num_decks - self.cards_seen) / 52)
+
+    def true_count(self, system: str = 'Hi-Lo') -> float:
+        return self.running_count(system) / self.decks_remaining()
+
+    def remaining_composition(self) -> List[int]:
+        """Unseen cards per rank code"""
+        return [4 * self.num_decks - seen for seen in self.rank_seen]
+
+    def side_counts(self) -> Dict[str, int]:
+        """Unseen aces, ten-valued cards and fives"""
+        remaining = self.remaining_composition()
+        return {
+            'aces': remaining[RANK_CODES['A']],
+            'tens': sum(remaining[RANK_CODES['10']:RANK_CODES['K'] + 1]),
+            'fives': remaining[RANK_CODES['5']]
+        }
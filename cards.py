@@ -0,0 +1,92 @@
+"""
+Canonical, immutable card objects.
+
+A card class built on CardFace has exactly 52 instances, one per shoe card id,
+created when the class is defined.  Each carries its blackjack value, its tag
+in every counting system and its serialized dict, all computed once, and uses
+__slots__ so it has no per-instance __dict__.  Shoes hold card ids and hand out
+these shared instances, so dealing, reshuffling and keeping thousands of live
+sessions never allocates card objects.
+"""
+
+from types import MappingProxyType
+from typing import Dict, Tuple
+from card_counting import CardCounter
+from shoe import CARD_VALUES, NUM_SUITS, RANKS, card_rank, card_suit
+
+
+class CardFace:
+    """One card of a 52-card deck; subclasses name the suits (SUITS, in shoe suit order).
+
+    CardClass(suit, rank) and CardClass.from_id(card_id) both return the
+    canonical instance.  Instances are read-only and compare by identity.
+    """
+
+    __slots__ = ('card_id', 'suit', 'rank', 'value', 'count_tags', '_serialized')
+
+    SUITS: Tuple[str, ...] = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if len(cls.SUITS) != NUM_SUITS:
+            raise TypeError(f'{cls.__name__}.SUITS must name {NUM_SUITS} suits')
+
+        counter = CardCounter()
+        cls._deck = tuple(cls._build(card_id, counter) for card_id in range(NUM_SUITS * len(RANKS)))
+        cls._by_name = {(card.suit, card.rank): card for card in cls._deck}
+
+    @classmethod
+    def _build(cls, card_id: int, counter: CardCounter) -> 'CardFace':
+        card = object.__new__(cls)
+        tags = dict(zip(counter.system_names, counter.card_tags[card_id].tolist()))
+        suit = cls.SUITS[card_suit(card_id)]
+        rank = card_rank(card_id)
+        for name, value in (('card_id', card_id), ('suit', suit), ('rank', rank),
+                            ('value', CARD_VALUES[card_id]), ('count_tags', MappingProxyType(tags)),
+                            ('_serialized', {'suit': suit, 'rank': rank})):
+            object.__setattr__(card, name, value)
+        return card
+
+    def __new__(cls, suit: str, rank: str):
+        try:
+            return cls._by_name[(suit, rank)]
+        except (AttributeError, KeyError, TypeError):
+            raise ValueError(f'Unknown card: {rank} of {suit}') from None
+
+    @classmethod
+    def from_id(cls, card_id: int) -> 'CardFace':
+        """Canonical instance for a shoe card id"""
+        return cls._deck[card_id]
+
+    @classmethod
+    def deck(cls) -> Tuple['CardFace', ...]:
+        """All 52 instances in card id order"""
+        return cls._deck
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'{type(self).__name__} objects are immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError(f'{type(self).__name__} objects are immutable')
+
+    def __reduce__(self):
+        # Unpickling and deep copies resolve to the canonical instance
+        return type(self).from_id, (self.card_id,)
+
+    def __str__(self):
+        return f"{self.rank}{self.suit[0]}"
+
+    def __repr__(self):
+        return f'{type(self).__name__}({self.suit!r}, {self.rank!r})'
+
+    def get_value(self) -> int:
+        """Blackjack value of the card (Ace = 11)"""
+        return self.value
+
+    def get_count_value(self, system: str = 'Hi-Lo') -> int:
+        """Tag of the card in a counting system (0 for unknown systems)"""
+        return self.count_tags.get(system, 0)
+
+    def to_dict(self) -> Dict[str, str]:
+        """Serialized card; the dict is shared by every caller, so do not modify it"""
+        return self._serialized
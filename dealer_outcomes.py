@@ -0,0 +1,232 @@
+"""
+Dealer outcome probability tables.
+
+For every dealer upcard this computes the probability distribution of the
+dealer's final hand (17-21, bust or blackjack) under S17 or H17 rules, either
+for an infinite deck or for an exact remaining shoe composition.  Results are
+memoized in process and the standard full-shoe tables are persisted to disk,
+so coaching and EV code can look probabilities up instead of estimating them.
+"""
+
+import json
+import os
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+# Card values 2..11 (Ace = 11); compositions are 10-tuples in this order
+CARD_VALUES = (2, 3, 4, 5, 6, 7, 8, 9, 10, 11)
+OUTCOMES = ['17', '18', '19', '20', '21', 'bust', 'blackjack']
+
+# Probability of drawing each value from an infinite deck
+INFINITE_DECK = tuple(4 / 13 if value == 10 else 1 / 13 for value in CARD_VALUES)
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dealer_outcomes.json')
+
+
+def shoe_composition(num_decks: int, removed: List[int] = ()) -> Tuple[int, ...]:
+    """Card counts by value for a shoe with the given card values removed"""
+    counts = [16 * num_decks if value == 10 else 4 * num_decks for value in CARD_VALUES]
+    for value in removed:
+        counts[value - 2] -= 1
+    return tuple(counts)
+
+
+def add_card(total: int, soft: bool, value: int) -> Tuple[int, bool]:
+    """Best total and soft flag after adding a card of the given value"""
+    if value == 11:
+        if total + 11 <= 21:
+            return total + 11, True
+        value = 1
+    total += value
+    if total > 21 and soft:
+        return total - 10, False
+    return total, soft
+
+
+@lru_cache(maxsize=None)
+def _dealer_finish(total: int, soft: bool, num_cards: int, hit_soft_17: bool,
+                   composition: Optional[Tuple[int, ...]]) -> Tuple[float, ...]:
+    """Probabilities of OUTCOMES from a partial dealer hand"""
+    if num_cards == 2 and total == 21:
+        return (0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 1.0)
+    if total > 21:
+        return (0.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0)
+    if total >= 18 or (total == 17 and not (soft and hit_soft_17)):
+        result = [0.0] * 7
+        result[total - 17] = 1.0
+        return tuple(result)
+
+    if composition is None:
+        weights = INFINITE_DECK
+        remaining = 1.0
+    else:
+        weights = composition
+        remaining = sum(composition)
+
+    result = [0.0] * 7
+    for index, value in enumerate(CARD_VALUES):
+        if weights[index] == 0:
+            continue
+        probability = weights[index] / remaining
+        next_composition = None
+        if composition is not None:
+            next_composition = composition[:index] + (composition[index] - 1,) + composition[index + 1:]
+        next_total, next_soft = add_card(total, soft, value)
+        branch = _dealer_finish(next_total, next_soft, num_cards + 1, hit_soft_17, next_composition)
+        for outcome in range(7):
+            result[outcome] += probability * branch[outcome]
+    return tuple(result)
+
+
+def dealer_distribution(upcard: int, hit_soft_17: bool = False,
+                        composition: Optional[Tuple[int, ...]] = None,
+                        no_blackjack: bool = False) -> Dict[str, float]:
+    """Distribution of the dealer's final hand for an upcard (2-11).
+
+    composition is the count of each unseen card value with the upcard
+    already removed (see shoe_composition); None means an infinite deck.
+    no_blackjack conditions on the dealer having peeked without blackjack.
+    """
+    total, soft = add_card(0, False, upcard)
+    probabilities = list(_dealer_finish(total, soft, 1, hit_soft_17, composition))
+
+    if no_blackjack and probabilities[6] > 0:
+        scale = 1 - probabilities[6]
+        probabilities = [p / scale for p in probabilities[:6]] + [0.0]
+
+    return dict(zip(OUTCOMES, probabilities))
+
+
+def dealer_distribution_cache_clear():
+    """Drop memoized dealer states (composition-dependent runs create many)"""
+    _dealer_finish.cache_clear()
+
+
+class DealerOutcomeTables:
+    """Full-shoe dealer tables keyed by rules, persisted to a JSON file"""
+
+    def __init__(self, cache_path: str = DEFAULT_CACHE_PATH):
+        self.cache_path = cache_path
+        self.tables = {}
+        self._load()
+
+    def _load(self):
+        try:
+            if self.cache_path and os.path.exists(self.cache_path):
+                with open(self.cache_path, 'r') as f:
+                    self.tables = json.load(f)
+        except (OSError, ValueError):
+            self.tables = {}
+
+    def _save(self):
+        try:
+            with open(self.cache_path, 'w') as f:
+                json.dump(self.tables, f)
+        except OSError:
+            pass  # Tables can always be recomputed
+
+    def get_table(self, hit_soft_17: bool = False, num_decks: Optional[int] = None) -> Dict[int, Dict[str, float]]:
+        """Dealer distribution for every upcard; num_decks=None is an infinite deck"""
+        key = f"{'H17' if hit_soft_17 else 'S17'}-{num_decks or 'inf'}"
+        if key not in self.tables:
+            table = {}
+            for upcard in CARD_VALUES:
+                composition = shoe_composition(num_decks, [upcard]) if num_decks else None
+                table[str(upcard)] = dealer_distribution(upcard, hit_soft_17, composition)
+            self.tables[key] = table
+            if self.cache_path:
+                self._save()
+        return {int(upcard): dist for upcard, dist in self.tables[key].items()}
+
+    def get_distribution(self, upcard: int, hit_soft_17: bool = False,
+                         num_decks: Optional[int] = None, no_blackjack: bool = False) -> Dict[str, float]:
+        """Table lookup for one upcard"""
+        distribution = dict(self.get_table(hit_soft_17, num_decks)[upcard])
+        if no_blackjack and distribution['blackjack'] > 0:
+            scale = 1 - distribution['blackjack']
+            distribution = {outcome: (0.0 if outcome == 'blackjack' else p / scale)
+                            for outcome, p in distribution.items()}
+        return distribution
+
+
+_default_tables = None
+
+
+def get_dealer_tables() -> DealerOutcomeTables:
+    """Shared, lazily created table store"""
+    global _default_tables
+    if _default_tables is None:
+        _default_tables = DealerOutcomeTables()
+    return _default_tables
+
+
+def stand_outcome(player_total: int, distribution: Dict[str, float]) -> Dict[str, float]:
+    """Win/push/loss probabilities for standing on player_total"""
+    if player_total > 21:
+        return {'win': 0.0, 'push': 0.0, 'loss': 1.0}
+
+    win = distribution['bust']
+    push = 0.0
+    for dealer_total in range(17, 22):
+        p = distribution[str(dealer_total)]
+        if player_total > dealer_total:
+            win += p
+        elif player_total == dealer_total:
+            push += p
+    loss = 1.0 - win - push
+    return {'win': win, 'push': push, 'loss': loss}
+
+
+@lru_cache(maxsize=None)
+def _win_tables(upcard: int, hit_soft_17: bool) -> Tuple[Tuple[float, ...], ...]:
+    """Win probabilities against an upcard (infinite deck, dealer peeked), built once.
+
+    Returns the stand table indexed by player total, then the hit and
+    double tables indexed by [soft][player total].
+    """
+    distribution = get_dealer_tables().get_distribution(upcard, hit_soft_17, no_blackjack=True)
+    stand_win = tuple(stand_outcome(total, distribution)['win'] for total in range(22))
+
+    @lru_cache(maxsize=None)
+    def best_win(total: int, soft: bool) -> float:
+        if total > 21:
+            return 0.0
+        if total == 21:
+            return stand_win[21]
+        return max(stand_win[total], hit_win(total, soft))
+
+    @lru_cache(maxsize=None)
+    def hit_win(total: int, soft: bool) -> float:
+        return sum(p * best_win(*add_card(total, soft, value))
+                   for p, value in zip(INFINITE_DECK, CARD_VALUES))
+
+    def double_win(total: int, soft: bool) -> float:
+        win = 0.0
+        for p, value in zip(INFINITE_DECK, CARD_VALUES):
+            final_total, _ = add_card(total, soft, value)
+            if final_total <= 21:
+                win += p * stand_win[final_total]
+        return win
+
+    hit_table = tuple(tuple(hit_win(total, soft) for total in range(22)) for soft in (False, True))
+    double_table = tuple(tuple(double_win(total, soft) for total in range(22)) for soft in (False, True))
+    return stand_win, hit_table, double_table
+
+
+def player_win_probability(player_total: int, upcard: int, action: str,
+                           is_soft: bool = False, hit_soft_17: bool = False) -> float:
+    """Probability of winning the hand when taking action (infinite deck, dealer peeked)"""
+    if player_total > 21:
+        return 0.0
+    stand_win, hit_win, double_win = _win_tables(upcard, hit_soft_17)
+
+    action = action.lower()
+    if action == 'stand':
+        return stand_win[player_total]
+    if action == 'double':
+        return double_win[is_soft][player_total]
+    if action == 'split':
+        pair_card = 11 if is_soft else player_total // 2
+        total, soft = add_card(0, False, pair_card)
+        return hit_win[soft][total]
+    return hit_win[is_soft][player_total]
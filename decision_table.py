@@ -0,0 +1,191 @@
+"""
+Dense, compiled form of a playing strategy.
+
+The basic strategy dicts are compiled once into a small int8 array indexed
+by [hand class, can double, total, dealer upcard] that holds action codes.
+Pairs are their own hand class, indexed by the pair card's value instead of
+the total.  Late surrender is a separate [total, upcard] mask over hard
+two-card hands, applied only where the caller allows it.  Count-based plays
+are compiled into an optional overlay of [total, upcard] threshold arrays.  The same table serves the scalar
+simulator (one decision at a time) and the batch engine (thousands of
+decisions with one fancy-index).
+"""
+
+import numpy as np
+from typing import Iterable, List, Optional, Tuple
+from strategy_tables import BasicStrategy
+
+# Action codes
+HIT = 0
+STAND = 1
+DOUBLE = 2
+SPLIT = 3
+SURRENDER = 4
+
+ACTION_CODES = {'hit': HIT, 'stand': STAND, 'double': DOUBLE, 'split': SPLIT, 'surrender': SURRENDER}
+ACTION_NAMES = ['hit', 'stand', 'double', 'split', 'surrender']
+
+# Hand classes (first axis of the table)
+HARD = 0
+SOFT = 1
+PAIR = 2
+
+# Largest index on the total axis (busted totals stand)
+MAX_TOTAL = 31
+
+
+class DeviationOverlay:
+    """
+    True-count plays compiled to [total, upcard] arrays.
+
+    Plays are added in layers.  Within a layer the first play listed for a
+    cell wins; later layers override earlier ones where they apply, matching
+    the order in which the simulator applied its deviation lists.
+    """
+
+    def __init__(self):
+        self.layers: List[Tuple[np.ndarray, np.ndarray, bool]] = []
+        self._layer_rows = []  # Same layers as nested lists, for single lookups
+
+    def add_plays(self, plays: Iterable[Tuple[int, int, float, str]],
+                  above: bool = True, strict: bool = False) -> 'DeviationOverlay':
+        """Add (total, upcard, true_count, action) plays taken at or above the
+        count (at or below if above=False; strictly beyond it if strict)"""
+        thresholds = np.full((MAX_TOTAL + 1, 12), np.nan)
+        actions = np.zeros((MAX_TOTAL + 1, 12), dtype=np.int8)
+        for total, upcard, true_count, action in plays:
+            if not np.isnan(thresholds[total, upcard]):
+                continue
+            if strict:
+                true_count = np.nextafter(true_count, np.inf if above else -np.inf)
+            thresholds[total, upcard] = true_count
+            actions[total, upcard] = ACTION_CODES[action]
+        self.layers.append((thresholds, actions, above))
+        self._layer_rows.append((thresholds.tolist(), actions.tolist(), above))
+        return self
+
+    def apply(self, action, total, upcard, true_count):
+        """Overlay count-based plays on base action codes (arrays or scalars)"""
+        for thresholds, actions, above in self.layers:
+            threshold = thresholds[total, upcard]
+            # NaN thresholds (no play for the cell) never compare true
+            taken = true_count >= threshold if above else true_count <= threshold
+            action = np.where(taken, actions[total, upcard], action)
+        return action
+
+    def apply_one(self, action: int, total: int, upcard: int, true_count: float) -> int:
+        """Scalar version of apply"""
+        for thresholds, actions, above in self._layer_rows:
+            threshold = thresholds[total][upcard]
+            if true_count >= threshold if above else true_count <= threshold:
+                action = actions[total][upcard]
+        return action
+
+
+class DecisionTable:
+    """Basic strategy compiled to action codes, with an optional count overlay"""
+
+    def __init__(self, basic_strategy: Optional[BasicStrategy] = None,
+                 overlay: Optional[DeviationOverlay] = None):
+        basic_strategy = basic_strategy or BasicStrategy()
+        self.overlay = overlay
+
+        # [hand class, can double, total (pair value for PAIR), upcard]
+        self.actions = np.full((3, 2, MAX_TOTAL + 1, 12), STAND, dtype=np.int8)
+        self.actions[:, :, :12, :] = HIT
+
+        for upcard in range(2, 12):
+            for can_double in (0, 1):
+                for total in range(2, 22):
+                    self.actions[HARD, can_double, total, upcard] = ACTION_CODES[
+                        basic_strategy.get_hard_action(total, upcard, bool(can_double))]
+                for total in range(12, 22):
+                    self.actions[SOFT, can_double, total, upcard] = ACTION_CODES[
+                        basic_strategy.get_soft_action(total, upcard, bool(can_double))]
+
+                # Pairs the chart does not split play as their total (A,A is soft 12)
+                for pair_value in range(2, 12):
+                    if basic_strategy.get_pair_action(pair_value, upcard) == 'split':
+                        action = SPLIT
+                    elif pair_value == 11:
+                        action = self.actions[SOFT, can_double, 12, upcard]
+                    else:
+                        action = self.actions[HARD, can_double, 2 * pair_value, upcard]
+                    self.actions[PAIR, can_double, pair_value, upcard] = action
+
+        # Hard totals to surrender (first two cards only)
+        self.surrender = np.zeros((MAX_TOTAL + 1, 12), dtype=bool)
+        for total, row in basic_strategy.surrender_strategy.items():
+            for upcard, action in row.items():
+                self.surrender[total, upcard] = action == 'surrender'
+
+        # Nested lists make single lookups in the scalar loop cheap
+        self._rows = self.actions.tolist()
+        self._surrender_rows = self.surrender.tolist()
+
+    def with_overlay(self, overlay: Optional[DeviationOverlay]) -> 'DecisionTable':
+        """Same base table with a different count overlay (arrays are shared)"""
+        table = DecisionTable.__new__(DecisionTable)
+        table.actions = self.actions
+        table._rows = self._rows
+        table.surrender = self.surrender
+        table._surrender_rows = self._surrender_rows
+        table.overlay = overlay
+        return table
+
+    def with_first_action(self, hand_class: int, index: int, upcard: int,
+                          action: int) -> 'DecisionTable':
+        """Copy of the table that plays action as the two-card decision of one cell"""
+        table = self.with_overlay(self.overlay)
+        table.actions = self.actions.copy()
+        table.actions[hand_class, 1, index, upcard] = action
+        table._rows = table.actions.tolist()
+        if hand_class == HARD:
+            table.surrender = self.surrender.copy()
+            table.surrender[index, upcard] = action == SURRENDER
+            table._surrender_rows = table.surrender.tolist()
+        return table
+
+    def decide(self, total, soft, upcard, can_double=True, pair_value=0,
+               true_count=None, can_surrender=False) -> np.ndarray:
+        """Action codes for arrays of hands; pair_value is 0 for non-pairs"""
+        pair_value = np.asarray(pair_value)
+        total = np.minimum(total, MAX_TOTAL)
+        soft_class = np.asarray(soft, dtype=np.intp)
+        hand_class = np.where(pair_value > 0, PAIR, soft_class)
+        index = np.where(pair_value > 0, pair_value, total)
+        can_double = np.asarray(can_double, dtype=bool)
+        action = self.actions[hand_class, can_double.astype(np.intp), index, upcard]
+
+        if self.overlay is not None and true_count is not None:
+            # Count plays never break up a split, and a double the hand cannot
+            # take falls back to the total's no-double play
+            base = action
+            action = self.overlay.apply(action, total, upcard, true_count)
+            action = np.where(base == SPLIT, SPLIT, action)
+            action = np.where((action == DOUBLE) & ~can_double,
+                              self.actions[soft_class, 0, total, upcard], action)
+
+        # Surrender comes before any other play except splitting a pair
+        surrender = (can_surrender & self.surrender[total, upcard]
+                     & ~np.asarray(soft, dtype=bool) & (action != SPLIT))
+        return np.where(surrender, SURRENDER, action)
+
+    def decide_one(self, total: int, soft: bool, upcard: int, can_double: bool = True,
+                   pair_value: int = 0, true_count: Optional[float] = None,
+                   can_surrender: bool = False) -> int:
+        """Action code for a single hand"""
+        total = min(total, MAX_TOTAL)
+        if pair_value:
+            action = self._rows[PAIR][can_double][pair_value][upcard]
+        else:
+            action = self._rows[soft][can_double][total][upcard]
+
+        if self.overlay is not None and true_count is not None and action != SPLIT:
+            action = self.overlay.apply_one(action, total, upcard, true_count)
+            if action == DOUBLE and not can_double:
+                action = self._rows[soft][0][total][upcard]
+
+        if can_surrender and not soft and action != SPLIT and self._surrender_rows[total][upcard]:
+            return SURRENDER
+        return action
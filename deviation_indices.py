@@ -0,0 +1,365 @@
+"""
+Count-index (playing deviation) generator.
+
+For every two-card situation (hard or soft total against a dealer upcard)
+this deals huge numbers of random shoe states with the situation's cards
+removed, measures each counting system's true count at the decision, and
+plays the hand out once per candidate action on the same cards (common
+random numbers) with the vectorized batch engine.  The EV difference
+between each alternative and the basic strategy play is averaged per
+true-count bucket and a weighted line through the buckets gives the
+crossover true count: the index.
+
+Work is split into chunks with independent seed streams and run on a
+process pool, so runs scale to billions of hands.  The resulting table is
+saved to JSON per rule set and loaded by CardCounter and the simulator.
+
+    python deviation_indices.py --hands 2000000 --h17
+"""
+
+import argparse
+import concurrent.futures
+import json
+import os
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+from batch_engine import BatchSimulator
+from card_counting import CardCounter
+from decision_table import ACTION_CODES, HARD, SOFT
+from ev_solver import RuleSet, get_strategy_tables
+from shoe import CARD_VALUES
+from strategy_tables import BasicStrategy
+
+DEFAULT_TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'deviation_indices.json')
+
+# True-count buckets are floor(true count) in this range; rarer counts are dropped
+MIN_BUCKET = -8
+MAX_BUCKET = 8
+NUM_BUCKETS = MAX_BUCKET - MIN_BUCKET + 1
+
+# Candidate first actions, in accumulator order
+ACTIONS = ['hit', 'stand', 'double', 'surrender']
+
+CARD_VALUE_BY_ID = np.array(CARD_VALUES, dtype=np.int8)
+
+# Minimum t-statistic of the EV-difference slope for an index to be reported
+MIN_SLOPE_T = 3.0
+
+
+def situation_combos(hand_class: str, total: int) -> Tuple[List[Tuple[int, int]], np.ndarray]:
+    """Non-pair two-card holdings making the total, with their deal frequencies"""
+    if hand_class == 'soft':
+        return [(11, total - 11)], np.ones(1)
+
+    combos = [(a, total - a) for a in range(2, 11) if a < total - a <= 10]
+    weights = np.array([(16 if a == 10 else 4) * (16 if b == 10 else 4) for a, b in combos], dtype=float)
+    return combos, weights / weights.sum() if len(combos) else weights
+
+
+def simulate_chunk(rules: RuleSet, situations: List[Tuple[str, int, int, List[str]]],
+                   num_hands: int, penetration: float,
+                   seed: np.random.SeedSequence) -> Tuple[np.ndarray, np.ndarray]:
+    """Play every situation against num_hands random shoe states.
+
+    Each shoe state is shuffled once and reused by all situations: a random
+    number of cards is burned, the situation's cards are taken from the first
+    unseen cards of their values, and play continues from the unseen cards
+    that remain.  Every candidate action is played on the same cards.
+
+    Returns per-situation bucket counts (situations, systems, buckets) and
+    summed net results (situations, systems, buckets, ACTIONS).
+    """
+    engine, counter = _worker_engine(rules)
+    rng = np.random.default_rng(seed)
+    num_systems = len(counter.system_names)
+    num_cards = 52 * rules.num_decks
+    rows = np.arange(num_hands)
+
+    shoes = np.tile(np.arange(52, dtype=np.uint8), (num_hands, rules.num_decks))
+    rng.permuted(shoes, axis=1, out=shoes)
+    values = CARD_VALUE_BY_ID[shoes]
+
+    # Cards already seen from earlier rounds and their running count per system
+    depth = rng.integers(0, int((num_cards - 3) * penetration), size=num_hands)
+    unseen = np.arange(num_cards) >= depth[:, None]
+    seen_counts = np.stack([np.where(unseen, 0, counter.card_tags[shoes, system]).sum(axis=1)
+                            for system in range(num_systems)], axis=1)
+
+    # Unseen positions of every card value, in shoe order, and how many there are
+    occurrences = {}
+    for value in range(2, 12):
+        match = (values == value) & unseen
+        copies = int((CARD_VALUE_BY_ID == value).sum()) * rules.num_decks
+        positions = np.argsort(~match, axis=1, kind='stable')[:, :copies].astype(np.int16)
+        occurrences[value] = (positions, match.sum(axis=1))
+
+    width = engine.cards_per_hand
+    window = depth[:, None] + np.arange(width)
+    table_class = {'hard': HARD, 'soft': SOFT}
+
+    counts = np.zeros((len(situations), num_systems, NUM_BUCKETS))
+    sums = np.zeros((len(situations), num_systems, NUM_BUCKETS, len(ACTIONS)))
+
+    for number, (hand_class, total, upcard, actions) in enumerate(situations):
+        combos, weights = situation_combos(hand_class, total)
+        picks = rng.choice(len(combos), size=num_hands, p=weights)
+        first = np.array([combo[0] for combo in combos], dtype=np.int8)[picks]
+        second = np.array([combo[1] for combo in combos], dtype=np.int8)[picks]
+
+        # Take each situation card from a random unseen copy of its value.  Picking
+        # the copy independently of the shoe order leaves the remaining unseen
+        # cards in uniformly random order (taking the first copy would not).
+        taken = []
+        valid = np.ones(num_hands, dtype=bool)
+        picked = {}
+        for card_values in (first, second, np.full(num_hands, upcard, dtype=np.int8)):
+            position = np.zeros(num_hands, dtype=np.intp)
+            for value in np.unique(card_values).tolist():
+                hands = np.flatnonzero(card_values == value)
+                positions, available = occurrences[value]
+                # Non-pair holdings use a value at most twice (once with the upcard)
+                prior = picked.get(value)
+                choices = available[hands] - (prior is not None)
+                valid[hands] &= choices > 0
+                copy = np.floor(rng.random(len(hands)) * np.maximum(choices, 1)).astype(np.intp)
+                if prior is not None:
+                    copy += copy >= prior[hands]
+                picked.setdefault(value, np.zeros(num_hands, dtype=np.intp))[hands] = copy
+                position[hands] = positions[hands, copy]
+            taken.append(position)
+
+        # Remaining unseen cards in order, skipping the situation cards
+        removed = np.zeros(window.shape, dtype=bool)
+        for position in taken:
+            removed |= window == position[:, None]
+        order = np.argsort(removed, axis=1, kind='stable')[:, :width - 3]
+        draws = values[rows[:, None], np.take_along_axis(window, order, axis=1)]
+
+        slabs = np.empty((num_hands, width), dtype=np.int8)
+        slabs[:, 0] = first
+        slabs[:, 1] = upcard
+        slabs[:, 2] = second
+        slabs[:, 3:] = draws
+
+        # True count per system at the decision, situation cards included
+        situation_ids = [shoes[rows, position] for position in taken]
+        running = seen_counts + sum(counter.card_tags[card_ids] for card_ids in situation_ids)
+        decks_remaining = (num_cards - 3 - depth) / 52
+        buckets = np.floor(running / decks_remaining[:, None]).astype(np.intp) - MIN_BUCKET
+
+        hole = slabs[:, 3]
+        dealer_bj = ((upcard == 11) & (hole == 10)) | ((upcard == 10) & (hole == 11))
+
+        net = np.zeros((num_hands, len(ACTIONS)))
+        for action in actions:
+            if action == 'surrender':
+                # Late surrender: half the bet back unless the dealer has blackjack
+                net[:, ACTIONS.index(action)] = np.where(dealer_bj, -1.0, -0.5)
+                continue
+            table = engine.decision_table.with_first_action(
+                table_class[hand_class], total, upcard, ACTION_CODES[action])
+            net[:, ACTIONS.index(action)] = engine.play(slabs, decision_table=table, rng=rng)['net']
+
+        # Accumulate per system and bucket, dropping counts outside the bucket range
+        for system in range(num_systems):
+            bucket = buckets[:, system]
+            inside = valid & (bucket >= 0) & (bucket < NUM_BUCKETS)
+            counts[number, system] = np.bincount(bucket[inside], minlength=NUM_BUCKETS)
+            for index in range(len(ACTIONS)):
+                sums[number, system, :, index] = np.bincount(
+                    bucket[inside], weights=net[inside, index], minlength=NUM_BUCKETS)
+
+    return counts, sums
+
+
+def find_index(counts: np.ndarray, gain: np.ndarray) -> Optional[Dict]:
+    """Crossover true count of a per-bucket EV gain curve, or None if there is none"""
+    used = counts > 0
+    if used.sum() < 3:
+        return None
+
+    # Bucket b holds true counts in [b, b + 1)
+    x = np.arange(MIN_BUCKET, MAX_BUCKET + 1)[used] + 0.5
+    y = gain[used]
+    w = counts[used]
+
+    mean_x = np.average(x, weights=w)
+    mean_y = np.average(y, weights=w)
+    sxx = np.sum(w * (x - mean_x) ** 2)
+    slope = np.sum(w * (x - mean_x) * (y - mean_y)) / sxx
+    intercept = mean_y - slope * mean_x
+
+    residuals = y - (intercept + slope * x)
+    dof = max(1, len(x) - 2)
+    slope_se = np.sqrt(np.sum(w * residuals ** 2) / dof / sxx)
+    if slope == 0 or abs(slope) < MIN_SLOPE_T * slope_se:
+        return None
+
+    crossover = -intercept / slope
+    if not MIN_BUCKET <= crossover <= MAX_BUCKET + 1:
+        return None
+
+    index = int(round(crossover))
+    above = slope > 0
+    applies = (x >= index) if above else (x <= index)
+    return {
+        'index': index,
+        'direction': 'above' if above else 'below',
+        'ev_gain': float(np.sum(w[applies] * y[applies]) / np.sum(w)),
+        'slope': float(slope)
+    }
+
+
+class DeviationIndexGenerator:
+    def __init__(self, rules: Optional[RuleSet] = None, penetration: float = 0.75,
+                 hands_per_situation: int = 200000, chunk_size: int = 50000,
+                 max_workers: Optional[int] = None, seed: Optional[int] = None):
+        self.rules = rules or RuleSet()
+        self.penetration = penetration
+        self.hands_per_situation = hands_per_situation
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+        self.seed = seed
+        self.tables = get_strategy_tables(self.rules)
+
+    def basic_action(self, hand_class: str, total: int, upcard: int) -> str:
+        if self.rules.surrender and str(upcard) in self.tables['surrender'].get(str(total), {}) \
+                and hand_class == 'hard':
+            return 'surrender'
+        return self.tables[hand_class][str(total)][str(upcard)]
+
+    def situations(self) -> List[Tuple[str, int, int, List[str]]]:
+        """Every (hand class, total, upcard) with its candidate first actions"""
+        situations = []
+        for hand_class, totals in (('hard', range(5, 18)), ('soft', range(13, 21))):
+            for total in totals:
+                if not situation_combos(hand_class, total)[0]:
+                    continue
+                for upcard in range(2, 12):
+                    actions = ['hit', 'stand', 'double']
+                    if self.rules.surrender and hand_class == 'hard':
+                        actions.append('surrender')
+                    situations.append((hand_class, total, upcard, actions))
+        return situations
+
+    def run(self) -> Dict:
+        """Simulate every situation and reduce the results to index tables per system"""
+        situations = self.situations()
+        max_workers = self.max_workers or _available_cores()
+
+        # Enough chunks to keep every worker busy, each with its own seed stream
+        num_chunks = max(max_workers, -(-self.hands_per_situation // self.chunk_size))
+        chunk_hands = [len(part) for part in np.array_split(np.arange(self.hands_per_situation), num_chunks)]
+        seeds = np.random.SeedSequence(self.seed).spawn(num_chunks)
+        tasks = [(self.rules, situations, hands, self.penetration, seed)
+                 for hands, seed in zip(chunk_hands, seeds) if hands > 0]
+
+        with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(_simulate_task, tasks))
+        counts = sum(result[0] for result in results)
+        sums = sum(result[1] for result in results)
+
+        system_names = CardCounter().system_names
+        systems = {system: [] for system in system_names}
+        for number, (hand_class, total, upcard, actions) in enumerate(situations):
+            basic = self.basic_action(hand_class, total, upcard)
+
+            for system_index, system in enumerate(system_names):
+                bucket_counts = counts[number, system_index]
+                means = sums[number, system_index] / np.maximum(bucket_counts, 1)[:, None]
+                for action in actions:
+                    if action == basic:
+                        continue
+                    gain = means[:, ACTIONS.index(action)] - means[:, ACTIONS.index(basic)]
+                    found = find_index(bucket_counts, gain)
+                    if found is not None:
+                        systems[system].append(dict(
+                            hand=hand_class, total=total, upcard=upcard,
+                            basic_action=basic, deviation_action=action, **found
+                        ))
+
+        for entries in systems.values():
+            entries.sort(key=lambda entry: -abs(entry['ev_gain']))
+
+        return {
+            'rules': self.rules.key(),
+            'hands_per_situation': self.hands_per_situation,
+            'penetration': self.penetration,
+            'systems': systems
+        }
+
+
+def save_deviation_table(table: Dict, path: str = DEFAULT_TABLE_PATH):
+    """Store a generated table next to tables for other rule sets"""
+    tables = {}
+    try:
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                tables = json.load(f)
+    except (OSError, ValueError):
+        tables = {}
+    tables[table['rules']] = table
+    with open(path, 'w') as f:
+        json.dump(tables, f, indent=1)
+
+
+def load_deviation_table(system: str = 'Hi-Lo', rules: Optional[RuleSet] = None,
+                         path: str = DEFAULT_TABLE_PATH) -> Optional[List[Dict]]:
+    """Generated indices for a system and rule set, or None if none were generated"""
+    rules = rules or RuleSet()
+    try:
+        with open(path, 'r') as f:
+            tables = json.load(f)
+    except (OSError, ValueError):
+        return None
+    table = tables.get(rules.key())
+    if table is None:
+        return None
+    return table['systems'].get(system)
+
+
+def _available_cores() -> int:
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+_worker_engines = {}
+
+
+def _worker_engine(rules: RuleSet) -> Tuple[BatchSimulator, CardCounter]:
+    """Batch engine and tag matrices for the rules, built once per process"""
+    key = rules.key()
+    if key not in _worker_engines:
+        engine = BatchSimulator(BasicStrategy(rules), hit_soft_17=rules.hit_soft_17,
+                                blackjack_payout=rules.blackjack_payout,
+                                double_after_split=rules.double_after_split,
+                                surrender=rules.surrender)
+        _worker_engines[key] = (engine, CardCounter())
+    return _worker_engines[key]
+
+
+def _simulate_task(task: Tuple) -> Tuple[np.ndarray, np.ndarray]:
+    return simulate_chunk(*task)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Generate count indices by simulation')
+    parser.add_argument('--hands', type=int, default=200000, help='hands per situation')
+    parser.add_argument('--decks', type=int, default=6)
+    parser.add_argument('--h17', action='store_true', help='dealer hits soft 17')
+    parser.add_argument('--ndas', action='store_true', help='no double after split')
+    parser.add_argument('--no-surrender', action='store_true')
+    parser.add_argument('--penetration', type=float, default=0.75)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--output', default=DEFAULT_TABLE_PATH)
+    args = parser.parse_args()
+
+    rules = RuleSet(args.decks, args.h17, not args.ndas, not args.no_surrender)
+    generator = DeviationIndexGenerator(rules, args.penetration, args.hands,
+                                        max_workers=args.workers, seed=args.seed)
+    table = generator.run()
+    save_deviation_table(table, args.output)
+    for system, entries in table['systems'].items():
+        print(f"{system}: {len(entries)} indices")
@@ -5,7 +5,8 @@ from sklearn.model_selection import train_test_split
 import pickle
 import os
 from bja_strategy import BJABasicStrategy
-from card_counting import CardCounter
+from card_counting import CardCounter, CountTracker
+from dealer_outcomes import player_win_probability
 from collections import defaultdict
 import json
 
@@ -205,7 +206,7 @@ class EnhancedAICoach:
             )
             
             win_probability = self._estimate_win_probability(
-                player_total, dealer_value, action, true_count
+                player_total, dealer_value, action, is_soft
             )
             
             reason = self._generate_reasoning(
@@ -232,31 +233,9 @@ class EnhancedAICoach:
             }
     
     def _estimate_win_probability(self, player_total: int, dealer_value: int, 
-                                action: str, true_count: float) -> float:
-        """Estimate win probability for given situation"""
-        base_probs = {
-            'hit': 0.45,
-            'stand': 0.42,
-            'double': 0.48,
-            'split': 0.46
-        }
-        
-        base_prob = base_probs.get(action.lower(), 0.45)
-        
-        if player_total >= 17:
-            base_prob += 0.1
-        elif player_total <= 11:
-            base_prob += 0.05
-        
-        if dealer_value in [2, 3, 4, 5, 6]:
-            base_prob += 0.1
-        elif dealer_value in [9, 10, 11]:
-            base_prob -= 0.1
-        
-        count_adjustment = true_count * 0.02
-        base_prob += count_adjustment
-        
-        return max(0.1, min(0.9, base_prob))
+                                action: str, is_soft: bool = False) -> float:
+        """Win probability for the action, looked up from the dealer outcome tables"""
+        return player_win_probability(player_total, dealer_value, action, is_soft)
     
     def _generate_reasoning(self, action: str, basic_action: str, player_total: int, 
                           dealer_value: int, true_count: float, confidence: float) -> str:
@@ -338,16 +317,18 @@ class EnhancedAICoach:
         else:
             return "Stiff Hands"
     
-    def test_counting_knowledge(self, dealt_cards: List, player_guess: int) -> Dict:
-        """Test player's card counting accuracy"""
+    def test_counting_knowledge(self, dealt_cards: List, player_guess: int,
+                                tracker: Optional[CountTracker] = None) -> Dict:
+        """Test player's card counting accuracy (O(1) with the shoe's count tracker)"""
         try:
-            actual_count = 0
             system = self.current_session['counting_system']
             
-            # Reset card counter and count all dealt cards
-            self.card_counter.reset_count()
-            for card in dealt_cards:
-                actual_count += self.card_counter.count_card(card, system)
+            if tracker is not None:
+                actual_count = tracker.running_count(system)
+            else:
+                # Count all dealt cards for every system at once
+                actual_count = int(self.card_counter.count_dealt(dealt_cards)[
+                    self.card_counter.system_index(system)])
             
             is_correct = (player_guess == actual_count)
             error = abs(player_guess - actual_count)
@@ -373,9 +354,10 @@ class EnhancedAICoach:
                 'system': self.current_session.get('counting_system', 'Hi-Lo')
             }
     
-    def get_count_info(self, dealt_cards: List, show_count: bool = False) -> Dict:
+    def get_count_info(self, dealt_cards: List, show_count: bool = False,
+                       tracker: Optional[CountTracker] = None) -> Dict:
         """Get card counting information"""
-        count_info = self.card_counter.get_count_info(dealt_cards)
+        count_info = self.card_counter.get_count_info(dealt_cards, tracker=tracker)
         
         if not show_count:
             # Hide the actual count values
@@ -0,0 +1,252 @@
+"""
+Composition-dependent expected value solver for blackjack decisions.
+
+Computes the EV of hit, stand, double, split and late surrender for every
+starting hand under a rule set, then reduces those to total-dependent basic
+strategy tables.  The player's draws are played without replacement from the
+exact remaining shoe and memoized on (hand state, remaining composition); the
+dealer's distribution comes from the composition left after the initial
+cards.  Generated tables are cached in memory and on disk, and feed
+BasicStrategy, BJABasicStrategy and the Flask strategy charts.
+"""
+
+import json
+import os
+from typing import Dict, Optional, Tuple
+from dealer_outcomes import (CARD_VALUES, add_card, dealer_distribution,
+                             dealer_distribution_cache_clear, shoe_composition)
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'strategy_tables.json')
+
+ACTIONS = ['hit', 'stand', 'double', 'split', 'surrender']
+
+
+class RuleSet:
+    """Table rules that change basic strategy"""
+
+    def __init__(self, num_decks: int = 6, hit_soft_17: bool = False,
+                 double_after_split: bool = True, surrender: bool = True,
+                 blackjack_payout: float = 1.5):
+        self.num_decks = num_decks
+        self.hit_soft_17 = hit_soft_17
+        self.double_after_split = double_after_split
+        self.surrender = surrender
+        self.blackjack_payout = blackjack_payout
+
+    def key(self) -> str:
+        """Canonical string used to cache tables for these rules"""
+        return (f"{self.num_decks}D-{'H17' if self.hit_soft_17 else 'S17'}"
+                f"-{'DAS' if self.double_after_split else 'NDAS'}"
+                f"-{'LS' if self.surrender else 'NS'}-{self.blackjack_payout:g}")
+
+
+def _remove(composition: Tuple[int, ...], value: int) -> Tuple[int, ...]:
+    index = value - 2
+    return composition[:index] + (composition[index] - 1,) + composition[index + 1:]
+
+
+class _Situation:
+    """EV calculations for one dealer upcard against one shoe composition"""
+
+    def __init__(self, upcard: int, composition: Tuple[int, ...], rules: RuleSet):
+        self.rules = rules
+        distribution = dealer_distribution(upcard, rules.hit_soft_17, composition,
+                                           no_blackjack=True)
+        self.stand_ev = []
+        for total in range(22):
+            win = distribution['bust']
+            loss = 0.0
+            for dealer_total in range(17, 22):
+                p = distribution[str(dealer_total)]
+                if total > dealer_total:
+                    win += p
+                elif total < dealer_total:
+                    loss += p
+            self.stand_ev.append(win - loss)
+        self.memo = {}
+
+    def stand(self, total: int) -> float:
+        return self.stand_ev[total] if total <= 21 else -1.0
+
+    def hit(self, total: int, soft: bool, composition: Tuple[int, ...]) -> float:
+        """EV of hitting, then continuing with the best of hit/stand"""
+        key = (total, soft, composition)
+        if key in self.memo:
+            return self.memo[key]
+
+        remaining = sum(composition)
+        ev = 0.0
+        for index, value in enumerate(CARD_VALUES):
+            count = composition[index]
+            if count == 0:
+                continue
+            next_total, next_soft = add_card(total, soft, value)
+            if next_total > 21:
+                ev -= count / remaining
+            elif next_total == 21:
+                ev += count / remaining * self.stand_ev[21]
+            else:
+                next_composition = _remove(composition, value)
+                ev += count / remaining * max(self.stand_ev[next_total],
+                                              self.hit(next_total, next_soft, next_composition))
+        self.memo[key] = ev
+        return ev
+
+    def double(self, total: int, soft: bool, composition: Tuple[int, ...]) -> float:
+        remaining = sum(composition)
+        ev = 0.0
+        for index, value in enumerate(CARD_VALUES):
+            if composition[index]:
+                ev += composition[index] / remaining * self.stand(add_card(total, soft, value)[0])
+        return 2 * ev
+
+    def split(self, pair_value: int, composition: Tuple[int, ...]) -> float:
+        """EV of splitting (two hands, no resplit); composition excludes both pair cards"""
+        remaining = sum(composition)
+        ev = 0.0
+        for index, value in enumerate(CARD_VALUES):
+            count = composition[index]
+            if count == 0:
+                continue
+            total, soft = add_card(*add_card(0, False, pair_value), value)
+            next_composition = _remove(composition, value)
+            if pair_value == 11:
+                hand_ev = self.stand(total)  # Split aces get one card each
+            else:
+                hand_ev = max(self.stand(total), self.hit(total, soft, next_composition))
+                if self.rules.double_after_split:
+                    hand_ev = max(hand_ev, self.double(total, soft, next_composition))
+            ev += count / remaining * hand_ev
+        return 2 * ev
+
+    def evaluate(self, first: int, second: int, composition: Tuple[int, ...]) -> Dict[str, float]:
+        """EV of every action for a two-card hand; composition excludes both cards"""
+        total, soft = add_card(*add_card(0, False, first), second)
+        evs = {
+            'stand': self.stand(total),
+            'hit': self.hit(total, soft, composition),
+            'double': self.double(total, soft, composition),
+        }
+        if first == second:
+            evs['split'] = self.split(first, composition)
+        if self.rules.surrender:
+            evs['surrender'] = -0.5
+        return evs
+
+
+class StrategySolver:
+    def __init__(self, rules: Optional[RuleSet] = None):
+        self.rules = rules or RuleSet()
+
+    def hand_evs(self, first: int, second: int, upcard: int) -> Dict[str, float]:
+        """Composition-dependent EV of each action for one starting hand"""
+        composition = shoe_composition(self.rules.num_decks, [first, second, upcard])
+        situation = _Situation(upcard, composition, self.rules)
+        return situation.evaluate(first, second, composition)
+
+    def solve(self) -> Dict:
+        """Total-dependent strategy tables for the rule set"""
+        totals = {}    # (hand class, total, upcard) -> [weight, weighted EV sums]
+        unsplit = {}   # Pairs played as plain totals, used where no other hand makes the total
+        pairs = {}
+
+        for upcard in CARD_VALUES:
+            base = shoe_composition(self.rules.num_decks, [upcard])
+            for first_index, first in enumerate(CARD_VALUES):
+                for second in CARD_VALUES[first_index:]:
+                    if first + second == 21:
+                        continue  # Blackjack needs no decision
+                    if first == second:
+                        weight = base[first - 2] * (base[first - 2] - 1)
+                    else:
+                        weight = 2 * base[first - 2] * base[second - 2]
+                    if weight <= 0:
+                        continue
+
+                    composition = _remove(_remove(base, first), second)
+                    evs = _Situation(upcard, composition, self.rules).evaluate(first, second, composition)
+                    total, soft = add_card(*add_card(0, False, first), second)
+                    key = ('soft' if soft else 'hard', total, upcard)
+
+                    if first == second:
+                        _accumulate(pairs, ('pairs', first, upcard), weight, evs)
+                        _accumulate(unsplit, key, weight,
+                                    {a: ev for a, ev in evs.items() if a != 'split'})
+                    else:
+                        _accumulate(totals, key, weight, evs)
+
+        for key, entry in unsplit.items():
+            totals.setdefault(key, entry)
+        totals.update(pairs)
+        dealer_distribution_cache_clear()
+
+        tables = {'rules': self.rules.key(), 'hard': {}, 'soft': {}, 'pairs': {},
+                  'no_double': {'hard': {}, 'soft': {}, 'pairs': {}},
+                  'surrender': {}, 'ev': {'hard': {}, 'soft': {}, 'pairs': {}}}
+
+        for (hand_class, total, upcard), (weight, ev_sums) in sorted(totals.items()):
+            evs = {action: ev / weight for action, ev in ev_sums.items()}
+            playing = {a: ev for a, ev in evs.items() if a != 'surrender'}
+            best = max(playing, key=playing.get)
+
+            row = str(total)
+            column = str(upcard)
+            tables[hand_class].setdefault(row, {})[column] = best
+            tables['no_double'][hand_class].setdefault(row, {})[column] = max(('hit', 'stand'), key=playing.get)
+            tables['ev'][hand_class].setdefault(row, {})[column] = evs
+
+            if evs.get('surrender', -1.0) > playing[best] and hand_class != 'soft':
+                surrender_row = f"{total},{total}" if hand_class == 'pairs' else row
+                tables['surrender'].setdefault(surrender_row, {})[column] = 'surrender'
+
+        # Totals that only multi-card hands reach
+        for upcard in CARD_VALUES:
+            for hand_class in ('hard', 'soft'):
+                tables[hand_class].setdefault('21', {})[str(upcard)] = 'stand'
+                tables['no_double'][hand_class].setdefault('21', {})[str(upcard)] = 'stand'
+        return tables
+
+
+def _accumulate(sums: Dict, key: Tuple, weight: float, evs: Dict[str, float]):
+    entry = sums.setdefault(key, [0.0, {}])
+    entry[0] += weight
+    for action, ev in evs.items():
+        entry[1][action] = entry[1].get(action, 0.0) + weight * ev
+
+
+class StrategyTableCache:
+    """Generated strategy tables keyed by rule set, persisted to a JSON file"""
+
+    def __init__(self, cache_path: str = DEFAULT_CACHE_PATH):
+        self.cache_path = cache_path
+        self.tables = {}
+        try:
+            if cache_path and os.path.exists(cache_path):
+                with open(cache_path, 'r') as f:
+                    self.tables = json.load(f)
+        except (OSError, ValueError):
+            self.tables = {}
+
+    def get(self, rules: Optional[RuleSet] = None) -> Dict:
+        rules = rules or RuleSet()
+        key = rules.key()
+        if key not in self.tables:
+            self.tables[key] = StrategySolver(rules).solve()
+            if self.cache_path:
+                try:
+                    with open(self.cache_path, 'w') as f:
+                        json.dump(self.tables, f)
+                except OSError:
+                    pass  # Tables can always be regenerated
+        return self.tables[key]
+
+
+_default_cache = None
+
+
+def get_strategy_tables(rules: Optional[RuleSet] = None) -> Dict:
+    """Generated tables for a rule set (S17, 6 decks, DAS, late surrender by default)"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = StrategyTableCache()
+    return _default_cache.get(rules)
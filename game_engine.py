@@ -1,62 +1,51 @@
 import random
 import numpy as np
 from typing import List, Dict, Tuple, Optional
+from shoe import Shoe
+from cards import CardFace
+from card_counting import CountTracker
 
-class Card:
-    def __init__(self, suit: str, rank: str):
-        self.suit = suit
-        self.rank = rank
-    
-    def __str__(self):
-        return f"{self.rank}{self.suit[0]}"
-    
-    def get_value(self) -> int:
-        """Get the blackjack value of the card"""
-        if self.rank in ['J', 'Q', 'K']:
-            return 10
-        elif self.rank == 'A':
-            return 11  # Aces are handled separately
-        else:
-            return int(self.rank)
+class Card(CardFace):
+    """Game engine card; the 52 instances are shared by every deck"""
+    __slots__ = ()
+    SUITS = ('Hearts', 'Diamonds', 'Clubs', 'Spades')
 
 class Deck:
-    def __init__(self, num_decks: int = 6):
+    SUITS = list(Card.SUITS)
+    
+    def __init__(self, num_decks: int = 6, rng: Optional[random.Random] = None):
         self.num_decks = num_decks
-        self.cards = []
-        self.dealt_cards = []
-        self.reset()
+        self.shoe = Shoe(num_decks, rng=rng)
     
     def reset(self):
-        """Create a fresh deck"""
-        suits = ['Hearts', 'Diamonds', 'Clubs', 'Spades']
-        ranks = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
-        
-        self.cards = []
-        for _ in range(self.num_decks):
-            for suit in suits:
-                for rank in ranks:
-                    self.cards.append(Card(suit, rank))
-        
-        self.shuffle()
-        self.dealt_cards = []
+        """Gather and reshuffle the shoe in place"""
+        self.shoe.shuffle()
     
     def shuffle(self):
         """Shuffle the deck"""
-        random.shuffle(self.cards)
+        self.shoe.shuffle()
     
     def deal_card(self) -> Card:
         """Deal one card from the deck"""
-        if len(self.cards) < 20:  # Reshuffle when running low
-            self.reset()
-        
-        card = self.cards.pop()
-        self.dealt_cards.append(card)
-        return card
+        return self.card_view(self.shoe.deal())
+    
+    def card_view(self, card_id: int) -> Card:
+        """Shared Card instance for a card id"""
+        return Card.from_id(card_id)
+    
+    @property
+    def cards(self) -> List[Card]:
+        """Undealt cards, next card last (the order deal_card used to pop in)"""
+        return [self.card_view(card_id) for card_id in reversed(self.shoe.undealt())]
+    
+    @property
+    def dealt_cards(self) -> List[Card]:
+        """Cards dealt since the last shuffle"""
+        return [self.card_view(card_id) for card_id in self.shoe.dealt()]
     
     def get_penetration(self) -> float:
         """Calculate deck penetration"""
-        total_cards = 52 * self.num_decks
-        return len(self.dealt_cards) / total_cards
+        return self.shoe.penetration()
 
 class Hand:
     def __init__(self):
@@ -65,51 +54,53 @@ class Hand:
         self.is_split = False
         self.is_doubled = False
         self.is_surrender = False
+        # Running totals kept by add_card/pop_card, so every query is O(1)
+        self._hard_total = 0  # Aces count 1
+        self._aces = 0
+        self._value = 0
+        self._soft = False
     
     def add_card(self, card: Card):
         """Add a card to the hand"""
         self.cards.append(card)
+        if card.value == 11:
+            self._aces += 1
+            self._hard_total += 1
+        else:
+            self._hard_total += card.value
+        self._update_totals()
+    
+    def pop_card(self) -> Card:
+        """Remove and return the last card (the card a split moves to the new hand)"""
+        card = self.cards.pop()
+        if card.value == 11:
+            self._aces -= 1
+            self._hard_total -= 1
+        else:
+            self._hard_total -= card.value
+        self._update_totals()
+        return card
+    
+    def _update_totals(self):
+        # At most one ace can count 11 without busting; the hand is soft while one does
+        self._soft = self._aces > 0 and self._hard_total + 10 <= 21
+        self._value = self._hard_total + 10 if self._soft else self._hard_total
     
     def get_value(self) -> int:
         """Calculate the best value of the hand"""
-        total = 0
-        aces = 0
-        
-        for card in self.cards:
-            if card.rank == 'A':
-                aces += 1
-                total += 11
-            else:
-                total += card.get_value()
-        
-        # Adjust for aces
-        while total > 21 and aces > 0:
-            total -= 10
-            aces -= 1
-        
-        return total
+        return self._value
     
     def is_soft(self) -> bool:
         """Check if hand is soft (contains usable ace)"""
-        total = 0
-        aces = 0
-        
-        for card in self.cards:
-            if card.rank == 'A':
-                aces += 1
-                total += 11
-            else:
-                total += card.get_value()
-        
-        return aces > 0 and total <= 21
+        return self._soft
     
     def is_busted(self) -> bool:
         """Check if hand is busted"""
-        return self.get_value() > 21
+        return self._value > 21
     
     def is_blackjack(self) -> bool:
         """Check if hand is blackjack"""
-        return len(self.cards) == 2 and self.get_value() == 21
+        return self._value == 21 and len(self.cards) == 2
     
     def can_split(self) -> bool:
         """Check if hand can be split"""
@@ -121,6 +112,9 @@ class Hand:
 class BlackjackGame:
     def __init__(self, num_decks: int = 6):
         self.deck = Deck(num_decks)
+        
+        # Count state kept up to date as cards leave the shoe
+        self.count_tracker = self.deck.shoe.attach(CountTracker(num_decks))
         self.player_hands: List[Hand] = []
         self.dealer_hand = Hand()
         self.current_hand_index = 0
@@ -198,7 +192,7 @@ class BlackjackGame:
         
         # Create new hand with second card
         new_hand = Hand()
-        new_hand.add_card(current_hand.cards.pop())
+        new_hand.add_card(current_hand.pop_card())
         new_hand.bet = current_hand.bet
         new_hand.is_split = True
         
@@ -434,7 +428,7 @@ class BlackjackGame:
     @property
     def cards_dealt(self) -> int:
         """Get number of cards dealt"""
-        return len(self.deck.dealt_cards)
+        return self.deck.shoe.cursor
     
     def split(self):
         """Split the current hand - alias for split_hand for compatibility"""
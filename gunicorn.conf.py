@@ -0,0 +1,26 @@
+"""
+Gunicorn settings for the web app.
+
+Simulation jobs (simulation_jobs.SimulationJobManager) live in the memory of
+the process that accepted them, so status, stream and cancel requests must
+reach that same process: the app runs as a single worker process and scales
+with threads instead.  Sessions are in the shared store and would survive
+more workers, jobs would not, so starting with more than one is refused.
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = 1
+worker_class = 'gthread'
+threads = 8
+
+# gthread workers heartbeat from their main thread, so this bounds a stuck
+# worker, not a long progress stream
+timeout = 120
+
+
+def on_starting(server):
+    if server.cfg.workers != 1:
+        raise RuntimeError('Simulation jobs are kept in process memory; run a single '
+                           'worker (scale with --threads)')
@@ -1,66 +1,257 @@
+import math
 import numpy as np
 import random
 from typing import Dict, List, Tuple
 from game_engine import BlackjackGame, Deck, Hand, Card
 from strategy_tables import BasicStrategy
+from ev_solver import RuleSet
 from card_counting import CardCounter
+from batch_engine import BatchSimulator
+from decision_table import DecisionTable, DeviationOverlay, HIT, DOUBLE, SPLIT, SURRENDER
+from simulation_stats import StreamingStats
+from simulation_cache import SimulationResultCache
+from bankroll_risk import BetRamp
+from deviation_indices import load_deviation_table
 import concurrent.futures
-from multiprocessing import Pool
+import os
 import time
 
+# Time-boxed runs: the scalar loop checks the clock every TIME_CHECK_HANDS hands;
+# the batch engine measures its rate on a small first chunk, then sizes chunks
+# to fill TIMED_CHUNK_FILL of the remaining budget and stops once the budget
+# leaves room for less than TIMED_MIN_CHUNK
+TIME_CHECK_HANDS = 100
+TIMED_FIRST_CHUNK = 2000
+TIMED_CHUNK_FILL = 0.9
+TIMED_MIN_CHUNK = 500
+
 class MonteCarloSimulator:
-    def __init__(self):
-        self.basic_strategy = BasicStrategy()
+    # Count-based playing deviations: (player_total, dealer_upcard, min_true_count, action)
+    COUNTING_DEVIATIONS = [
+        (16, 10, 0, 'stand'),
+        (15, 10, 4, 'stand'),
+        (12, 2, 3, 'stand'),
+        (12, 3, 2, 'stand'),
+        (10, 10, 4, 'double'),
+        (10, 9, 1, 'double'),
+    ]
+    
+    # Extra plays of the optimized strategy, taken when the true count is above 2 / below -2
+    OPTIMIZED_HIGH_COUNT_PLAYS = (
+        [(11, upcard, 2, 'double') for upcard in range(2, 11)] +
+        [(9, upcard, 2, 'double') for upcard in range(3, 7)]
+    )
+    OPTIMIZED_LOW_COUNT_PLAYS = [
+        (total, upcard, -2, 'hit') for total in range(12, 22) for upcard in range(7, 12)
+    ]
+    
+    def __init__(self, cache_size: int = 128, cache_max_age: float = 3600,
+                 cache_dir: str = None, rules: RuleSet = None, cache_disk_entries: int = 1024):
+        # Both engines deal these table rules (H17 by default) and play the
+        # strategy solved for them
+        self.rules = rules or RuleSet(hit_soft_17=True)
+        self.basic_strategy = BasicStrategy(self.rules)
         self.card_counter = CardCounter()
-        self.results_cache = {}
+        self.batch_engine = BatchSimulator(
+            self.basic_strategy, hit_soft_17=self.rules.hit_soft_17,
+            blackjack_payout=self.rules.blackjack_payout,
+            double_after_split=self.rules.double_after_split, surrender=self.rules.surrender
+        )
+        
+        # Compiled strategies shared by the scalar and batch engines
+        self.decision_table = self.batch_engine.decision_table
+        self.counting_plays = self._counting_plays()
+        self.counting_table = self.decision_table.with_overlay(self._counting_overlay())
+        self.optimized_table = self.decision_table.with_overlay(
+            self._counting_overlay()
+            .add_plays(self.OPTIMIZED_HIGH_COUNT_PLAYS, strict=True)
+            .add_plays(self.OPTIMIZED_LOW_COUNT_PLAYS, above=False, strict=True)
+        )
+        self.results_cache = SimulationResultCache(cache_size, cache_max_age, cache_dir, cache_disk_entries)
+    
+    def _counting_plays(self) -> Dict[str, List[Tuple[int, int, float, str]]]:
+        """Hi-Lo plays taken at or above / at or below their index.
+        
+        Uses the simulated index table when one has been generated (hard
+        hit/stand/double plays only; surrender follows the basic strategy
+        mask), otherwise the built-in COUNTING_DEVIATIONS.
+        """
+        plays = {'above': [], 'below': []}
+        for entry in load_deviation_table('Hi-Lo') or []:
+            if entry['hand'] != 'hard' or 'surrender' in (entry['basic_action'], entry['deviation_action']):
+                continue
+            plays[entry['direction']].append(
+                (entry['total'], entry['upcard'], entry['index'], entry['deviation_action']))
+        
+        if not plays['above'] and not plays['below']:
+            plays['above'] = list(self.COUNTING_DEVIATIONS)
+        return plays
+    
+    def _counting_overlay(self) -> DeviationOverlay:
+        return (DeviationOverlay()
+                .add_plays(self.counting_plays['above'])
+                .add_plays(self.counting_plays['below'], above=False))
     
     def run_simulation(self, num_hands: int = 10000, num_decks: int = 6, 
-                      penetration: float = 0.75, strategy_type: str = "Basic Strategy Only") -> Dict:
-        """Run Monte Carlo simulation with specified parameters"""
-        
-        # Clear previous results
-        self.results_cache.clear()
+                      penetration: float = 0.75, strategy_type: str = "Basic Strategy Only",
+                      engine: str = "scalar", seed: int = None,
+                      trajectory_points: int = 500, target_std_error: float = None,
+                      target_ci_width: float = None, check_interval: int = 10000,
+                      use_cache: bool = True, time_budget: float = None,
+                      bet_ramp: BetRamp = None) -> Dict:
+        """Run Monte Carlo simulation with specified parameters
+        
+        engine="batch" plays the hands as NumPy array operations, which is
+        orders of magnitude faster for large runs. Memory use does not grow
+        with num_hands: the bankroll curve is returned downsampled to at most
+        trajectory_points values.
+        
+        Given target_std_error or target_ci_width (95% interval, as a fraction
+        of the amount wagered) for the house edge, num_hands becomes a budget:
+        convergence is checked every check_interval hands and the run stops
+        as soon as the target is met.
+        
+        Given time_budget (seconds), num_hands is a cap as well: the run plays
+        as many hands as fit in the budget and reports the sample size it
+        achieved alongside the error bars.  The batch engine sizes its chunks
+        from the measured hand rate so the last one ends near the deadline.
+        
+        bet_ramp replaces the built-in count ramp of the Card Counting
+        strategy (bets in the same units of 100 per base bet).
+        
+        Seeded results are cached by their parameters, so repeating a scenario
+        returns the stored run (marked 'from_cache') instead of recomputing.
+        Unseeded and time-boxed runs are not reproducible and always run.
+        """
         
         # Initialize simulation parameters
         sim_params = {
             'num_hands': num_hands,
             'num_decks': num_decks,
             'penetration': penetration,
-            'strategy_type': strategy_type
+            'strategy_type': strategy_type,
+            'engine': engine,
+            'seed': seed,
+            'trajectory_points': trajectory_points,
+            'target_std_error': target_std_error,
+            'target_ci_width': target_ci_width,
+            'check_interval': max(1, check_interval),
+            'time_budget': time_budget,
+            'bet_ramp': bet_ramp
         }
         
+        ramp_steps = None
+        if bet_ramp is not None:
+            ramp_steps = {
+                'thresholds': bet_ramp.thresholds.tolist(),
+                'bets': bet_ramp.step_bets.tolist(),
+                'min_bet': bet_ramp.min_bet
+            }
+        cache_params = dict(sim_params, bet_ramp=ramp_steps, rules={
+            'hit_soft_17': self.batch_engine.hit_soft_17,
+            'blackjack_payout': self.batch_engine.blackjack_payout,
+            'double_after_split': self.batch_engine.double_after_split,
+            'max_split_hands': self.batch_engine.max_split_hands,
+            'resplit_aces': self.batch_engine.resplit_aces,
+            'surrender': self.batch_engine.surrender,
+            'counting_plays': self.counting_plays
+        })
+        # Without a seed a run is a fresh random sample, not a reproducible scenario;
+        # a time-boxed run plays as many hands as this machine manages, so it is not either
+        use_cache = use_cache and seed is not None and time_budget is None
+        if use_cache:
+            cached = self.results_cache.get(cache_params)
+            if cached is not None:
+                cached['from_cache'] = True
+                return cached
+        
         # Run simulation
         start_time = time.time()
         results = self._execute_simulation(sim_params)
         execution_time = time.time() - start_time
         
         # Add execution metadata
+        hands_played = results['statistics']['hands']
         results['execution_time'] = execution_time
-        results['hands_per_second'] = num_hands / execution_time if execution_time > 0 else 0
+        results['hands_per_second'] = hands_played / execution_time if execution_time > 0 else 0
+        
+        if target_std_error is not None or target_ci_width is not None:
+            std_error = results['statistics']['house_edge_std_error']
+            results['precision'] = {
+                'target_std_error': target_std_error,
+                'target_ci_width': target_ci_width,
+                'std_error': std_error,
+                'ci_width': 2 * 1.96 * std_error,
+                'converged': self._precision_reached(std_error, hands_played, sim_params),
+                'hands_played': hands_played,
+                'hands_budget': num_hands
+            }
+        
+        if time_budget is not None:
+            std_error = results['statistics']['house_edge_std_error']
+            results['time_budget'] = {
+                'budget_seconds': time_budget,
+                'elapsed_seconds': execution_time,
+                'hands_played': hands_played,
+                'hands_budget': num_hands,
+                'exhausted': hands_played < num_hands,
+                'std_error': std_error,
+                'ci_width': 2 * 1.96 * std_error
+            }
+        
+        results['from_cache'] = False
+        if use_cache:
+            self.results_cache.put(cache_params, results)
         
         return results
     
+    def _precision_reached(self, std_error: float, hands_played: int, params: Dict) -> bool:
+        """Whether the house-edge error bar meets the run's precision target"""
+        target_std_error = params.get('target_std_error')
+        target_ci_width = params.get('target_ci_width')
+        if target_std_error is None and target_ci_width is None:
+            return False
+        
+        # Too few hands give an unreliable error estimate
+        if hands_played < params.get('check_interval', 10000):
+            return False
+        
+        if target_std_error is not None and std_error > target_std_error:
+            return False
+        if target_ci_width is not None and 2 * 1.96 * std_error > target_ci_width:
+            return False
+        return True
+    
+    def _deadline(self, params: Dict) -> float:
+        """Wall-clock time at which a time-boxed run stops, or None"""
+        if params.get('time_budget') is None:
+            return None
+        return time.time() + params['time_budget']
+    
     def _execute_simulation(self, params: Dict) -> Dict:
         """Execute the Monte Carlo simulation"""
+        if params.get('engine') == 'batch':
+            return self._execute_batch_simulation(params)
+        
         num_hands = params['num_hands']
         num_decks = params['num_decks']
         penetration = params['penetration']
         strategy_type = params['strategy_type']
         
-        # Initialize tracking variables
-        hands_won = 0
-        hands_lost = 0
-        hands_pushed = 0
-        total_wagered = 0
-        total_winnings = 0
-        cumulative_winnings = []
+        # Constant-memory tracking of results and the bankroll curve
+        stats = StreamingStats(params.get('trajectory_points', 500))
         
-        # Strategy-specific variables
+        # Strategy-specific variables: counting bets by the count, and both
+        # count-aware strategies play their count deviations
         use_counting = "Card Counting" in strategy_type
-        use_ml = "ML" in strategy_type or "Optimized" in strategy_type
+        track_count = use_counting or "ML" in strategy_type or "Optimized" in strategy_type
+        
+        bet_ramp = params.get('bet_ramp')
+        check_interval = params.get('check_interval', 10000)
+        deadline = self._deadline(params)
         
         # Initialize deck and counting
-        deck = Deck(num_decks)
+        deck = Deck(num_decks, rng=self._make_random(params.get('seed')))
         running_count = 0
         cards_seen = 0
         
@@ -75,7 +266,7 @@ class MonteCarloSimulator:
             # Determine bet size
             if use_counting:
                 true_count = running_count / max(1, (52 * num_decks - cards_seen) / 52)
-                bet_size = self._get_optimal_bet(true_count)
+                bet_size = bet_ramp.bet(true_count) if bet_ramp is not None else self._get_optimal_bet(true_count)
             else:
                 bet_size = 100  # Base bet
             
@@ -83,26 +274,192 @@ class MonteCarloSimulator:
             hand_result = self._simulate_hand(deck, bet_size, strategy_type, running_count, cards_seen)
             
             # Update counters
-            if hand_result['outcome'] == 'win':
-                hands_won += 1
-            elif hand_result['outcome'] == 'loss':
-                hands_lost += 1
-            else:
-                hands_pushed += 1
-            
-            total_wagered += hand_result['bet']
-            total_winnings += hand_result['payout']
-            cumulative_winnings.append(total_winnings - total_wagered)
+            outcome = {'win': 1, 'loss': -1}.get(hand_result['outcome'], 0)
+            stats.update(hand_result['payout'] - hand_result['bet'], hand_result['bet'], outcome)
             
             # Update card counting
-            if use_counting:
+            if track_count:
                 for card in hand_result['cards_seen']:
                     running_count += self._get_card_count_value(card)
                     cards_seen += 1
+            
+            # Stop early once the precision target is met
+            if (hand_num + 1) % check_interval == 0 and \
+                    self._precision_reached(stats.house_edge_std_error, stats.count, params):
+                break
+            
+            # Stop when the time budget runs out
+            if deadline is not None and (hand_num + 1) % TIME_CHECK_HANDS == 0 and time.time() >= deadline:
+                break
+        
+        return self._build_results(stats, strategy_type, deck.get_penetration())
+    
+    def _execute_batch_simulation(self, params: Dict) -> Dict:
+        """Execute the simulation with the vectorized batch engine"""
+        num_hands = params['num_hands']
+        num_decks = params['num_decks']
+        strategy_type = params['strategy_type']
+        
+        rng = np.random.default_rng(_seed_sequence(params.get('seed')))
+        engine = self.batch_engine
+        
+        stats = StreamingStats(params.get('trajectory_points', 500))
+        
+        # Play in chunks no larger than the convergence check interval
+        chunk_size = engine.batch_size
+        if params.get('target_std_error') is not None or params.get('target_ci_width') is not None:
+            chunk_size = min(chunk_size, params.get('check_interval', 10000))
+        
+        deadline = self._deadline(params)
+        hands_per_second = None
+        start = 0
+        while start < num_hands:
+            batch_hands = min(chunk_size, num_hands - start)
+            if deadline is not None:
+                # Size the chunk to what still fits in the budget at the measured rate;
+                # the minimum chunk only applies when the budget, not the hand cap, limits it
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                if hands_per_second is None:
+                    batch_hands = min(batch_hands, TIMED_FIRST_CHUNK)
+                else:
+                    fits = int(hands_per_second * remaining * TIMED_CHUNK_FILL)
+                    if fits < batch_hands:
+                        if fits < TIMED_MIN_CHUNK:
+                            break
+                        batch_hands = fits
+            chunk_started = time.time()
+            
+            slabs, cards_seen = engine.deal_slabs(batch_hands, num_decks, params['penetration'], rng)
+            bets, hands = self._play_batch(slabs, cards_seen, num_decks, strategy_type, rng,
+                                           params.get('bet_ramp'))
+            
+            stats.update_batch(bets * hands['net'], bets * hands['multiplier'], hands['outcome'])
+            start += batch_hands
+            hands_per_second = batch_hands / max(time.time() - chunk_started, 1e-6)
+            
+            if self._precision_reached(stats.house_edge_std_error, stats.count, params):
+                break
+        
+        final_penetration = 0.0
+        if stats.count > 0:
+            final_penetration = (cards_seen[-1] + engine.cards_per_hand) / (52 * num_decks)
+        
+        return self._build_results(stats, strategy_type, final_penetration)
+    
+    def _play_batch(self, slabs: np.ndarray, cards_seen: np.ndarray, num_decks: int,
+                    strategy_type: str, rng: np.random.Generator,
+                    bet_ramp: BetRamp = None) -> Tuple[np.ndarray, Dict]:
+        """Bets and batch engine results for one chunk of slabs under a strategy"""
+        use_counting = "Card Counting" in strategy_type
+        use_ml = "ML" in strategy_type or "Optimized" in strategy_type
+        
+        true_counts = None
+        bets = np.full(len(slabs), 100.0)
+        if use_counting or use_ml:
+            running_counts = self.batch_engine.running_counts(slabs, cards_seen)
+            true_counts = running_counts / np.maximum(1, (52 * num_decks - cards_seen) / 52)
+            if use_counting:
+                bets = bet_ramp.bets(true_counts) if bet_ramp is not None else self._get_optimal_bets(true_counts)
+        
+        hands = self.batch_engine.play(slabs, true_counts, self._decision_table(strategy_type), rng=rng)
+        return bets, hands
+    
+    def compare_strategies(self, strategy_types: List[str], num_hands: int = 100000,
+                           num_decks: int = 6, penetration: float = 0.75, seed: int = None,
+                           target_std_error: float = None, check_interval: int = 10000) -> Dict:
+        """Play several strategies on identical shoes (common random numbers)
+        
+        Every strategy plays the same slabs with the batch engine, so the
+        per-hand differences from the first (baseline) strategy cancel most of
+        the card luck.  Differences are in base bets (100) per hand; their
+        error bars are typically many times smaller than those of two
+        independent runs, which are reported alongside for comparison.  Given
+        target_std_error (base bets per hand), the run stops once every
+        difference is that precise.
+        """
+        baseline = strategy_types[0]
+        rng = np.random.default_rng(_seed_sequence(seed))
+        engine = self.batch_engine
+        base_bet = 100.0
+        
+        stats = {strategy: StreamingStats() for strategy in strategy_types}
+        differences = {strategy: StreamingStats() for strategy in strategy_types[1:]}
+        
+        chunk_size = engine.batch_size
+        if target_std_error is not None:
+            chunk_size = min(chunk_size, check_interval)
+        
+        start_time = time.time()
+        for start in range(0, num_hands, chunk_size):
+            batch_hands = min(chunk_size, num_hands - start)
+            slabs, cards_seen = engine.deal_slabs(batch_hands, num_decks, penetration, rng)
+            # Hands that run past their slab draw the same extra cards under every strategy
+            extension_seed = rng.integers(2 ** 63)
+            
+            nets = {}
+            for strategy in strategy_types:
+                bets, hands = self._play_batch(slabs, cards_seen, num_decks, strategy,
+                                               np.random.default_rng(extension_seed))
+                nets[strategy] = bets * hands['net']
+                stats[strategy].update_batch(nets[strategy], bets * hands['multiplier'], hands['outcome'])
+            
+            for strategy, difference in differences.items():
+                delta = (nets[strategy] - nets[baseline]) / base_bet
+                difference.update_batch(delta, np.ones(batch_hands), np.sign(delta))
+            
+            if target_std_error is not None and all(
+                    difference.mean_net_std_error <= target_std_error
+                    for difference in differences.values()):
+                break
+        
+        hands_played = stats[baseline].count
+        results = {
+            'baseline': baseline,
+            'hands': hands_played,
+            'execution_time': time.time() - start_time,
+            'strategies': {},
+            'differences': {}
+        }
+        for strategy, strategy_stats in stats.items():
+            results['strategies'][strategy] = {
+                'house_edge': strategy_stats.house_edge,
+                'house_edge_std_error': strategy_stats.house_edge_std_error,
+                'ev_per_hand': strategy_stats.mean_net / base_bet,
+                'std_per_hand': strategy_stats.std / base_bet,
+                'average_bet': strategy_stats.mean_wagered
+            }
+        
+        for strategy, difference in differences.items():
+            std_error = difference.mean_net_std_error
+            # Error bar of the same difference from two independent runs of this length
+            independent_variance = (stats[strategy].variance + stats[baseline].variance) / base_bet ** 2
+            independent_std_error = math.sqrt(independent_variance / hands_played) if hands_played > 0 else 0.0
+            variance_reduction = independent_variance / difference.variance if difference.variance > 0 else None
+            results['differences'][strategy] = {
+                'ev_difference_per_hand': difference.mean_net,
+                'std_error': std_error,
+                'confidence_interval_95': [difference.mean_net - 1.96 * std_error,
+                                           difference.mean_net + 1.96 * std_error],
+                'paired_std_per_hand': difference.std,
+                'independent_std_error': independent_std_error,
+                'variance_reduction': variance_reduction,
+                'equivalent_independent_hands': hands_played * variance_reduction if variance_reduction else None
+            }
+        
+        return results
+    
+    def _build_results(self, stats: StreamingStats, strategy_type: str, 
+                      final_penetration: float) -> Dict:
+        """Build the simulation result dict from the streaming statistics"""
+        num_hands = stats.count
+        total_wagered = stats.total_wagered
+        total_winnings = stats.total_wagered + stats.total_net
         
         # Calculate final statistics
-        win_rate = hands_won / num_hands if num_hands > 0 else 0
-        house_edge = -(total_winnings - total_wagered) / total_wagered if total_wagered > 0 else 0
+        win_rate = stats.hands_won / num_hands if num_hands > 0 else 0
+        house_edge = stats.house_edge
         
         # Calculate hourly expectation (assuming 100 hands per hour)
         hands_per_hour = 100
@@ -110,23 +467,22 @@ class MonteCarloSimulator:
         expected_hourly = -house_edge * hands_per_hour * average_bet
         
         # Generate insights
-        insights = self._generate_insights(
-            win_rate, house_edge, strategy_type, cumulative_winnings
-        )
+        insights = self._generate_insights(win_rate, house_edge, strategy_type, stats)
         
         return {
             'win_rate': win_rate,
             'house_edge': house_edge,
             'expected_hourly': expected_hourly,
-            'hands_won': hands_won,
-            'hands_lost': hands_lost,
-            'hands_pushed': hands_pushed,
+            'hands_won': stats.hands_won,
+            'hands_lost': stats.hands_lost,
+            'hands_pushed': stats.hands_pushed,
             'total_wagered': total_wagered,
             'total_winnings': total_winnings,
-            'net_result': total_winnings - total_wagered,
-            'cumulative_winnings': cumulative_winnings,
+            'net_result': stats.total_net,
+            'cumulative_winnings': list(stats.trajectory),
+            'statistics': stats.to_dict(),
             'insights': insights,
-            'final_penetration': deck.get_penetration(),
+            'final_penetration': final_penetration,
             'average_bet': average_bet
         }
     
@@ -165,7 +521,7 @@ class MonteCarloSimulator:
                 return {
                     'outcome': 'win',
                     'bet': bet_size,
-                    'payout': bet_size + int(bet_size * 1.5),
+                    'payout': bet_size + bet_size * self.batch_engine.blackjack_payout,
                     'cards_seen': cards_dealt
                 }
             else:  # dealer_bj
@@ -176,159 +532,129 @@ class MonteCarloSimulator:
                     'cards_seen': cards_dealt
                 }
         
-        # Play player hand
-        while not player_hand.is_busted() and player_hand.get_value() < 21:
-            action = self._get_optimal_action(
-                player_hand, dealer_cards[0], strategy_type, running_count, cards_seen
-            )
-            
-            if action == 'hit':
+        # Play the player's hands in table order; split hands are appended and
+        # receive their second card when their turn comes
+        rules = self.batch_engine
+        hands = [player_hand]
+        index = 0
+        while index < len(hands):
+            hand = hands[index]
+            if len(hand.cards) == 1:
                 new_card = deck.deal_card()
-                player_hand.add_card(new_card)
+                hand.add_card(new_card)
                 cards_dealt.append(new_card)
-            elif action == 'double':
-                if len(player_hand.cards) == 2:  # Can only double on first two cards
-                    player_hand.bet *= 2
-                    bet_size *= 2
+            
+            while not hand.is_busted() and hand.get_value() < 21:
+                action = self._get_optimal_action(
+                    hand, dealer_cards[0], strategy_type, running_count, cards_seen, len(hands),
+                    deck.num_decks
+                )
+                
+                # Split aces take one card unless they are split again
+                if hand.is_split and hand.cards[0].rank == 'A' and action != SPLIT:
+                    break
+                
+                if action == SURRENDER:
+                    hand.is_surrender = True
+                    break
+                elif action == SPLIT:
+                    split_hand = Hand()
+                    split_hand.add_card(hand.pop_card())
+                    split_hand.bet = hand.bet
+                    hand.is_split = split_hand.is_split = True
+                    hands.append(split_hand)
+                    new_card = deck.deal_card()
+                    hand.add_card(new_card)
+                    cards_dealt.append(new_card)
+                elif action == DOUBLE and len(hand.cards) == 2:
+                    hand.bet *= 2
+                    hand.is_doubled = True
+                    new_card = deck.deal_card()
+                    hand.add_card(new_card)
+                    cards_dealt.append(new_card)
+                    break
+                elif action in (HIT, DOUBLE):  # A double the hand cannot take is a hit
+                    new_card = deck.deal_card()
+                    hand.add_card(new_card)
+                    cards_dealt.append(new_card)
+                else:  # stand
+                    break
+            index += 1
+        
+        # Play dealer hand unless every player hand is settled already
+        if any(not hand.is_surrender and not hand.is_busted() for hand in hands):
+            while dealer_hand.get_value() < 17 or \
+                    (rules.hit_soft_17 and dealer_hand.get_value() == 17 and dealer_hand.is_soft()):
                 new_card = deck.deal_card()
-                player_hand.add_card(new_card)
+                dealer_hand.add_card(new_card)
                 cards_dealt.append(new_card)
-                break
-            else:  # stand
-                break
-        
-        # Play dealer hand
-        while dealer_hand.get_value() < 17 or (dealer_hand.get_value() == 17 and dealer_hand.is_soft()):
-            new_card = deck.deal_card()
-            dealer_hand.add_card(new_card)
-            cards_dealt.append(new_card)
         
-        # Determine outcome
-        player_value = player_hand.get_value()
+        # Settle every hand
         dealer_value = dealer_hand.get_value()
-        
-        if player_value > 21:
-            outcome = 'loss'
-            payout = 0
-        elif dealer_value > 21:
-            outcome = 'win'
-            payout = bet_size * 2
-        elif player_value > dealer_value:
+        total_bet = 0
+        payout = 0
+        for hand in hands:
+            player_value = hand.get_value()
+            total_bet += hand.bet
+            if hand.is_surrender:
+                payout += hand.bet / 2
+            elif player_value > 21:
+                continue
+            elif dealer_value > 21 or player_value > dealer_value:
+                payout += hand.bet * 2
+            elif player_value == dealer_value:
+                payout += hand.bet
+        
+        if payout > total_bet:
             outcome = 'win'
-            payout = bet_size * 2
-        elif player_value < dealer_value:
+        elif payout < total_bet:
             outcome = 'loss'
-            payout = 0
         else:
             outcome = 'push'
-            payout = bet_size
         
         return {
             'outcome': outcome,
-            'bet': bet_size,
+            'bet': total_bet,
             'payout': payout,
             'cards_seen': cards_dealt,
-            'player_value': player_value,
-            'dealer_value': dealer_value
+            'player_value': hands[0].get_value(),
+            'dealer_value': dealer_value,
+            'hands': len(hands)
         }
     
+    def _decision_table(self, strategy_type: str) -> DecisionTable:
+        """Compiled strategy (with its count overlay) for a strategy type"""
+        if "Card Counting" in strategy_type:
+            return self.counting_table
+        elif "Optimized" in strategy_type or "ML" in strategy_type:
+            return self.optimized_table
+        return self.decision_table
+    
     def _get_optimal_action(self, player_hand: Hand, dealer_upcard: Card, 
-                           strategy_type: str, running_count: int, cards_seen: int) -> str:
-        """Get optimal action based on strategy type"""
-        player_value = player_hand.get_value()
-        dealer_value = dealer_upcard.get_value()
-        is_soft = player_hand.is_soft()
-        can_double = len(player_hand.cards) == 2
-        can_split = player_hand.can_split()
+                           strategy_type: str, running_count: int, cards_seen: int,
+                           num_hands: int = 1, num_decks: int = 6) -> int:
+        """Get the action code for the hand based on strategy type
+        
+        Doubling, splitting and surrender follow the batch engine's table
+        rules; num_hands is how many hands the round has after splits and
+        num_decks sizes the shoe for the true count.
+        """
+        rules = self.batch_engine
+        two_cards = len(player_hand.cards) == 2
+        can_double = two_cards and (not player_hand.is_split or rules.double_after_split)
+        can_split = player_hand.can_split() and num_hands < rules.max_split_hands and \
+            (not player_hand.is_split or player_hand.cards[0].rank != 'A' or rules.resplit_aces)
+        pair_value = player_hand.cards[0].get_value() if can_split else 0
+        can_surrender = rules.surrender and two_cards and not player_hand.is_split
         
         # Calculate true count for counting strategies
-        decks_remaining = max(1, (52 * 6 - cards_seen) / 52)  # Assuming 6 decks
+        decks_remaining = max(1, (52 * num_decks - cards_seen) / 52)
         true_count = running_count / decks_remaining
         
-        if strategy_type == "Basic Strategy Only":
-            return self._get_basic_strategy_action(
-                player_value, dealer_value, is_soft, can_double, can_split
-            )
-        
-        elif "Card Counting" in strategy_type:
-            action = self._get_basic_strategy_action(
-                player_value, dealer_value, is_soft, can_double, can_split
-            )
-            # Apply common deviations
-            return self._apply_counting_deviations(
-                action, player_value, dealer_value, true_count
-            )
-        
-        elif "Optimized" in strategy_type or "ML" in strategy_type:
-            # Use more aggressive optimization
-            return self._get_optimized_action(
-                player_value, dealer_value, is_soft, can_double, can_split, true_count
-            )
-        
-        else:
-            return self._get_basic_strategy_action(
-                player_value, dealer_value, is_soft, can_double, can_split
-            )
-    
-    def _get_basic_strategy_action(self, player_value: int, dealer_value: int, 
-                                  is_soft: bool, can_double: bool, can_split: bool) -> str:
-        """Get basic strategy action"""
-        if can_split and player_value % 2 == 0:
-            pair_value = player_value // 2
-            if pair_value <= 10:
-                action = self.basic_strategy.get_pair_action(pair_value, dealer_value)
-                if action == 'split':
-                    return 'hit'  # Simplified for simulation
-        
-        if is_soft:
-            return self.basic_strategy.get_soft_action(player_value, dealer_value, can_double)
-        else:
-            return self.basic_strategy.get_hard_action(player_value, dealer_value, can_double)
-    
-    def _apply_counting_deviations(self, base_action: str, player_value: int, 
-                                  dealer_value: int, true_count: float) -> str:
-        """Apply card counting deviations"""
-        # Common deviations
-        if player_value == 16 and dealer_value == 10 and true_count >= 0:
-            return 'stand'
-        elif player_value == 15 and dealer_value == 10 and true_count >= 4:
-            return 'stand'
-        elif player_value == 12 and dealer_value == 2 and true_count >= 3:
-            return 'stand'
-        elif player_value == 12 and dealer_value == 3 and true_count >= 2:
-            return 'stand'
-        elif player_value == 10 and dealer_value == 10 and true_count >= 4:
-            return 'double'
-        elif player_value == 10 and dealer_value == 9 and true_count >= 1:
-            return 'double'
-        
-        return base_action
-    
-    def _get_optimized_action(self, player_value: int, dealer_value: int, 
-                             is_soft: bool, can_double: bool, can_split: bool, 
-                             true_count: float) -> str:
-        """Get optimized ML-based action"""
-        # Start with basic strategy
-        action = self._get_basic_strategy_action(
-            player_value, dealer_value, is_soft, can_double, can_split
+        return self._decision_table(strategy_type).decide_one(
+            player_hand.get_value(), player_hand.is_soft(), dealer_upcard.get_value(),
+            can_double, pair_value, true_count, can_surrender
         )
-        
-        # Apply counting deviations
-        action = self._apply_counting_deviations(action, player_value, dealer_value, true_count)
-        
-        # Additional ML-optimized adjustments
-        if true_count > 2:
-            # More aggressive with positive count
-            if player_value == 11 and dealer_value <= 10:
-                return 'double'
-            elif player_value == 9 and dealer_value in [3, 4, 5, 6]:
-                return 'double'
-        elif true_count < -2:
-            # More conservative with negative count
-            if player_value >= 12 and dealer_value >= 7:
-                return 'hit'
-        
-        return action
     
     def _get_optimal_bet(self, true_count: float) -> int:
         """Get optimal bet size based on true count"""
@@ -347,6 +673,15 @@ class MonteCarloSimulator:
         else:
             return int(base_bet * 4.0)
     
+    def _get_optimal_bets(self, true_counts: np.ndarray) -> np.ndarray:
+        """Vectorized _get_optimal_bet for an array of true counts"""
+        base_bet = 100
+        return np.select(
+            [true_counts <= -1, true_counts < 1, true_counts < 2, true_counts < 3, true_counts < 4],
+            [base_bet * 0.5, base_bet, base_bet * 1.5, base_bet * 2.0, base_bet * 3.0],
+            default=base_bet * 4.0
+        )
+    
     def _get_card_count_value(self, card: Card) -> int:
         """Get Hi-Lo count value for card"""
         value = card.get_value()
@@ -358,7 +693,7 @@ class MonteCarloSimulator:
             return -1
     
     def _generate_insights(self, win_rate: float, house_edge: float, 
-                          strategy_type: str, cumulative_winnings: List[float]) -> List[str]:
+                          strategy_type: str, stats: StreamingStats) -> List[str]:
         """Generate insights from simulation results"""
         insights = []
         
@@ -381,9 +716,9 @@ class MonteCarloSimulator:
             insights.append(f"High house edge of {house_edge:.3%} - strategy needs improvement")
         
         # Volatility insights
-        if cumulative_winnings:
-            max_win = max(cumulative_winnings)
-            max_loss = min(cumulative_winnings)
+        if stats.count:
+            max_win = stats.max_bankroll
+            max_loss = stats.min_bankroll
             volatility = max_win - max_loss
             
             if volatility > 5000:
@@ -404,8 +739,17 @@ class MonteCarloSimulator:
     
     def run_parallel_simulation(self, num_simulations: int = 10, hands_per_sim: int = 10000, 
                                num_decks: int = 6, penetration: float = 0.75, 
-                               strategy_type: str = "Basic Strategy Only") -> Dict:
-        """Run multiple parallel simulations for statistical significance"""
+                               strategy_type: str = "Basic Strategy Only",
+                               engine: str = "scalar", seed: int = None,
+                               backend: str = "process", max_workers: int = None) -> Dict:
+        """Run multiple parallel simulations for statistical significance
+        
+        Every simulation gets its own random stream spawned from one master
+        seed, so a seeded run gives the same results for any worker count.
+        """
+        
+        # Independent child streams for every simulation
+        child_seeds = _seed_sequence(seed).spawn(num_simulations)
         
         # Prepare simulation parameters
         sim_params = []
@@ -415,27 +759,33 @@ class MonteCarloSimulator:
                 'num_decks': num_decks,
                 'penetration': penetration,
                 'strategy_type': strategy_type,
-                'seed': i  # Different seed for each simulation
+                'engine': engine,
+                'seed': child_seeds[i]
             })
         
-        # Run simulations in parallel
-        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
-            futures = [executor.submit(self._execute_single_simulation, params) 
-                      for params in sim_params]
-            results = [future.result() for future in concurrent.futures.as_completed(futures)]
+        max_workers = min(max_workers or _available_cores(), max(1, num_simulations))
+        
+        # Run simulations in parallel; map keeps results in submission order
+        if backend == "process":
+            with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(_run_simulation_worker, sim_params))
+        else:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(self._execute_single_simulation, sim_params))
         
         # Aggregate results
         return self._aggregate_parallel_results(results)
     
     def _execute_single_simulation(self, params: Dict) -> Dict:
         """Execute a single simulation with given parameters"""
-        # Set random seed for reproducibility
-        if 'seed' in params:
-            random.seed(params['seed'])
-            np.random.seed(params['seed'])
-        
+        # The seed travels with the params, so no global RNG state is touched
         return self._execute_simulation(params)
     
+    def _make_random(self, seed) -> random.Random:
+        """Scalar-engine RNG derived from a seed or SeedSequence"""
+        state = _seed_sequence(seed).generate_state(4)
+        return random.Random(int.from_bytes(state.tobytes(), 'little'))
+    
     def _aggregate_parallel_results(self, results: List[Dict]) -> Dict:
         """Aggregate results from parallel simulations"""
         if not results:
@@ -466,3 +816,28 @@ class MonteCarloSimulator:
             'individual_results': results,
             'num_simulations': len(results)
         }
+
+
+def _seed_sequence(seed) -> np.random.SeedSequence:
+    """Normalize an int, None or SeedSequence seed into a SeedSequence"""
+    if isinstance(seed, np.random.SeedSequence):
+        return seed
+    return np.random.SeedSequence(seed)
+
+
+def _available_cores() -> int:
+    """Number of CPU cores this process may run on"""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+_worker_simulator = None
+
+
+def _run_simulation_worker(params: Dict) -> Dict:
+    """Process-pool entry point; each worker process reuses one simulator"""
+    global _worker_simulator
+    if _worker_simulator is None:
+        _worker_simulator = MonteCarloSimulator()
+    return _worker_simulator._execute_single_simulation(params)
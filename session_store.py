@@ -0,0 +1,433 @@
+"""
+Bounded store for live game sessions, optionally backed by a shared store.
+
+Sessions are kept in an LRU map and dropped when they sit idle longer than
+idle_ttl, when there are more than max_sessions of them, or when their
+estimated total size passes max_bytes.  Least recently used sessions go
+first.  Callers put a session back after changing it, which refreshes its
+size estimate and its place in the LRU order.
+
+With a backend (e.g. SQLiteSessionBackend) the map becomes a read-through
+cache in front of a store every worker process shares.  Each saved session
+gets a new version; a cached copy is used only while its version is still
+the stored one, so a worker never serves a session another worker has
+since changed.  Evicting a cached copy leaves the stored session alone; the
+backend itself expires sessions that have not been saved for idle_ttl.
+
+Changes go through modify(), which holds a per-session lock in this process
+and saves optimistically: the save only succeeds if the stored version is
+still the one the change started from, and otherwise the change is rerun on
+the newer session.  Concurrent requests for one session, in this process or
+another worker, therefore apply one after the other instead of interleaving.
+"""
+
+import os
+import pickle
+import sqlite3
+import sys
+import threading
+import time
+import types
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# Never counted towards a session's size: shared by every session
+_SHARED_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType,
+                 types.MethodType)
+
+
+def approximate_size(obj: Any) -> int:
+    """Deep size of obj in bytes, counting each object reachable from it once"""
+    seen = set()
+    stack = [obj]
+    size = 0
+    while stack:
+        item = stack.pop()
+        if id(item) in seen or isinstance(item, _SHARED_TYPES):
+            continue
+        seen.add(id(item))
+        size += sys.getsizeof(item)
+
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+        elif not isinstance(item, (str, bytes, bytearray, int, float, bool)):
+            if hasattr(item, '__dict__'):
+                stack.append(item.__dict__)
+            for slot in getattr(type(item), '__slots__', ()):
+                if hasattr(item, slot):
+                    stack.append(getattr(item, slot))
+    return size
+
+
+class SessionConflict(Exception):
+    """Raised when a session is not at the version a change expected"""
+
+
+def pickle_dumps(session: Any) -> bytes:
+    """Default session serialization: compressed pickle"""
+    return zlib.compress(pickle.dumps(session, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def pickle_loads(data: bytes) -> Any:
+    return pickle.loads(zlib.decompress(data))
+
+
+class SessionBackend:
+    """Shared session storage: serialized sessions keyed by id, each with a version"""
+
+    def version(self, session_id: str) -> Optional[int]:
+        """Current version of a stored session, or None if there is none"""
+        raise NotImplementedError
+
+    def load(self, session_id: str) -> Optional[Tuple[int, bytes]]:
+        """(version, data) of a stored session, or None"""
+        raise NotImplementedError
+
+    def save(self, session_id: str, data: bytes, expected_version: Optional[int] = None) -> int:
+        """Store data as the session's next version and return that version.
+
+        With expected_version, raises SessionConflict unless the stored
+        version is still that one (0 for a session that must not exist yet).
+        """
+        raise NotImplementedError
+
+    def delete(self, session_id: str):
+        raise NotImplementedError
+
+    def purge(self, idle_ttl: float) -> int:
+        """Drop sessions not saved for idle_ttl seconds; returns how many"""
+        raise NotImplementedError
+
+
+# Connections a forked child inherited; SQLite must not close them in the child
+_inherited_connections = []
+
+
+class SQLiteSessionBackend(SessionBackend):
+    """Sessions in one SQLite file shared by every process on the host (WAL mode)"""
+
+    def __init__(self, path: str, timeout: float = 10.0):
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        with self._connection() as connection:
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS sessions ('
+                'session_id TEXT PRIMARY KEY, version INTEGER NOT NULL, '
+                'updated_at REAL NOT NULL, data BLOB NOT NULL)')
+            connection.execute('CREATE INDEX IF NOT EXISTS sessions_updated_at ON sessions (updated_at)')
+
+    def _connection(self) -> sqlite3.Connection:
+        """This thread's connection (connections are not shared across threads or forks)"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            if connection is not None:
+                # Closing a connection inherited across fork() would drop the
+                # parent's locks and can reset the WAL under it; keep it open
+                _inherited_connections.append(connection)
+            connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def close(self):
+        """Close this thread's connection, unless it was opened before a fork"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            return
+        if self._local.pid == os.getpid():
+            connection.close()
+        else:
+            _inherited_connections.append(connection)
+        self._local.connection = None
+
+    def __del__(self):
+        # Connections sit in reference cycles: without this a dropped backend's
+        # connection stays open until some later garbage collection closes it,
+        # possibly while forked workers are writing to the same file
+        self.close()
+
+    def version(self, session_id: str) -> Optional[int]:
+        row = self._connection().execute(
+            'SELECT version FROM sessions WHERE session_id = ?', (session_id,)).fetchone()
+        return row[0] if row else None
+
+    def load(self, session_id: str) -> Optional[Tuple[int, bytes]]:
+        row = self._connection().execute(
+            'SELECT version, data FROM sessions WHERE session_id = ?', (session_id,)).fetchone()
+        return (row[0], bytes(row[1])) if row else None
+
+    def save(self, session_id: str, data: bytes, expected_version: Optional[int] = None) -> int:
+        connection = self._connection()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            row = connection.execute(
+                'SELECT version FROM sessions WHERE session_id = ?', (session_id,)).fetchone()
+            current = row[0] if row else 0
+            if expected_version is not None and current != expected_version:
+                raise SessionConflict(f'Session {session_id} is at version {current}, not {expected_version}')
+            version = current + 1
+            connection.execute(
+                'INSERT OR REPLACE INTO sessions (session_id, version, updated_at, data) '
+                'VALUES (?, ?, ?, ?)', (session_id, version, time.time(), data))
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        connection.execute('COMMIT')
+        return version
+
+    def delete(self, session_id: str):
+        self._connection().execute('DELETE FROM sessions WHERE session_id = ?', (session_id,))
+
+    def purge(self, idle_ttl: float) -> int:
+        cursor = self._connection().execute(
+            'DELETE FROM sessions WHERE updated_at < ?', (time.time() - idle_ttl,))
+        return cursor.rowcount
+
+
+class SessionStore:
+    def __init__(self, max_sessions: int = 10000, idle_ttl: Optional[float] = 3600,
+                 max_bytes: Optional[int] = 256 * 1024 * 1024,
+                 size_of: Callable[[Any], int] = approximate_size,
+                 backend: Optional[SessionBackend] = None,
+                 dumps: Callable[[Any], bytes] = pickle_dumps,
+                 loads: Callable[[bytes], Any] = pickle_loads,
+                 purge_interval: float = 60):
+        self.max_sessions = max_sessions  # Limits apply to the in-process copies
+        self.idle_ttl = idle_ttl  # Seconds since last use; None keeps idle sessions
+        self.max_bytes = max_bytes  # None disables the memory cap
+        self.size_of = size_of
+        self.backend = backend
+        self.dumps = dumps
+        self.loads = loads
+        self.purge_interval = purge_interval  # Seconds between expiry sweeps of the backend
+        self._next_purge = 0.0
+        # id -> [last_used, size, session, version]
+        self.entries: 'OrderedDict[str, list]' = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = {'expired': 0, 'capacity': 0, 'memory': 0}
+        self.conflicts = 0  # Changes rerun because another writer saved first
+        self._lock = threading.Lock()
+        self._session_locks: Dict[str, list] = {}  # id -> [lock, holders and waiters]
+
+    def get(self, session_id: str) -> Optional[Any]:
+        """The session, marked as just used, or None if unknown or expired"""
+        loaded = self.get_versioned(session_id)
+        return loaded[0] if loaded is not None else None
+
+    def get_versioned(self, session_id: str) -> Optional[Tuple[Any, int]]:
+        """(session, version), or None if unknown or expired"""
+        if self.backend is not None:
+            return self._get_shared(session_id)
+
+        with self._lock:
+            entry = self.entries.get(session_id)
+            if entry is not None and self._expired(entry[0]):
+                self._remove(session_id, 'expired')
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+
+            entry[0] = time.time()
+            self.entries.move_to_end(session_id)
+            self.hits += 1
+            return entry[2], entry[3]
+
+    def _get_shared(self, session_id: str) -> Optional[Tuple[Any, int]]:
+        """Cached copy while its version is current, else a fresh load from the backend"""
+        version = self.backend.version(session_id)
+        with self._lock:
+            entry = self.entries.get(session_id)
+            if version is None:
+                if entry is not None:
+                    self._remove(session_id, 'expired')
+                self.misses += 1
+                return None
+            if entry is not None and entry[3] == version:
+                entry[0] = time.time()
+                self.entries.move_to_end(session_id)
+                self.hits += 1
+                return entry[2], version
+            self.misses += 1
+
+        stored = self.backend.load(session_id)
+        if stored is None:
+            return None
+        version, data = stored
+        try:
+            session = self.loads(data)
+        except Exception:
+            return None  # Written by an incompatible version of the app
+        self._cache(session_id, session, version)
+        return session, version
+
+    def put(self, session_id: str, session: Any, expected_version: Optional[int] = None) -> int:
+        """Store or refresh a session, then evict whatever is over the limits.
+
+        Returns the new version; with expected_version, raises SessionConflict
+        if the session has been saved since that version.
+        """
+        if self.backend is not None:
+            version = self.backend.save(session_id, self.dumps(session), expected_version)
+            self._purge_backend()
+        else:
+            with self._lock:
+                entry = self.entries.get(session_id)
+                current = entry[3] if entry is not None else expected_version or 0
+                if expected_version is not None and current != expected_version:
+                    raise SessionConflict(f'Session {session_id} is at version {current}, not {expected_version}')
+                version = current + 1
+        self._cache(session_id, session, version)
+        return version
+
+    def modify(self, session_id: str, change: Callable[[Any, int], bool],
+               view: Optional[Callable[[Any, int], Any]] = None, retries: int = 3) -> Optional[Any]:
+        """Apply change(session, version) and save the session if it returns True.
+
+        Changes to one session run one at a time in this process.  If another
+        worker saves the session first, the change is rerun on its version, up
+        to retries times before SessionConflict is raised; change may itself
+        raise SessionConflict to refuse a stale request.  Returns
+        view(session, version) taken under the lock (the session by default),
+        or None if the session does not exist.
+        """
+        with self._session_lock(session_id):
+            for attempt in range(retries + 1):
+                loaded = self.get_versioned(session_id)
+                if loaded is None:
+                    return None
+                session, version = loaded
+
+                try:
+                    changed = change(session, version)
+                except BaseException:
+                    self._drop_cached(session_id)
+                    raise
+
+                if changed:
+                    try:
+                        version = self.put(session_id, session, expected_version=version)
+                    except SessionConflict:
+                        self._drop_cached(session_id)
+                        with self._lock:
+                            self.conflicts += 1
+                        if attempt == retries:
+                            raise
+                        continue
+                return view(session, version) if view is not None else session
+
+    @contextmanager
+    def _session_lock(self, session_id: str):
+        """Hold this process's lock for one session (locks are dropped when unused)"""
+        with self._lock:
+            holder = self._session_locks.setdefault(session_id, [threading.Lock(), 0])
+            holder[1] += 1
+        try:
+            with holder[0]:
+                yield
+        finally:
+            with self._lock:
+                holder[1] -= 1
+                if holder[1] == 0:
+                    del self._session_locks[session_id]
+
+    def _drop_cached(self, session_id: str):
+        """Forget a cached copy that may have been changed without being saved"""
+        if self.backend is None:
+            return  # The cached copy is the only one
+        with self._lock:
+            if session_id in self.entries:
+                self._remove(session_id)
+
+    def _cache(self, session_id: str, session: Any, version: Optional[int]):
+        size = self.size_of(session)
+        with self._lock:
+            previous = self.entries.pop(session_id, None)
+            if previous is not None:
+                self.total_bytes -= previous[1]
+            self.entries[session_id] = [time.time(), size, session, version]
+            self.total_bytes += size
+            self._evict()
+
+    def _purge_backend(self):
+        """Expire idle sessions in the backend, at most once per purge_interval"""
+        now = time.time()
+        if self.idle_ttl is None or now < self._next_purge:
+            return
+        self._next_purge = now + self.purge_interval
+        expired = self.backend.purge(self.idle_ttl)
+        with self._lock:
+            self.evictions['expired'] += expired
+
+    def delete(self, session_id: str) -> bool:
+        if self.backend is not None:
+            self.backend.delete(session_id)
+        with self._lock:
+            if session_id not in self.entries:
+                return False
+            self._remove(session_id)
+            return True
+
+    def __contains__(self, session_id: str) -> bool:
+        if self.backend is not None:
+            return self.backend.version(session_id) is not None
+        with self._lock:
+            entry = self.entries.get(session_id)
+            return entry is not None and not self._expired(entry[0])
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'sessions': len(self.entries),
+                'max_sessions': self.max_sessions,
+                'bytes': self.total_bytes,
+                'max_bytes': self.max_bytes,
+                'idle_ttl': self.idle_ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else None,
+                'evictions': dict(self.evictions),
+                'conflicts': self.conflicts,
+                'backend': type(self.backend).__name__ if self.backend is not None else None
+            }
+
+    def _expired(self, last_used: float) -> bool:
+        return self.idle_ttl is not None and time.time() - last_used > self.idle_ttl
+
+    def _remove(self, session_id: str, reason: Optional[str] = None):
+        """Drop an entry; caller holds the lock"""
+        size = self.entries.pop(session_id)[1]
+        self.total_bytes -= size
+        if reason is not None:
+            self.evictions[reason] += 1
+
+    def _evict(self):
+        """Drop idle sessions, then least recently used ones over the limits; caller holds the lock"""
+        # Entries are in last-use order, so idle ones are at the front
+        while self.entries:
+            session_id, entry = next(iter(self.entries.items()))
+            last_used = entry[0]
+            if not self._expired(last_used):
+                break
+            self._remove(session_id, 'expired')
+
+        while len(self.entries) > self.max_sessions:
+            self._remove(next(iter(self.entries)), 'capacity')
+
+        # The most recent session stays even if it alone is over the cap
+        while self.max_bytes is not None and self.total_bytes > self.max_bytes and len(self.entries) > 1:
+            self._remove(next(iter(self.entries)), 'memory')
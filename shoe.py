@@ -0,0 +1,107 @@
+"""
+Compact integer-encoded shoe shared by the game engine and the Flask app.
+
+Cards are stored as ids 0-51 (suit * 13 + rank) in one preallocated
+bytearray.  Dealing advances a cursor and reshuffling happens in place, so
+no card objects are allocated; callers build Card views only when needed.
+Trackers attached to a shoe (e.g. card_counting.CountTracker) are told about
+every dealt card and every shuffle, so they can keep state incrementally.
+"""
+
+import random
+from typing import Optional
+
+RANKS = ('2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A')
+NUM_SUITS = 4
+
+# Blackjack value by card id (Ace = 11, like Card.get_value)
+CARD_VALUES = tuple(min(10, rank + 2) if rank < 12 else 11
+                    for _ in range(NUM_SUITS) for rank in range(13))
+
+
+def card_suit(card_id: int) -> int:
+    """Suit index (0-3) of a card id"""
+    return card_id // 13
+
+
+def card_rank(card_id: int) -> str:
+    """Rank string ('2'-'10', 'J', 'Q', 'K', 'A') of a card id"""
+    return RANKS[card_id % 13]
+
+
+class Shoe:
+    def __init__(self, num_decks: int = 6, rng: Optional[random.Random] = None,
+                 min_cards: int = 20):
+        self.num_decks = num_decks
+        self.rng = rng or random
+        self.min_cards = min_cards  # Reshuffle when fewer cards remain
+        self.cards = bytearray(range(52)) * num_decks
+        self.cursor = 0
+        self.trackers = []
+        self.shuffle()
+    
+    @classmethod
+    def restore(cls, cards: bytes, cursor: int, rng: Optional[random.Random] = None,
+                min_cards: int = 20) -> 'Shoe':
+        """Shoe in a saved card order and deal position, without shuffling"""
+        shoe = cls.__new__(cls)
+        shoe.num_decks = len(cards) // 52
+        shoe.rng = rng or random
+        shoe.min_cards = min_cards
+        shoe.cards = bytearray(cards)
+        shoe.cursor = cursor
+        shoe.trackers = []
+        return shoe
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        if state['rng'] is random:
+            state['rng'] = None  # The module-level generator cannot be pickled
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.rng = self.rng or random
+    
+    def attach(self, tracker):
+        """Keep tracker up to date: tracker.card_dealt(card_id) per card, tracker.reset() per shuffle"""
+        tracker.reset()
+        for card_id in self.cards[:self.cursor]:
+            tracker.card_dealt(card_id)
+        self.trackers.append(tracker)
+        return tracker
+
+    def shuffle(self):
+        """Shuffle all cards back into the shoe, in place"""
+        self.rng.shuffle(self.cards)
+        self.cursor = 0
+        for tracker in self.trackers:
+            tracker.reset()
+
+    def deal(self) -> int:
+        """Deal one card id, reshuffling first if the shoe is running low"""
+        if len(self.cards) - self.cursor < self.min_cards:
+            self.shuffle()
+
+        card_id = self.cards[self.cursor]
+        self.cursor += 1
+        if self.trackers:
+            for tracker in self.trackers:
+                tracker.card_dealt(card_id)
+        return card_id
+
+    @property
+    def remaining(self) -> int:
+        return len(self.cards) - self.cursor
+
+    def dealt(self) -> bytes:
+        """Ids of the cards dealt since the last shuffle, in deal order"""
+        return bytes(self.cards[:self.cursor])
+
+    def undealt(self) -> bytes:
+        """Ids of the cards still in the shoe, next card first"""
+        return bytes(self.cards[self.cursor:])
+
+    def penetration(self) -> float:
+        """Fraction of the shoe dealt since the last shuffle"""
+        return self.cursor / len(self.cards)
@@ -5,70 +5,61 @@ Removes PostgreSQL dependencies while maintaining all core functionality
 
 import os
 import json
+import math
 import uuid
 import random
-from flask import Flask, render_template, request, jsonify
+import struct
+import tempfile
+import time
+from flask import Flask, Response, render_template, request, jsonify, stream_with_context
 from flask_cors import CORS
+from shoe import Shoe
+from cards import CardFace
+from card_counting import CardCounter, CountTracker
+from ev_solver import RuleSet, get_strategy_tables
+from simulation_jobs import FINISHED_STATES, JobQueueFull, SimulationJobManager
+from simulation_stats import StreamingStats
+from bankroll_risk import BetRamp, RiskSimulator, diffusion_risk_of_ruin
+from monte_carlo import MonteCarloSimulator
+from session_store import SessionConflict, SessionStore, SQLiteSessionBackend
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'blackjack-training-simple'
 CORS(app)
 
 # Simple implementations without external dependencies
-class SimpleCard:
-    def __init__(self, suit, rank):
-        self.suit = suit
-        self.rank = rank
-    
-    def get_value(self):
-        if self.rank in ['J', 'Q', 'K']:
-            return 10
-        elif self.rank == 'A':
-            return 11
-        else:
-            return int(self.rank)
-    
-    def get_count_value(self, system='Hi-Lo'):
-        if system == 'Hi-Lo':
-            if self.rank in ['2', '3', '4', '5', '6']:
-                return 1
-            elif self.rank in ['10', 'J', 'Q', 'K', 'A']:
-                return -1
-        return 0
-    
-    def to_dict(self):
-        return {'suit': self.suit, 'rank': self.rank}
+class SimpleCard(CardFace):
+    __slots__ = ()
+    SUITS = ('hearts', 'diamonds', 'clubs', 'spades')
 
 class SimpleDeck:
-    def __init__(self, num_decks=6):
+    SUITS = list(SimpleCard.SUITS)
+    
+    def __init__(self, num_decks=6, shoe=None):
         self.num_decks = num_decks
-        self.cards = []
-        self.dealt_cards = 0
-        self.reset()
+        self.shoe = shoe or Shoe(num_decks)
+        # Count state kept up to date as cards leave the shoe (reset on shuffle)
+        self.count_tracker = self.shoe.attach(CountTracker(num_decks))
     
     def reset(self):
-        suits = ['hearts', 'diamonds', 'clubs', 'spades']
-        ranks = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
-        
-        self.cards = []
-        for _ in range(self.num_decks):
-            for suit in suits:
-                for rank in ranks:
-                    self.cards.append(SimpleCard(suit, rank))
-        
-        random.shuffle(self.cards)
-        self.dealt_cards = 0
+        self.shoe.shuffle()
+    
+    @property
+    def cards(self):
+        return [self.card_view(card_id) for card_id in self.shoe.cards]
+    
+    @property
+    def dealt_cards(self):
+        return self.shoe.cursor
+    
+    def card_view(self, card_id):
+        return SimpleCard.from_id(card_id)
     
     def deal_card(self):
-        if len(self.cards) - self.dealt_cards < 20:  # Reshuffle when low
-            self.reset()
-        
-        card = self.cards[self.dealt_cards]
-        self.dealt_cards += 1
-        return card
+        return self.card_view(self.shoe.deal())
     
     def get_penetration(self):
-        return round((self.dealt_cards / len(self.cards)) * 100, 1)
+        return round(self.shoe.penetration() * 100, 1)
 
 class SimpleHand:
     def __init__(self):
@@ -76,43 +67,43 @@ class SimpleHand:
         self.bet = 0
         self.is_doubled = False
         self.is_split = False
+        # Running totals kept by add_card/pop_card (aces count 1 in the hard total)
+        self._hard_total = 0
+        self._aces = 0
+        self._value = 0
+        self._soft = False
     
     def add_card(self, card):
         self.cards.append(card)
+        self._count(card, 1)
     
-    def get_value(self):
-        total = 0
-        aces = 0
-        
-        for card in self.cards:
-            value = card.get_value()
-            if value == 11:
-                aces += 1
-            total += value
-        
-        while total > 21 and aces > 0:
-            total -= 10
-            aces -= 1
+    def pop_card(self):
+        card = self.cards.pop()
+        self._count(card, -1)
+        return card
+    
+    def _count(self, card, sign):
+        if card.value == 11:
+            self._aces += sign
+            self._hard_total += sign
+        else:
+            self._hard_total += sign * card.value
         
-        return total
+        # At most one ace can count 11 without busting; the hand is soft while one does
+        self._soft = self._aces > 0 and self._hard_total + 10 <= 21
+        self._value = self._hard_total + 10 if self._soft else self._hard_total
+    
+    def get_value(self):
+        return self._value
     
     def is_soft(self):
-        total = 0
-        aces = 0
-        
-        for card in self.cards:
-            value = card.get_value()
-            if value == 11:
-                aces += 1
-            total += value
-        
-        return total <= 21 and aces > 0 and any(card.rank == 'A' for card in self.cards)
+        return self._soft
     
     def is_blackjack(self):
-        return len(self.cards) == 2 and self.get_value() == 21
+        return self._value == 21 and len(self.cards) == 2
     
     def is_bust(self):
-        return self.get_value() > 21
+        return self._value > 21
     
     def can_split(self):
         return len(self.cards) == 2 and self.cards[0].get_value() == self.cards[1].get_value()
@@ -133,6 +124,34 @@ class SimpleHand:
             'is_doubled': self.is_doubled
         }
 
+# Session snapshot layout (little endian): header, totals, the last request id
+# (length byte + utf-8, from version 2), the shoe's card ids, then each player
+# hand and the dealer hand as (header, card ids)
+SNAPSHOT_MAGIC = b'BJS'
+SNAPSHOT_VERSION = 2
+SNAPSHOT_READABLE_VERSIONS = (1, 2)
+GAME_PHASES = ('betting', 'playing', 'complete')
+PLAYER_ACTIONS = ('hit', 'stand', 'double', 'split')
+STAT_COUNTERS = ('hands_won', 'hands_lost', 'hands_pushed', 'blackjacks', 'doubles_won', 'splits_won')
+# magic, version, session id, shoe size, cursor, phase, current hand, player hand count
+SNAPSHOT_HEADER = struct.Struct('<3sB16sHHBBB')
+# bankroll, profit, total wagered, running count, hands played, then STAT_COUNTERS
+SNAPSHOT_TOTALS = struct.Struct('<dddiI6I')
+# bet, flags (1 doubled, 2 split), card count
+SNAPSHOT_HAND = struct.Struct('<dBB')
+
+def _pack_request_id(request_id):
+    encoded = request_id.encode('utf-8') if request_id else b''
+    return bytes((len(encoded),)) + encoded
+
+def _snapshot_number(value):
+    """Whole amounts come back as ints, as they were before saving"""
+    return int(value) if value.is_integer() else value
+
+# Sessions count with Hi-Lo; count details come from each shoe's CountTracker
+COUNT_SYSTEM = 'Hi-Lo'
+count_info_counter = CardCounter()
+
 class SimpleGameSession:
     def __init__(self, starting_bankroll=1000):
         self.session_id = str(uuid.uuid4())
@@ -142,9 +161,9 @@ class SimpleGameSession:
         self.current_hand = 0
         self.game_phase = 'betting'  # betting, playing, complete
         self.current_bankroll = starting_bankroll
-        self.running_count = 0
         self.hands_played = 0
         self.session_profit = 0
+        self.last_request_id = None  # Id of the last request applied, to spot retries
         self.stats = {
             'hands_won': 0,
             'hands_lost': 0,
@@ -156,14 +175,16 @@ class SimpleGameSession:
             'decisions': []
         }
     
-    def update_count(self, card):
-        count_value = card.get_count_value('Hi-Lo')
-        self.running_count += count_value
-        return count_value
+    @property
+    def running_count(self):
+        return self.deck.count_tracker.running_count(COUNT_SYSTEM)
+    
+    def get_count_info(self):
+        """Count details from the shoe's tracker (no rescan of the dealt cards)"""
+        return count_info_counter.get_count_info(tracker=self.deck.count_tracker)
     
     def get_true_count(self):
-        decks_remaining = max(1, 6 - (self.deck.dealt_cards / 52))
-        return round(self.running_count / decks_remaining, 1)
+        return round(self.get_count_info()['true_count'], 1)
     
     def get_betting_recommendation(self):
         true_count = self.get_true_count()
@@ -175,7 +196,7 @@ class SimpleGameSession:
             return 10
     
     def new_hand(self, bet_amount):
-        if self.current_bankroll < bet_amount:
+        if self.game_phase == 'playing' or self.current_bankroll < bet_amount:
             return False
         
         # Reset for new hand
@@ -193,11 +214,9 @@ class SimpleGameSession:
         for _ in range(2):
             card = self.deck.deal_card()
             self.player_hands[0].add_card(card)
-            self.update_count(card)
             
             card = self.deck.deal_card()
             self.dealer_hand.add_card(card)
-            self.update_count(card)
         
         # Check for blackjack
         if self.player_hands[0].is_blackjack():
@@ -217,7 +236,6 @@ class SimpleGameSession:
         if action == 'hit':
             card = self.deck.deal_card()
             current_hand.add_card(card)
-            self.update_count(card)
             
             if current_hand.is_bust():
                 self._next_hand_or_dealer()
@@ -234,7 +252,6 @@ class SimpleGameSession:
                 
                 card = self.deck.deal_card()
                 current_hand.add_card(card)
-                self.update_count(card)
                 
                 self._next_hand_or_dealer()
         
@@ -243,7 +260,7 @@ class SimpleGameSession:
                 # Create new hand
                 new_hand = SimpleHand()
                 new_hand.bet = current_hand.bet
-                new_hand.add_card(current_hand.cards.pop())
+                new_hand.add_card(current_hand.pop_card())
                 
                 self.current_bankroll -= current_hand.bet
                 self.stats['total_wagered'] += current_hand.bet
@@ -251,11 +268,9 @@ class SimpleGameSession:
                 # Add cards to both hands
                 card1 = self.deck.deal_card()
                 current_hand.add_card(card1)
-                self.update_count(card1)
                 
                 card2 = self.deck.deal_card()
                 new_hand.add_card(card2)
-                self.update_count(card2)
                 
                 self.player_hands.append(new_hand)
         
@@ -270,7 +285,6 @@ class SimpleGameSession:
         while self.dealer_hand.get_value() < 17:
             card = self.deck.deal_card()
             self.dealer_hand.add_card(card)
-            self.update_count(card)
         
         self._resolve_hands()
         self.game_phase = 'complete'
@@ -339,6 +353,65 @@ class SimpleGameSession:
         else:
             return "hit"
     
+    def table_strategy_action(self, tables):
+        """Action the EV solver's basic strategy tables play for the current hand"""
+        hand = self.player_hands[self.current_hand]
+        upcard = str(self.dealer_hand.cards[0].get_value())
+        affordable = self.current_bankroll >= hand.bet
+        
+        if (hand.can_split() and affordable and len(self.player_hands) < 4
+                and tables['pairs'][str(hand.cards[0].get_value())][upcard] == 'split'):
+            return 'split'
+        
+        hand_class = 'soft' if hand.is_soft() else 'hard'
+        total = str(hand.get_value())
+        if hand.can_double() and affordable:
+            return tables[hand_class][total][upcard]
+        return tables['no_double'][hand_class][total][upcard]
+    
+    def apply_actions(self, actions):
+        """Apply actions in order until one has no effect; returns how many were applied"""
+        for applied, action in enumerate(actions):
+            before = self._play_position()
+            if action not in PLAYER_ACTIONS or not self.player_action(action) \
+                    or self._play_position() == before:
+                return applied
+        return len(actions)
+    
+    def play_out(self, tables):
+        """Finish the hand in play by basic strategy; returns the actions taken"""
+        actions = []
+        while self.game_phase == 'playing':
+            action = self.table_strategy_action(tables)
+            before = self._play_position()
+            self.player_action(action)
+            if self._play_position() == before:
+                action = 'stand'  # Not expected, but the loop must always make progress
+                self.player_action(action)
+            actions.append(action)
+        return actions
+    
+    def play_drill(self, num_hands, bet_amount, tables):
+        """Deal and play up to num_hands rounds by basic strategy; stops when the bankroll runs out"""
+        rounds = []
+        for _ in range(num_hands):
+            bankroll = self.current_bankroll
+            if not self.new_hand(bet_amount):
+                break
+            actions = self.play_out(tables)
+            rounds.append({
+                'player': [hand.get_value() for hand in self.player_hands],
+                'dealer': self.dealer_hand.get_value(),
+                'actions': actions,
+                'net': self.current_bankroll - bankroll
+            })
+        return rounds
+    
+    def _play_position(self):
+        """Changes with every action that takes effect"""
+        return (self.game_phase, self.current_hand, len(self.player_hands),
+                sum(len(hand.cards) for hand in self.player_hands))
+    
     def get_ai_recommendation(self):
         if self.game_phase != 'playing' or self.current_hand >= len(self.player_hands):
             return None
@@ -350,6 +423,81 @@ class SimpleGameSession:
             "reasoning": f"Basic strategy recommends {action}"
         }
     
+    def to_snapshot(self):
+        """Versioned binary snapshot of the game state (stats['decisions'] is not kept)"""
+        shoe = self.deck.shoe
+        parts = [
+            SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, uuid.UUID(self.session_id).bytes,
+                                 len(shoe.cards), shoe.cursor, GAME_PHASES.index(self.game_phase),
+                                 self.current_hand, len(self.player_hands)),
+            SNAPSHOT_TOTALS.pack(self.current_bankroll, self.session_profit, self.stats['total_wagered'],
+                                 self.running_count, self.hands_played,
+                                 *(self.stats[name] for name in STAT_COUNTERS)),
+            _pack_request_id(self.last_request_id),
+            shoe.cards
+        ]
+        for hand in self.player_hands + [self.dealer_hand]:
+            flags = hand.is_doubled | hand.is_split << 1
+            parts.append(SNAPSHOT_HAND.pack(hand.bet, flags, len(hand.cards)))
+            parts.append(bytes(card.card_id for card in hand.cards))
+        return b''.join(parts)
+    
+    @classmethod
+    def from_snapshot(cls, data):
+        """Session saved by to_snapshot; raises ValueError for other data"""
+        try:
+            (magic, version, session_id, shoe_size, cursor, phase,
+             current_hand, num_hands) = SNAPSHOT_HEADER.unpack_from(data)
+            if magic != SNAPSHOT_MAGIC or version not in SNAPSHOT_READABLE_VERSIONS:
+                raise ValueError('Not a session snapshot (or an unsupported version)')
+            offset = SNAPSHOT_HEADER.size
+            totals = SNAPSHOT_TOTALS.unpack_from(data, offset)
+            offset += SNAPSHOT_TOTALS.size
+            last_request_id = None
+            if version >= 2:
+                length = data[offset]
+                if length:
+                    last_request_id = bytes(data[offset + 1:offset + 1 + length]).decode('utf-8')
+                offset += 1 + length
+            shoe = Shoe.restore(data[offset:offset + shoe_size], cursor)
+            offset += shoe_size
+            
+            hands = []
+            for _ in range(num_hands + 1):
+                bet, flags, num_cards = SNAPSHOT_HAND.unpack_from(data, offset)
+                offset += SNAPSHOT_HAND.size
+                hand = SimpleHand()
+                hand.bet = _snapshot_number(bet)
+                hand.is_doubled = bool(flags & 1)
+                hand.is_split = bool(flags & 2)
+                for card_id in data[offset:offset + num_cards]:
+                    hand.add_card(SimpleCard.from_id(card_id))
+                offset += num_cards
+                hands.append(hand)
+            if offset != len(data) or len(shoe.cards) != shoe_size:
+                raise ValueError('Session snapshot has the wrong length')
+            game_phase = GAME_PHASES[phase]
+        except (struct.error, IndexError, UnicodeDecodeError) as e:
+            raise ValueError(f'Corrupt session snapshot: {e}') from None
+        
+        session = cls.__new__(cls)
+        session.session_id = str(uuid.UUID(bytes=session_id))
+        session.deck = SimpleDeck(shoe.num_decks, shoe=shoe)
+        session.player_hands = hands[:-1]
+        session.dealer_hand = hands[-1]
+        session.current_hand = current_hand
+        session.game_phase = game_phase
+        # The stored running count is informational: the tracker replays the shoe
+        bankroll, profit, wagered, _, hands_played, *counters = totals
+        session.current_bankroll = _snapshot_number(bankroll)
+        session.session_profit = _snapshot_number(profit)
+        session.hands_played = hands_played
+        session.last_request_id = last_request_id
+        session.stats = dict(zip(STAT_COUNTERS, counters))
+        session.stats['total_wagered'] = _snapshot_number(wagered)
+        session.stats['decisions'] = []
+        return session
+    
     def to_dict(self):
         return {
             'session_id': self.session_id,
@@ -367,8 +515,90 @@ class SimpleGameSession:
             'stats': self.stats
         }
 
-# Global session storage
-sessions = {}
+# Live sessions, bounded by idle time, count and estimated memory
+SESSION_IDLE_TTL = 2 * 60 * 60  # Seconds
+SESSION_MAX_COUNT = 5000
+SESSION_MAX_BYTES = 256 * 1024 * 1024
+
+# Sessions are shared through a SQLite file so every gunicorn worker on the
+# host sees them; SESSION_DB=memory keeps them in this process only
+SESSION_DB = os.environ.get('SESSION_DB', os.path.join(tempfile.gettempdir(), 'blackjack_sessions.sqlite3'))
+
+def create_session_store():
+    backend = None if SESSION_DB == 'memory' else SQLiteSessionBackend(SESSION_DB)
+    return SessionStore(max_sessions=SESSION_MAX_COUNT, idle_ttl=SESSION_IDLE_TTL,
+                        max_bytes=SESSION_MAX_BYTES, backend=backend,
+                        dumps=SimpleGameSession.to_snapshot, loads=SimpleGameSession.from_snapshot)
+
+sessions = create_session_store()
+
+# Longest client request id remembered for retries (UUIDs are 36)
+MAX_REQUEST_ID_LENGTH = 64
+
+# Batched play: longest action list and most rounds per drill request
+MAX_BATCH_ACTIONS = 50
+MAX_DRILL_HANDS = 500
+
+def parse_positive_number(value):
+    """A positive, finite number (a bet, a bankroll, a time budget) from a request, or None"""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    if not math.isfinite(value) or value <= 0:
+        return None
+    return value
+
+def change_session(data, apply, failure_message, details=None):
+    """Run apply(session) -> success on a session under its lock and save it.
+    
+    A request_id makes retries safe: a request whose id was the last one
+    applied returns the current state instead of acting twice.  An
+    expected_version (the version of the state the client last saw) makes
+    the change refuse to act on a state the client has not seen: it gets a
+    409 with the current state.  Anything apply puts in details is added
+    to the response.
+    """
+    session_id = data.get('session_id')
+    request_id = data.get('request_id')
+    expected_version = data.get('expected_version')
+    if request_id is not None and (not isinstance(request_id, str)
+                                   or not 0 < len(request_id.encode('utf-8')) <= MAX_REQUEST_ID_LENGTH):
+        return jsonify({'error': 'Invalid request_id'}), 400
+    
+    outcome = {'success': True, 'replayed': False, 'conflict': None}
+    
+    def view(session, version):
+        return {
+            'game_state': session.to_dict(),
+            'ai_recommendation': session.get_ai_recommendation(),
+            'version': version,
+            'replayed': outcome['replayed'],
+            **(details or {})
+        }
+    
+    def change(session, version):
+        if request_id is not None and request_id == session.last_request_id:
+            outcome['replayed'] = True
+            return False
+        if expected_version is not None and expected_version != version:
+            outcome['conflict'] = view(session, version)
+            raise SessionConflict(f'Expected version {expected_version}, session is at {version}')
+        outcome['success'] = apply(session)
+        if outcome['success'] and request_id is not None:
+            session.last_request_id = request_id
+        return outcome['success']
+    
+    try:
+        payload = sessions.modify(session_id, change, view)
+    except SessionConflict:
+        if outcome['conflict'] is None:
+            return jsonify({'error': 'Session is busy, please retry'}), 409
+        return jsonify({'error': 'Game state has changed', **outcome['conflict']}), 409
+    
+    if payload is None:
+        return jsonify({'error': 'Session not found'}), 404
+    if not outcome['success']:
+        return jsonify({'error': failure_message}), 400
+    return jsonify(payload)
 
 @app.route('/')
 def home():
@@ -376,114 +606,169 @@ def home():
 
 @app.route('/health')
 def health_check():
-    return jsonify({"status": "healthy"})
+    return jsonify({"status": "healthy", "sessions": sessions.stats()})
 
 @app.route('/api/new_session', methods=['POST'])
 def new_session():
     data = request.get_json() or {}
-    starting_bankroll = data.get('starting_bankroll', 1000)
+    starting_bankroll = parse_positive_number(data.get('starting_bankroll', 1000))
+    if starting_bankroll is None:
+        return jsonify({'error': 'starting_bankroll must be a positive number'}), 400
     
     session = SimpleGameSession(starting_bankroll)
-    sessions[session.session_id] = session
+    version = sessions.put(session.session_id, session)
     
     return jsonify({
         'session_id': session.session_id,
-        'game_state': session.to_dict()
+        'game_state': session.to_dict(),
+        'version': version
     })
 
 @app.route('/api/place_bet', methods=['POST'])
 def place_bet():
     data = request.get_json()
-    session_id = data.get('session_id')
-    bet_amount = data.get('bet_amount', 10)
-    
-    if session_id not in sessions:
-        return jsonify({'error': 'Session not found'}), 404
-    
-    session = sessions[session_id]
-    success = session.new_hand(bet_amount)
-    
-    if not success:
-        return jsonify({'error': 'Insufficient funds'}), 400
-    
-    ai_rec = session.get_ai_recommendation()
+    bet_amount = parse_positive_number(data.get('bet_amount', 10))
+    if bet_amount is None:
+        return jsonify({'error': 'bet_amount must be a positive number'}), 400
     
-    return jsonify({
-        'game_state': session.to_dict(),
-        'ai_recommendation': ai_rec
-    })
+    return change_session(data, lambda session: session.new_hand(bet_amount),
+                          'Insufficient funds or a hand is still in play')
 
 @app.route('/api/player_action', methods=['POST'])
 def player_action():
     data = request.get_json()
-    session_id = data.get('session_id')
     action = data.get('action')
     hand_index = data.get('hand_index')
     
-    if session_id not in sessions:
-        return jsonify({'error': 'Session not found'}), 404
+    if action == 'get_hint':
+        # Hints only read the game, so they are not saved as a change
+        loaded = sessions.get_versioned(data.get('session_id'))
+        if loaded is None:
+            return jsonify({'error': 'Session not found'}), 404
+        session, version = loaded
+        return jsonify({
+            'game_state': session.to_dict(),
+            'ai_recommendation': session.get_ai_recommendation(),
+            'version': version
+        })
     
-    session = sessions[session_id]
-    success = session.player_action(action, hand_index)
+    return change_session(data, lambda session: session.player_action(action, hand_index), 'Invalid action')
+
+@app.route('/api/player_actions', methods=['POST'])
+def player_actions():
+    """Several actions, and/or playing the hand out by basic strategy, in one request"""
+    data = request.get_json()
+    actions = data.get('actions', [])
+    auto_play = bool(data.get('auto_play', False))
     
-    if not success:
-        return jsonify({'error': 'Invalid action'}), 400
+    if not isinstance(actions, list) or len(actions) > MAX_BATCH_ACTIONS \
+            or any(action not in PLAYER_ACTIONS for action in actions):
+        return jsonify({'error': f'actions must be a list of at most {MAX_BATCH_ACTIONS} of {PLAYER_ACTIONS}'}), 400
+    if not actions and not auto_play:
+        return jsonify({'error': 'No actions given'}), 400
     
-    ai_rec = session.get_ai_recommendation()
+    tables = get_strategy_tables(RuleSet()) if auto_play else None
+    details = {}
     
-    return jsonify({
-        'game_state': session.to_dict(),
-        'ai_recommendation': ai_rec
-    })
+    def apply(session):
+        details.clear()
+        applied = session.apply_actions(actions)
+        details['applied'] = actions[:applied]
+        if applied < len(actions):
+            details['rejected'] = {'index': applied, 'action': actions[applied]}
+        elif auto_play:
+            details['auto_actions'] = session.play_out(tables)
+        return applied > 0 or bool(details.get('auto_actions'))
+    
+    return change_session(data, apply, 'Invalid action', details)
+
+@app.route('/api/drill', methods=['POST'])
+def auto_play_drill():
+    """Deal and play many rounds by basic strategy in one request"""
+    data = request.get_json()
+    num_hands = data.get('hands', 100)
+    bet_amount = parse_positive_number(data.get('bet_amount', 10))
+    include_rounds = bool(data.get('include_rounds', True))
+    
+    if isinstance(num_hands, bool) or not isinstance(num_hands, int) or not 0 < num_hands <= MAX_DRILL_HANDS:
+        return jsonify({'error': f'hands must be between 1 and {MAX_DRILL_HANDS}'}), 400
+    if bet_amount is None:
+        return jsonify({'error': 'bet_amount must be a positive number'}), 400
+    
+    tables = get_strategy_tables(RuleSet())
+    details = {}
+    
+    def apply(session):
+        details.clear()
+        before = {name: session.stats[name] for name in STAT_COUNTERS}
+        bankroll = session.current_bankroll
+        rounds = session.play_drill(num_hands, bet_amount, tables)
+        details['drill'] = {
+            'hands': len(rounds),
+            'net': session.current_bankroll - bankroll,
+            **{name: session.stats[name] - before[name] for name in STAT_COUNTERS}
+        }
+        if include_rounds:
+            details['rounds'] = rounds
+        return bool(rounds)
+    
+    return change_session(data, apply, 'Insufficient funds or a hand is still in play', details)
+
+CHART_UPCARDS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'A']
+
+def _chart_upcard(upcard):
+    return '11' if upcard == 'A' else upcard
+
+def build_basic_chart(hit_soft_17=False):
+    """Basic strategy chart (6 decks, DAS, late surrender) from the EV solver's tables"""
+    tables = get_strategy_tables(RuleSet(hit_soft_17=hit_soft_17))
+    no_das = get_strategy_tables(RuleSet(hit_soft_17=hit_soft_17, double_after_split=False))
+    
+    def letter(hand_class, total, upcard):
+        action = tables[hand_class][total][_chart_upcard(upcard)]
+        if action == 'double':
+            fallback = tables['no_double'][hand_class][total][_chart_upcard(upcard)]
+            return 'Ds' if fallback == 'stand' else 'D'
+        return 'S' if action == 'stand' else 'H'
+    
+    def split_letter(pair_value, upcard):
+        if tables['pairs'][pair_value][_chart_upcard(upcard)] != 'split':
+            return 'N'
+        return 'Y' if no_das['pairs'][pair_value][_chart_upcard(upcard)] == 'split' else 'Y/N'
+    
+    surrender_rows = sorted(tables['surrender'], key=lambda row: (',' in row, -int(row.split(',')[0])))
+    
+    return {
+        'hard_totals': {
+            str(total): {upcard: letter('hard', str(total), upcard) for upcard in CHART_UPCARDS}
+            for total in range(17, 7, -1)
+        },
+        'soft_totals': {
+            f'A,{total - 11}': {upcard: letter('soft', str(total), upcard) for upcard in CHART_UPCARDS}
+            for total in range(20, 12, -1)
+        },
+        'pairs': {
+            ('A,A' if value == 11 else f'{value},{value}'): {
+                upcard: split_letter(str(value), upcard) for upcard in CHART_UPCARDS
+            }
+            for value in range(11, 1, -1)
+        },
+        'surrender': {
+            row: {upcard: 'SUR' if _chart_upcard(upcard) in tables['surrender'][row] else ''
+                  for upcard in CHART_UPCARDS}
+            for row in surrender_rows
+        }
+    }
 
 @app.route('/api/strategy_charts')
 def get_strategy_charts():
     chart_type = request.args.get('type', 'basic')
     dealer_rules = request.args.get('dealer_rules', 'S17')
     
-    # Basic strategy charts based on dealer rules
+    basic_chart = build_basic_chart(hit_soft_17=(dealer_rules == 'H17'))
+    
+    # Deviation charts with true count indices
     if dealer_rules == 'S17':
-        basic_chart = {
-            'hard_totals': {
-                '17': {'2': 'S', '3': 'S', '4': 'S', '5': 'S', '6': 'S', '7': 'S', '8': 'S', '9': 'S', '10': 'S', 'A': 'S'},
-                '16': {'2': 'S', '3': 'S', '4': 'S', '5': 'S', '6': 'S', '7': 'H', '8': 'H', '9': 'H', '10': 'H', 'A': 'H'},
-                '15': {'2': 'S', '3': 'S', '4': 'S', '5': 'S', '6': 'S', '7': 'H', '8': 'H', '9': 'H', '10': 'H', 'A': 'H'},
-                '14': {'2': 'S', '3': 'S', '4': 'S', '5': 'S', '6': 'S', '7': 'H', '8': 'H', '9': 'H', '10': 'H', 'A': 'H'},
-                '13': {'2': 'S', '3': 'S', '4': 'S', '5': 'S', '6': 'S', '7': 'H', '8': 'H', '9': 'H', '10': 'H', 'A': 'H'},
-                '12': {'2': 'H', '3': 'H', '4': 'S', '5': 'S', '6': 'S', '7': 'H', '8': 'H', '9': 'H', '10': 'H', 'A': 'H'},
-                '11': {'2': 'D', '3': 'D', '4': 'D', '5': 'D', '6': 'D', '7': 'D', '8': 'D', '9': 'D', '10': 'D', 'A': 'H'},
-                '10': {'2': 'D', '3': 'D', '4': 'D', '5': 'D', '6': 'D', '7': 'D', '8': 'D', '9': 'D', '10': 'H', 'A': 'H'},
-                '9': {'2': 'H', '3': 'D', '4': 'D', '5': 'D', '6': 'D', '7': 'H', '8': 'H', '9': 'H', '10': 'H', 'A': 'H'},
-                '8': {'2': 'H', '3': 'H', '4': 'H', '5': 'H', '6': 'H', '7': 'H', '8': 'H', '9': 'H', '10': 'H', 'A': 'H'}
-            },
-            'soft_totals': {
-                'A,9': {'2': 'S', '3': 'S', '4': 'S', '5': 'S', '6': 'S', '7': 'S', '8': 'S', '9': 'S', '10': 'S', 'A': 'S'},
-                'A,8': {'2': 'S', '3': 'S', '4': 'S', '5': 'S', '6': 'S', '7': 'S', '8': 'S', '9': 'S', '10': 'S', 'A': 'S'},
-                'A,7': {'2': 'S', '3': 'Ds', '4': 'Ds', '5': 'Ds', '6': 'Ds', '7': 'S', '8': 'S', '9': 'H', '10': 'H', 'A': 'H'},
-                'A,6': {'2': 'H', '3': 'D', '4': 'D', '5': 'D', '6': 'D', '7': 'H', '8': 'H', '9': 'H', '10': 'H', 'A': 'H'},
-                'A,5': {'2': 'H', '3': 'H', '4': 'D', '5': 'D', '6': 'D', '7': 'H', '8': 'H', '9': 'H', '10': 'H', 'A': 'H'},
-                'A,4': {'2': 'H', '3': 'H', '4': 'D', '5': 'D', '6': 'D', '7': 'H', '8': 'H', '9': 'H', '10': 'H', 'A': 'H'},
-                'A,3': {'2': 'H', '3': 'H', '4': 'H', '5': 'D', '6': 'D', '7': 'H', '8': 'H', '9': 'H', '10': 'H', 'A': 'H'},
-                'A,2': {'2': 'H', '3': 'H', '4': 'H', '5': 'D', '6': 'D', '7': 'H', '8': 'H', '9': 'H', '10': 'H', 'A': 'H'}
-            },
-            'pairs': {
-                'A,A': {'2': 'Y', '3': 'Y', '4': 'Y', '5': 'Y', '6': 'Y', '7': 'Y', '8': 'Y', '9': 'Y', '10': 'Y', 'A': 'Y'},
-                '10,10': {'2': 'N', '3': 'N', '4': 'N', '5': 'N', '6': 'N', '7': 'N', '8': 'N', '9': 'N', '10': 'N', 'A': 'N'},
-                '9,9': {'2': 'Y', '3': 'Y', '4': 'Y', '5': 'Y', '6': 'Y', '7': 'N', '8': 'Y', '9': 'Y', '10': 'N', 'A': 'N'},
-                '8,8': {'2': 'Y', '3': 'Y', '4': 'Y', '5': 'Y', '6': 'Y', '7': 'Y', '8': 'Y', '9': 'Y', '10': 'Y', 'A': 'Y'},
-                '7,7': {'2': 'Y', '3': 'Y', '4': 'Y', '5': 'Y', '6': 'Y', '7': 'Y', '8': 'N', '9': 'N', '10': 'N', 'A': 'N'},
-                '6,6': {'2': 'Y/N', '3': 'Y', '4': 'Y', '5': 'Y', '6': 'Y', '7': 'N', '8': 'N', '9': 'N', '10': 'N', 'A': 'N'},
-                '5,5': {'2': 'N', '3': 'N', '4': 'N', '5': 'N', '6': 'N', '7': 'N', '8': 'N', '9': 'N', '10': 'N', 'A': 'N'},
-                '4,4': {'2': 'N', '3': 'N', '4': 'N', '5': 'Y/N', '6': 'Y/N', '7': 'N', '8': 'N', '9': 'N', '10': 'N', 'A': 'N'},
-                '3,3': {'2': 'Y/N', '3': 'Y/N', '4': 'Y', '5': 'Y', '6': 'Y', '7': 'Y', '8': 'N', '9': 'N', '10': 'N', 'A': 'N'},
-                '2,2': {'2': 'Y/N', '3': 'Y/N', '4': 'Y', '5': 'Y', '6': 'Y', '7': 'Y', '8': 'N', '9': 'N', '10': 'N', 'A': 'N'}
-            },
-            'surrender': {
-                '16': {'2': '', '3': '', '4': '', '5': '', '6': '', '7': '', '8': '', '9': '', '10': 'SUR', 'A': 'SUR'},
-                '15': {'2': '', '3': '', '4': '', '5': '', '6': '', '7': '', '8': '', '9': '', '10': 'SUR', 'A': ''}
-            }
-        }
-        
         # S17 Deviation chart with true count indices
         deviation_chart = {
             'hard_totals': {
@@ -510,49 +795,6 @@ def get_strategy_charts():
             'insurance': {'all': '3+'}
         }
     else:  # H17
-        basic_chart = {
-            'hard_totals': {
-                '17': {'2': 'S', '3': 'S', '4': 'S', '5': 'S', '6': 'S', '7': 'S', '8': 'S', '9': 'S', '10': 'S', 'A': 'S'},
-                '16': {'2': 'S', '3': 'S', '4': 'S', '5': 'S', '6': 'S', '7': 'H', '8': 'H', '9': 'H', '10': 'H', 'A': 'H'},
-                '15': {'2': 'S', '3': 'S', '4': 'S', '5': 'S', '6': 'S', '7': 'H', '8': 'H', '9': 'H', '10': 'H', 'A': 'H'},
-                '14': {'2': 'S', '3': 'S', '4': 'S', '5': 'S', '6': 'S', '7': 'H', '8': 'H', '9': 'H', '10': 'H', 'A': 'H'},
-                '13': {'2': 'S', '3': 'S', '4': 'S', '5': 'S', '6': 'S', '7': 'H', '8': 'H', '9': 'H', '10': 'H', 'A': 'H'},
-                '12': {'2': 'H', '3': 'H', '4': 'S', '5': 'S', '6': 'S', '7': 'H', '8': 'H', '9': 'H', '10': 'H', 'A': 'H'},
-                '11': {'2': 'D', '3': 'D', '4': 'D', '5': 'D', '6': 'D', '7': 'D', '8': 'D', '9': 'D', '10': 'D', 'A': 'D'},
-                '10': {'2': 'D', '3': 'D', '4': 'D', '5': 'D', '6': 'D', '7': 'D', '8': 'D', '9': 'D', '10': 'H', 'A': 'H'},
-                '9': {'2': 'H', '3': 'D', '4': 'D', '5': 'D', '6': 'D', '7': 'H', '8': 'H', '9': 'H', '10': 'H', 'A': 'H'},
-                '8': {'2': 'H', '3': 'H', '4': 'H', '5': 'H', '6': 'H', '7': 'H', '8': 'H', '9': 'H', '10': 'H', 'A': 'H'}
-            },
-            'soft_totals': {
-                'A,9': {'2': 'S', '3': 'S', '4': 'S', '5': 'S', '6': 'S', '7': 'S', '8': 'S', '9': 'S', '10': 'S', 'A': 'S'},
-                'A,8': {'2': 'S', '3': 'S', '4': 'S', '5': 'S', '6': 'Ds', '7': 'S', '8': 'S', '9': 'S', '10': 'S', 'A': 'S'},
-                'A,7': {'2': 'Ds', '3': 'Ds', '4': 'Ds', '5': 'Ds', '6': 'Ds', '7': 'S', '8': 'S', '9': 'H', '10': 'H', 'A': 'H'},
-                'A,6': {'2': 'H', '3': 'D', '4': 'D', '5': 'D', '6': 'D', '7': 'H', '8': 'H', '9': 'H', '10': 'H', 'A': 'H'},
-                'A,5': {'2': 'H', '3': 'H', '4': 'D', '5': 'D', '6': 'D', '7': 'H', '8': 'H', '9': 'H', '10': 'H', 'A': 'H'},
-                'A,4': {'2': 'H', '3': 'H', '4': 'D', '5': 'D', '6': 'D', '7': 'H', '8': 'H', '9': 'H', '10': 'H', 'A': 'H'},
-                'A,3': {'2': 'H', '3': 'H', '4': 'H', '5': 'D', '6': 'D', '7': 'H', '8': 'H', '9': 'H', '10': 'H', 'A': 'H'},
-                'A,2': {'2': 'H', '3': 'H', '4': 'H', '5': 'D', '6': 'D', '7': 'H', '8': 'H', '9': 'H', '10': 'H', 'A': 'H'}
-            },
-            'pairs': {
-                'A,A': {'2': 'Y', '3': 'Y', '4': 'Y', '5': 'Y', '6': 'Y', '7': 'Y', '8': 'Y', '9': 'Y', '10': 'Y', 'A': 'Y'},
-                '10,10': {'2': 'N', '3': 'N', '4': 'N', '5': 'N', '6': 'N', '7': 'N', '8': 'N', '9': 'N', '10': 'N', 'A': 'N'},
-                '9,9': {'2': 'Y', '3': 'Y', '4': 'Y', '5': 'Y', '6': 'Y', '7': 'N', '8': 'Y', '9': 'Y', '10': 'N', 'A': 'N'},
-                '8,8': {'2': 'Y', '3': 'Y', '4': 'Y', '5': 'Y', '6': 'Y', '7': 'Y', '8': 'Y', '9': 'Y', '10': 'Y', 'A': 'Y'},
-                '7,7': {'2': 'Y', '3': 'Y', '4': 'Y', '5': 'Y', '6': 'Y', '7': 'Y', '8': 'N', '9': 'N', '10': 'N', 'A': 'N'},
-                '6,6': {'2': 'Y/N', '3': 'Y', '4': 'Y', '5': 'Y', '6': 'Y', '7': 'N', '8': 'N', '9': 'N', '10': 'N', 'A': 'N'},
-                '5,5': {'2': 'N', '3': 'N', '4': 'N', '5': 'N', '6': 'N', '7': 'N', '8': 'N', '9': 'N', '10': 'N', 'A': 'N'},
-                '4,4': {'2': 'N', '3': 'N', '4': 'N', '5': 'Y/N', '6': 'Y/N', '7': 'N', '8': 'N', '9': 'N', '10': 'N', 'A': 'N'},
-                '3,3': {'2': 'Y/N', '3': 'Y/N', '4': 'Y', '5': 'Y', '6': 'Y', '7': 'Y', '8': 'N', '9': 'N', '10': 'N', 'A': 'N'},
-                '2,2': {'2': 'Y/N', '3': 'Y/N', '4': 'Y', '5': 'Y', '6': 'Y', '7': 'Y', '8': 'N', '9': 'N', '10': 'N', 'A': 'N'}
-            },
-            'surrender': {
-                '17': {'2': '', '3': '', '4': '', '5': '', '6': '', '7': '', '8': '', '9': '', '10': '', 'A': 'SUR'},
-                '16': {'2': '', '3': '', '4': '', '5': '', '6': '', '7': '', '8': '', '9': 'SUR', '10': 'SUR', 'A': 'SUR'},
-                '15': {'2': '', '3': '', '4': '', '5': '', '6': '', '7': '', '8': '', '9': '', '10': 'SUR', 'A': 'SUR'},
-                '8,8': {'2': '', '3': '', '4': '', '5': '', '6': '', '7': '', '8': '', '9': '', '10': '', 'A': 'SUR'}
-            }
-        }
-        
         # H17 Deviation chart
         deviation_chart = {
             'hard_totals': {
@@ -595,11 +837,10 @@ def get_strategy_charts():
 def get_analytics():
     session_id = request.args.get('session_id')
     
-    if session_id not in sessions:
+    session = sessions.get(session_id)
+    if session is None:
         return jsonify({'error': 'Session not found'}), 404
     
-    session = sessions[session_id]
-    
     return jsonify({
         'session_summary': {
             'hands_played': session.hands_played,
@@ -611,10 +852,151 @@ def get_analytics():
         }
     })
 
-@app.route('/api/monte_carlo', methods=['POST'])
-def monte_carlo_simulation():
-    data = request.get_json()
-    num_hands = data.get('num_hands', 1000)
+MONTE_CARLO_CHUNK_HANDS = 1000
+MONTE_CARLO_CURVE_POINTS = 200
+MONTE_CARLO_STREAM_INTERVAL = 0.25  # Seconds between progress events
+# A stream ends after this long so it does not hold a server thread for a whole
+# job; the browser reconnects and resumes from its Last-Event-ID
+MONTE_CARLO_STREAM_MAX_SECONDS = 60
+MONTE_CARLO_STREAM_RETRY_MS = 1000
+
+# Background Monte Carlo jobs run on a small pool so game requests keep flowing.
+# Jobs are per process (one web worker, see gunicorn.conf.py) and their threads
+# share the GIL with request handling
+simulation_jobs = SimulationJobManager(max_workers=2)
+
+# Outcome probabilities of the quick Monte Carlo model
+MONTE_CARLO_WIN_PROB = 0.423  # Player wins approximately 42.3%
+MONTE_CARLO_PUSH_PROB = 0.088  # Push approximately 8.8%
+MONTE_CARLO_BLACKJACK_PROB = 0.048  # Blackjack approximately 4.8%
+
+# Bankroll paths simulated for the risk figures (fewer for long horizons)
+MONTE_CARLO_RISK_PATHS = 1000
+MONTE_CARLO_RISK_CELLS = 5000000
+
+def monte_carlo_bet(betting_strategy, true_count):
+    """Bet size for a betting strategy at a true count"""
+    if betting_strategy == 'basic_count':
+        # Conservative count-based betting (1-4 spread)
+        if true_count >= 2:
+            return 40
+        elif true_count >= 1:
+            return 20
+        return 10
+    elif betting_strategy == 'aggressive_count':
+        # Aggressive count-based betting (1-12 spread)
+        if true_count >= 4:
+            return 120
+        elif true_count >= 3:
+            return 80
+        elif true_count >= 2:
+            return 40
+        elif true_count >= 1:
+            return 20
+        return 10
+    elif betting_strategy == 'kelly':
+        # Kelly Criterion betting (simplified)
+        advantage = max(0, true_count * 0.5)  # Rough advantage estimate
+        if advantage > 0:
+            kelly_fraction = advantage / 2  # Simplified Kelly
+            return min(100, max(10, int(1000 * kelly_fraction / 100) * 10))
+        return 10
+    return 10  # Flat and default betting
+
+def monte_carlo_ramp(betting_strategy, true_counts, unit=1):
+    """BetRamp of a betting strategy over a grid of true counts, scaled by unit"""
+    return BetRamp({tc: monte_carlo_bet(betting_strategy, tc) * unit for tc in true_counts}, min_bet=10 * unit)
+
+def monte_carlo_risk(betting_strategy, num_hands, bankroll=1000, on_chunk=None):
+    """Risk of ruin, time to double and drawdowns over many paths of the quick model"""
+    # True counts are uniform on [-3, 3); 0.1-wide buckets resolve every ramp step
+    true_counts = [round(-3 + step / 10, 1) for step in range(60)]
+    ramp = monte_carlo_ramp(betting_strategy, true_counts)
+    distribution = {
+        1.5: MONTE_CARLO_BLACKJACK_PROB,
+        1: MONTE_CARLO_WIN_PROB,
+        0: MONTE_CARLO_PUSH_PROB,
+        -1: 1 - MONTE_CARLO_BLACKJACK_PROB - MONTE_CARLO_WIN_PROB - MONTE_CARLO_PUSH_PROB
+    }
+    simulator = RiskSimulator(ramp, {tc: 1 for tc in true_counts}, {tc: distribution for tc in true_counts})
+    
+    num_paths = max(100, min(MONTE_CARLO_RISK_PATHS, MONTE_CARLO_RISK_CELLS // num_hands))
+    return simulator.simulate(bankroll, num_hands, num_paths, on_chunk=on_chunk)
+
+# Time-boxed runs of the real engine: budget limits and a cap on hands
+MONTE_CARLO_MIN_BUDGET_MS = 50
+MONTE_CARLO_MAX_BUDGET_MS = 10000
+MONTE_CARLO_TIMED_MAX_HANDS = 10000000
+
+# Engine bets are 100 per unit; the quick model and the UI use 10
+ENGINE_BET_SCALE = 10 / 100
+
+# Betting strategies of monte_carlo_bet; the engine keeps a Hi-Lo count only
+MONTE_CARLO_BETTING_STRATEGIES = ('flat', 'basic_count', 'aggressive_count', 'kelly')
+ENGINE_COUNTING_SYSTEM = 'Hi-Lo'
+
+# The engine's true counts run past the quick model's; 0.1 steps up to +5 cover every ramp's top bet
+ENGINE_RAMP_COUNTS = [round(-3 + step / 10, 1) for step in range(81)]
+
+engine_simulator = None
+
+def get_engine_simulator():
+    """Shared real-engine simulator, built on first use"""
+    global engine_simulator
+    if engine_simulator is None:
+        engine_simulator = MonteCarloSimulator()
+    return engine_simulator
+
+def run_timed_monte_carlo(data):
+    """Real batch engine for as many hands as fit in data['time_budget_ms']"""
+    budget_ms = min(MONTE_CARLO_MAX_BUDGET_MS, max(MONTE_CARLO_MIN_BUDGET_MS, data['time_budget_ms']))
+    max_hands = max(1, int(data.get('max_hands', MONTE_CARLO_TIMED_MAX_HANDS)))
+    betting_strategy = data.get('betting_strategy', 'flat')
+    
+    # Count strategies bet the same ramp as the quick model, in engine units
+    bet_ramp = None
+    strategy_type = 'Basic Strategy Only'
+    if betting_strategy != 'flat':
+        bet_ramp = monte_carlo_ramp(betting_strategy, ENGINE_RAMP_COUNTS, unit=1 / ENGINE_BET_SCALE)
+        strategy_type = 'Card Counting'
+    
+    results = get_engine_simulator().run_simulation(
+        num_hands=max_hands, strategy_type=strategy_type, engine='batch',
+        time_budget=budget_ms / 1000, use_cache=False, bet_ramp=bet_ramp
+    )
+    statistics = results['statistics']
+    hands_played = statistics['hands']
+    net_result = round(results['net_result'] * ENGINE_BET_SCALE, 2)
+    mean_net = statistics['mean_net'] * ENGINE_BET_SCALE
+    std_net = statistics['std_net'] * ENGINE_BET_SCALE
+    
+    return {
+        'engine': 'batch',
+        'total_hands': hands_played,
+        'wins': results['hands_won'],
+        'losses': results['hands_lost'],
+        'pushes': results['hands_pushed'],
+        'win_rate': round(results['win_rate'] * 100, 1),
+        'net_result': net_result,
+        'house_edge': round(statistics['house_edge'] * 100, 2),
+        'house_edge_std_error': round(statistics['house_edge_std_error'] * 100, 3),
+        'ci_width': round(results['time_budget']['ci_width'] * 100, 3),
+        'hourly_ev': round(mean_net * 80, 2),
+        'risk_of_ruin': round(diffusion_risk_of_ruin(mean_net, std_net ** 2, 1000) * 100, 1),
+        'final_bankroll': round(1000 + net_result, 2),
+        'max_drawdown': round(statistics['max_drawdown'] * ENGINE_BET_SCALE, 2),
+        'betting_strategy': betting_strategy,
+        'counting_system': ENGINE_COUNTING_SYSTEM if bet_ramp is not None else 'None',
+        'bankroll_curve': [1000 + point * ENGINE_BET_SCALE for point in results['cumulative_winnings']],
+        'curve_stride': statistics['trajectory_stride'],
+        'time_budget_ms': budget_ms,
+        'elapsed_ms': round(results['execution_time'] * 1000, 1),
+        'hands_per_second': round(results['hands_per_second'])
+    }
+
+def run_monte_carlo(data, job=None):
+    """Monte Carlo bankroll simulation; reports progress to job between chunks"""
+    num_hands = max(1, int(data.get('num_hands', 1000)))
     betting_strategy = data.get('betting_strategy', 'flat')
     counting_system = data.get('counting_system', 'Hi-Lo')
     
@@ -627,49 +1009,60 @@ def monte_carlo_simulation():
     bankroll_history = []
     current_bankroll = 1000
     
+    # Running house edge, its error bar and a downsampled bankroll curve
+    stats = StreamingStats(max_points=MONTE_CARLO_CURVE_POINTS)
+    
     # Realistic blackjack probabilities
-    win_prob = 0.423  # Player wins approximately 42.3%
-    lose_prob = 0.489  # Player loses approximately 48.9%
-    push_prob = 0.088  # Push approximately 8.8%
-    blackjack_prob = 0.048  # Blackjack approximately 4.8%
+    win_prob = MONTE_CARLO_WIN_PROB
+    push_prob = MONTE_CARLO_PUSH_PROB
+    blackjack_prob = MONTE_CARLO_BLACKJACK_PROB
+    
+    # Ruin and drawdown figures depend only on the model, not on this run's path;
+    # the job is checked for cancellation between chunks of those paths too
+    on_chunk = (lambda: job.report(0)) if job is not None else None
+    risk = monte_carlo_risk(betting_strategy, num_hands, on_chunk=on_chunk)
+    
+    def summary(hands_played):
+        win_rate = round((wins / hands_played) * 100, 1)
+        house_edge = round(stats.house_edge * 100, 2)
+        hourly_hands = 80  # Typical hands per hour
+        hourly_ev = round((total_profit / hands_played) * hourly_hands, 2)
+        
+        max_drawdown = max(bankroll_history) - min(bankroll_history) if bankroll_history else 0
+        
+        return {
+            'total_hands': hands_played,
+            'wins': wins,
+            'losses': losses,
+            'pushes': pushes,
+            'blackjacks': blackjacks,
+            'win_rate': win_rate,
+            'net_result': total_profit,
+            'house_edge': house_edge,
+            'house_edge_std_error': round(stats.house_edge_std_error * 100, 3),
+            'ci_width': round(2 * 1.96 * stats.house_edge_std_error * 100, 3),
+            'hourly_ev': hourly_ev,
+            'risk_of_ruin': round(risk['risk_of_ruin'] * 100, 1),
+            'risk_of_ruin_std_error': round(risk['risk_of_ruin_std_error'] * 100, 2),
+            'risk': risk,
+            'final_bankroll': current_bankroll,
+            'max_drawdown': round(max_drawdown, 2),
+            'betting_strategy': betting_strategy,
+            'counting_system': counting_system,
+            'bankroll_history': bankroll_history[:10],  # First 10 checkpoints
+            'bankroll_curve': [1000 + point for point in stats.trajectory],
+            'curve_stride': stats.stride
+        }
     
     for hand in range(num_hands):
+        # Publish progress and honour cancellation between chunks
+        if job is not None and hand > 0 and hand % MONTE_CARLO_CHUNK_HANDS == 0:
+            job.report(hand / num_hands, summary(hand))
+        
         # Simulate true count for count-based strategies
         true_count = random.uniform(-3, 3)
         
-        # Determine bet size based on strategy
-        if betting_strategy == 'flat':
-            bet = 10
-        elif betting_strategy == 'basic_count':
-            # Conservative count-based betting (1-4 spread)
-            if true_count >= 2:
-                bet = 40
-            elif true_count >= 1:
-                bet = 20
-            else:
-                bet = 10
-        elif betting_strategy == 'aggressive_count':
-            # Aggressive count-based betting (1-12 spread)
-            if true_count >= 4:
-                bet = 120
-            elif true_count >= 3:
-                bet = 80
-            elif true_count >= 2:
-                bet = 40
-            elif true_count >= 1:
-                bet = 20
-            else:
-                bet = 10
-        elif betting_strategy == 'kelly':
-            # Kelly Criterion betting (simplified)
-            advantage = max(0, true_count * 0.5)  # Rough advantage estimate
-            if advantage > 0:
-                kelly_fraction = advantage / 2  # Simplified Kelly
-                bet = min(100, max(10, int(1000 * kelly_fraction / 100) * 10))
-            else:
-                bet = 10
-        else:
-            bet = 10  # Default flat betting
+        bet = monte_carlo_bet(betting_strategy, true_count)
         
         # Simulate hand outcome
         rand = random.random()
@@ -681,50 +1074,117 @@ def monte_carlo_simulation():
             current_bankroll += payout
             wins += 1
             blackjacks += 1
+            stats.update(payout, bet, 1)
         elif rand < blackjack_prob + win_prob:
             # Regular win
             total_profit += bet
             current_bankroll += bet
             wins += 1
+            stats.update(bet, bet, 1)
         elif rand < blackjack_prob + win_prob + push_prob:
             # Push - no money changes hands
             pushes += 1
+            stats.update(0, bet, 0)
         else:
             # Loss
             total_profit -= bet
             current_bankroll -= bet
             losses += 1
+            stats.update(-bet, bet, -1)
         
         # Track bankroll every 100 hands
         if hand % 100 == 0:
             bankroll_history.append(current_bankroll)
     
-    win_rate = round((wins / num_hands) * 100, 1)
-    house_edge = round((-total_profit / (num_hands * 10)) * 100, 2)
-    hourly_hands = 80  # Typical hands per hour
-    hourly_ev = round((total_profit / num_hands) * hourly_hands, 2)
+    return summary(num_hands)
+
+@app.route('/api/monte_carlo', methods=['POST'])
+def monte_carlo_simulation():
+    data = request.get_json() or {}
+    if data.get('time_budget_ms') is not None:
+        if parse_positive_number(data['time_budget_ms']) is None:
+            return jsonify({'error': 'time_budget_ms must be a positive number'}), 400
+        max_hands = data.get('max_hands', MONTE_CARLO_TIMED_MAX_HANDS)
+        if isinstance(max_hands, bool) or not isinstance(max_hands, int) or max_hands < 1:
+            return jsonify({'error': 'max_hands must be a positive integer'}), 400
+        betting_strategy = data.get('betting_strategy', 'flat')
+        if betting_strategy not in MONTE_CARLO_BETTING_STRATEGIES:
+            return jsonify({'error': f'Unknown betting strategy: {betting_strategy}'}), 400
+        if betting_strategy != 'flat' and data.get('counting_system', ENGINE_COUNTING_SYSTEM) != ENGINE_COUNTING_SYSTEM:
+            return jsonify({'error': f'The game engine counts {ENGINE_COUNTING_SYSTEM} only'}), 400
+        return jsonify(run_timed_monte_carlo(data))
+    return jsonify(run_monte_carlo(data))
+
+@app.route('/api/monte_carlo/jobs', methods=['POST'])
+def submit_monte_carlo_job():
+    data = request.get_json() or {}
     
-    # Calculate risk of ruin (simplified)
-    max_drawdown = max(bankroll_history) - min(bankroll_history) if bankroll_history else 0
-    risk_of_ruin = min(100, max(0, (max_drawdown / 1000) * 50))
+    try:
+        job = simulation_jobs.submit(lambda job: run_monte_carlo(data, job), data)
+    except JobQueueFull:
+        return jsonify({'error': 'Too many simulations running, try again later'}), 429
     
-    return jsonify({
-        'total_hands': num_hands,
-        'wins': wins,
-        'losses': losses,
-        'pushes': pushes,
-        'blackjacks': blackjacks,
-        'win_rate': win_rate,
-        'net_result': total_profit,
-        'house_edge': house_edge,
-        'hourly_ev': hourly_ev,
-        'risk_of_ruin': round(risk_of_ruin, 1),
-        'final_bankroll': current_bankroll,
-        'max_drawdown': round(max_drawdown, 2),
-        'betting_strategy': betting_strategy,
-        'counting_system': counting_system,
-        'bankroll_history': bankroll_history[:10]  # First 10 checkpoints
-    })
+    return jsonify({'job_id': job.job_id, 'status': job.status}), 202
+
+@app.route('/api/monte_carlo/jobs/<job_id>')
+def monte_carlo_job_status(job_id):
+    job = simulation_jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    return jsonify(job.to_dict())
+
+@app.route('/api/monte_carlo/jobs/<job_id>/stream')
+def stream_monte_carlo_job(job_id):
+    """Server-Sent Events: a progress snapshot per update, then a final 'done' event.
+    
+    Each event carries the job version as its id.  The stream closes after
+    MONTE_CARLO_STREAM_MAX_SECONDS; the client's automatic reconnect sends
+    Last-Event-ID and picks up from the next change.
+    """
+    job = simulation_jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    try:
+        last_version = int(request.headers.get('Last-Event-ID', -1))
+    except ValueError:
+        last_version = -1
+    
+    def events():
+        version = last_version
+        closes_at = time.time() + MONTE_CARLO_STREAM_MAX_SECONDS
+        yield f"retry: {MONTE_CARLO_STREAM_RETRY_MS}\n\n"
+        while True:
+            sent_at = time.time()
+            if sent_at >= closes_at:
+                return
+            new_version = job.wait_for_update(version, timeout=min(15, closes_at - sent_at))
+            if new_version == version:
+                yield ': keep-alive\n\n'
+                continue
+            version = new_version
+            
+            snapshot = job.to_dict()
+            if snapshot['status'] in FINISHED_STATES:
+                yield f"id: {version}\nevent: done\ndata: {json.dumps(snapshot)}\n\n"
+                return
+            snapshot['result'] = None
+            yield f"id: {version}\nevent: progress\ndata: {json.dumps(snapshot)}\n\n"
+            
+            # Coalesce fast updates so slow clients get the latest snapshot
+            time.sleep(max(0.0, MONTE_CARLO_STREAM_INTERVAL - (time.time() - sent_at)))
+    
+    return Response(stream_with_context(events()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/api/monte_carlo/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_monte_carlo_job(job_id):
+    job = simulation_jobs.cancel(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    return jsonify(job.to_dict())
 
 @app.route('/api/card_counting_practice', methods=['POST'])
 def card_counting_practice():
@@ -762,7 +1222,10 @@ def validate_user_count():
     # Calculate actual count
     actual_count = 0
     for card_data in cards_data:
-        card = SimpleCard(card_data['suit'], card_data['rank'])
+        try:
+            card = SimpleCard(card_data['suit'], card_data['rank'])
+        except (KeyError, TypeError, ValueError):
+            return jsonify({'error': f'Invalid card: {card_data}'}), 400
         actual_count += card.get_count_value(system)
     
     correct = user_count == actual_count
@@ -0,0 +1,150 @@
+"""
+Cache of Monte Carlo results keyed by canonicalized simulation parameters.
+
+Entries live in an in-memory LRU map with size- and age-based eviction.  An
+optional directory adds a disk tier: results are pickled there on store, and
+memory misses fall back to it, so popular scenarios survive restarts and are
+shared by every process pointed at the same directory.  The directory keeps
+at most max_disk_entries files; reading a file marks it as used, and the
+least recently used files are deleted first.  A lock makes one cache safe to
+share between threads (request handlers and simulation jobs).
+"""
+
+import copy
+import hashlib
+import json
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+
+def canonical_key(params: Dict) -> str:
+    """Stable hash of simulation parameters (order and int/float spelling ignored)"""
+    canonical = {}
+    for name, value in params.items():
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)
+        canonical[name] = value
+    encoded = json.dumps(canonical, sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+class SimulationResultCache:
+    def __init__(self, max_entries: int = 128, max_age: float = 3600,
+                 cache_dir: Optional[str] = None, max_disk_entries: Optional[int] = 1024):
+        self.max_entries = max_entries
+        self.max_age = max_age  # Seconds; None keeps entries until evicted by size
+        self.cache_dir = cache_dir
+        self.max_disk_entries = max_disk_entries  # None lets the disk tier grow without bound
+        self.entries: 'OrderedDict[str, tuple]' = OrderedDict()  # key -> (stored_at, results)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, params: Dict) -> Optional[Dict]:
+        """Cached results for params, or None"""
+        key = canonical_key(params)
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                entry = self._load(key)
+                if entry is not None:
+                    self.entries[key] = entry
+                    self._evict()
+
+            if entry is None or self._expired(entry[0]):
+                if entry is not None:
+                    self._remove_file(key)
+                self.entries.pop(key, None)
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+        # Stored entries are never mutated, so the copy can be made unlocked
+        return copy.deepcopy(entry[1])
+
+    def put(self, params: Dict, results: Dict):
+        key = canonical_key(params)
+        entry = (time.time(), copy.deepcopy(results))
+        with self._lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            self._evict()
+            self._save(key, entry)
+
+    def clear(self):
+        """Drop the in-memory tier (the disk tier is left alone)"""
+        with self._lock:
+            self.entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self.entries)
+
+    def _expired(self, stored_at: float) -> bool:
+        return self.max_age is not None and time.time() - stored_at > self.max_age
+
+    def _evict(self):
+        """Drop expired entries, then least recently used ones over max_entries; caller holds the lock"""
+        for key in [key for key, (stored_at, _) in self.entries.items() if self._expired(stored_at)]:
+            del self.entries[key]
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f'{key}.pkl')
+
+    def _load(self, key: str) -> Optional[tuple]:
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._path(key), 'rb') as f:
+                entry = pickle.load(f)
+            os.utime(self._path(key))  # Marks the file as recently used
+            return entry
+        except (OSError, pickle.PickleError, EOFError, ValueError):
+            return None
+
+    def _save(self, key: str, entry: tuple):
+        if not self.cache_dir:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Write then rename so concurrent readers never see a partial file
+            temp_path = f'{self._path(key)}.{os.getpid()}.{threading.get_ident()}.tmp'
+            with open(temp_path, 'wb') as f:
+                pickle.dump(entry, f)
+            os.replace(temp_path, self._path(key))
+            self._prune_files()
+        except OSError:
+            pass  # The disk tier is best effort
+
+    def _prune_files(self):
+        """Delete the least recently used files over max_disk_entries"""
+        if self.max_disk_entries is None:
+            return
+        files = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith('.pkl'):
+                try:
+                    files.append((entry.stat().st_mtime, entry.path))
+                except OSError:
+                    pass  # Deleted by another process meanwhile
+        files.sort()
+        for _, path in files[:max(0, len(files) - self.max_disk_entries)]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _remove_file(self, key: str):
+        if not self.cache_dir:
+            return
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
@@ -0,0 +1,181 @@
+"""
+Background simulation jobs.
+
+Long Monte Carlo runs are submitted to a small, bounded worker pool instead
+of running inside the request thread.  A job runs in chunks: after every
+chunk it publishes its progress and partial results and checks whether it
+has been cancelled, so status polling and cancellation stay cheap and
+interactive requests keep being served while simulations run.
+
+Jobs and their progress live in the memory of the process that accepted
+them, so a status, stream or cancel request only finds a job in that same
+process.  The web app therefore runs as one worker process with several
+threads (see gunicorn.conf.py, which refuses more workers).  Job threads are
+CPU-bound and share that process's GIL with request handling: requests are
+still served between bytecode switches, but more slowly while jobs run,
+which is why the pool is kept small.
+"""
+
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+QUEUED = 'queued'
+RUNNING = 'running'
+COMPLETED = 'completed'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+FINISHED_STATES = (COMPLETED, FAILED, CANCELLED)
+
+
+class JobCancelled(Exception):
+    """Raised inside a job runner when its job has been cancelled"""
+
+
+class JobQueueFull(Exception):
+    """Raised on submit when too many jobs are already waiting or running"""
+
+
+class SimulationJob:
+    def __init__(self, params: Dict):
+        self.job_id = str(uuid.uuid4())
+        self.params = params
+        self.status = QUEUED
+        self.progress = 0.0
+        self.partial_results = None
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.version = 0  # Bumped on every progress or status change
+        self._cancel_event = threading.Event()
+        self._lock = threading.Lock()
+        self._updated = threading.Condition(self._lock)
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def report(self, progress: float, partial_results: Optional[Dict] = None):
+        """Publish progress (0-1) from the runner; raises JobCancelled if cancelled"""
+        with self._lock:
+            self.progress = min(1.0, max(0.0, progress))
+            if partial_results is not None:
+                self.partial_results = partial_results
+            self._bump()
+        if self._cancel_event.is_set():
+            raise JobCancelled()
+
+    def wait_for_update(self, version: int, timeout: Optional[float] = None) -> int:
+        """Block until the job changes past version (or timeout); returns the current version"""
+        with self._updated:
+            self._updated.wait_for(lambda: self.version != version, timeout)
+            return self.version
+
+    def _bump(self):
+        """Record a change and wake stream listeners; caller holds the lock"""
+        self.version += 1
+        self._updated.notify_all()
+
+    def to_dict(self) -> Dict:
+        with self._lock:
+            elapsed = None
+            if self.started_at is not None:
+                elapsed = (self.finished_at or time.time()) - self.started_at
+            return {
+                'job_id': self.job_id,
+                'status': self.status,
+                'cancel_requested': self.cancel_requested,
+                'progress': round(self.progress, 4),
+                'partial_results': self.partial_results,
+                'result': self.result,
+                'error': self.error,
+                'elapsed_seconds': round(elapsed, 3) if elapsed is not None else None
+            }
+
+
+class SimulationJobManager:
+    """Runs simulation jobs on a bounded thread pool and keeps their status"""
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 20,
+                 retention_seconds: float = 3600, max_finished: int = 200):
+        self.max_pending = max_pending
+        self.retention_seconds = retention_seconds
+        self.max_finished = max_finished
+        self.executor = ThreadPoolExecutor(max_workers=max_workers,
+                                           thread_name_prefix='simulation-job')
+        self.jobs: Dict[str, SimulationJob] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, runner: Callable[[SimulationJob], Dict], params: Dict) -> SimulationJob:
+        """Queue runner(job) in the background and return the job"""
+        with self._lock:
+            self._prune()
+            active = sum(1 for job in self.jobs.values() if job.status not in FINISHED_STATES)
+            if active >= self.max_pending:
+                raise JobQueueFull()
+            job = SimulationJob(params)
+            self.jobs[job.job_id] = job
+
+        self.executor.submit(self._run, job, runner)
+        return job
+
+    def get(self, job_id: str) -> Optional[SimulationJob]:
+        with self._lock:
+            return self.jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[SimulationJob]:
+        """Request cancellation; queued jobs never start, running ones stop at the next chunk"""
+        job = self.get(job_id)
+        if job is not None and job.status not in FINISHED_STATES:
+            job.cancel()
+            if job.status == QUEUED:
+                self._finish(job, CANCELLED)
+        return job
+
+    def _run(self, job: SimulationJob, runner: Callable[[SimulationJob], Dict]):
+        with job._lock:
+            if job.status != QUEUED or job.cancel_requested:
+                return
+            job.status = RUNNING
+            job.started_at = time.time()
+            job._bump()
+
+        try:
+            result = runner(job)
+        except JobCancelled:
+            self._finish(job, CANCELLED)
+        except Exception as e:
+            self._finish(job, FAILED, error=str(e))
+        else:
+            self._finish(job, COMPLETED, result=result)
+
+    def _finish(self, job: SimulationJob, status: str, result: Optional[Dict] = None,
+                error: Optional[str] = None):
+        with job._lock:
+            if job.status in FINISHED_STATES:
+                return
+            job.status = status
+            job.finished_at = time.time()
+            if result is not None:
+                job.result = result
+                job.progress = 1.0
+            job.error = error
+            job._bump()
+
+    def _prune(self):
+        """Forget finished jobs past retention, oldest first beyond max_finished"""
+        now = time.time()
+        finished = sorted((job for job in self.jobs.values() if job.status in FINISHED_STATES),
+                          key=lambda job: job.finished_at)
+        excess = len(finished) - self.max_finished
+        for index, job in enumerate(finished):
+            if index < excess or now - job.finished_at > self.retention_seconds:
+                del self.jobs[job.job_id]
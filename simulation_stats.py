@@ -0,0 +1,186 @@
+import math
+import numpy as np
+from typing import Dict, List, Optional
+
+
+class StreamingStats:
+    """
+    Constant-memory statistics for a stream of simulated hands.
+
+    Per-hand net result and amount wagered are accumulated with Welford's
+    online algorithm (including their co-moment, which the house-edge error
+    bar needs).  Chunks of hands from the batch engine are folded in with
+    Chan's parallel update, so the moments stay exact.  The bankroll curve
+    is kept as a fixed-size downsampled trajectory: when it fills up, every
+    other point is dropped and the sampling stride doubles.
+    """
+
+    def __init__(self, max_points: int = 500):
+        self.max_points = max_points
+
+        self.count = 0
+        self.mean_net = 0.0
+        self.mean_wagered = 0.0
+        self.m2_net = 0.0
+        self.m2_wagered = 0.0
+        self.co_moment = 0.0
+
+        self.total_net = 0.0
+        self.total_wagered = 0.0
+        self.hands_won = 0
+        self.hands_lost = 0
+        self.hands_pushed = 0
+
+        self.bankroll = 0.0
+        self.peak_bankroll = 0.0
+        self.min_bankroll = 0.0
+        self.max_bankroll = 0.0
+        self.max_drawdown = 0.0
+
+        self.stride = 1
+        self.trajectory: List[float] = []
+
+    def update(self, net: float, wagered: float, outcome: int):
+        """Add a single hand (outcome: 1 win, -1 loss, 0 push)"""
+        self.count += 1
+        delta_net = net - self.mean_net
+        delta_wagered = wagered - self.mean_wagered
+        self.mean_net += delta_net / self.count
+        self.mean_wagered += delta_wagered / self.count
+        self.m2_net += delta_net * (net - self.mean_net)
+        self.m2_wagered += delta_wagered * (wagered - self.mean_wagered)
+        self.co_moment += delta_net * (wagered - self.mean_wagered)
+
+        self.total_net += net
+        self.total_wagered += wagered
+        if outcome > 0:
+            self.hands_won += 1
+        elif outcome < 0:
+            self.hands_lost += 1
+        else:
+            self.hands_pushed += 1
+
+        self.bankroll += net
+        if self.bankroll > self.peak_bankroll:
+            self.peak_bankroll = self.bankroll
+        elif self.peak_bankroll - self.bankroll > self.max_drawdown:
+            self.max_drawdown = self.peak_bankroll - self.bankroll
+        if self.bankroll < self.min_bankroll:
+            self.min_bankroll = self.bankroll
+        if self.bankroll > self.max_bankroll:
+            self.max_bankroll = self.bankroll
+
+        if self.count % self.stride == 0:
+            self.trajectory.append(self.bankroll)
+            self._compact_trajectory()
+
+    def update_batch(self, net: np.ndarray, wagered: np.ndarray, outcome: np.ndarray):
+        """Add a chunk of consecutive hands given as arrays"""
+        n = len(net)
+        if n == 0:
+            return
+
+        start = self.count
+        mean_net = float(net.mean())
+        mean_wagered = float(wagered.mean())
+        self._combine(
+            n, mean_net, mean_wagered,
+            float(((net - mean_net) ** 2).sum()),
+            float(((wagered - mean_wagered) ** 2).sum()),
+            float(((net - mean_net) * (wagered - mean_wagered)).sum())
+        )
+
+        self.total_net += float(net.sum())
+        self.total_wagered += float(wagered.sum())
+        self.hands_won += int(np.count_nonzero(outcome > 0))
+        self.hands_lost += int(np.count_nonzero(outcome < 0))
+        self.hands_pushed += int(np.count_nonzero(outcome == 0))
+
+        bankroll = self.bankroll + np.cumsum(net)
+        peaks = np.maximum.accumulate(np.maximum(bankroll, self.peak_bankroll))
+        self.max_drawdown = max(self.max_drawdown, float((peaks - bankroll).max()))
+        self.peak_bankroll = float(peaks[-1])
+        self.min_bankroll = min(self.min_bankroll, float(bankroll.min()))
+        self.max_bankroll = max(self.max_bankroll, float(bankroll.max()))
+        self.bankroll = float(bankroll[-1])
+
+        # Hand numbers (1-based) that land on the sampling stride
+        first = (start // self.stride + 1) * self.stride
+        while first <= start + n:
+            picks = np.arange(first, start + n + 1, self.stride)
+            taken = picks[:self.max_points - len(self.trajectory)]
+            self.trajectory.extend(bankroll[taken - start - 1].tolist())
+            # Compact as soon as the curve fills, exactly as update() does
+            self._compact_trajectory()
+            if len(taken) == len(picks):
+                break
+            first = (int(taken[-1]) // self.stride + 1) * self.stride
+
+    def _combine(self, n: int, mean_net: float, mean_wagered: float,
+                 m2_net: float, m2_wagered: float, co_moment: float):
+        """Chan et al. pairwise update of the running moments"""
+        total = self.count + n
+        delta_net = mean_net - self.mean_net
+        delta_wagered = mean_wagered - self.mean_wagered
+        weight = self.count * n / total
+
+        self.m2_net += m2_net + delta_net * delta_net * weight
+        self.m2_wagered += m2_wagered + delta_wagered * delta_wagered * weight
+        self.co_moment += co_moment + delta_net * delta_wagered * weight
+        self.mean_net += delta_net * n / total
+        self.mean_wagered += delta_wagered * n / total
+        self.count = total
+
+    def _compact_trajectory(self):
+        """Halve the trajectory resolution once it reaches max_points"""
+        if len(self.trajectory) >= self.max_points:
+            self.trajectory = self.trajectory[1::2]
+            self.stride *= 2
+
+    @property
+    def variance(self) -> float:
+        """Sample variance of the per-hand net result"""
+        return self.m2_net / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    @property
+    def mean_net_std_error(self) -> float:
+        """Standard error of the mean per-hand net result"""
+        return self.std / math.sqrt(self.count) if self.count > 0 else 0.0
+
+    @property
+    def house_edge(self) -> float:
+        return -self.total_net / self.total_wagered if self.total_wagered > 0 else 0.0
+
+    @property
+    def house_edge_std_error(self) -> float:
+        """Standard error of the house edge (delta method for a ratio estimator)"""
+        if self.count < 2 or self.mean_wagered == 0:
+            return 0.0
+        ratio = self.mean_net / self.mean_wagered
+        residual_variance = (self.m2_net - 2 * ratio * self.co_moment
+                             + ratio * ratio * self.m2_wagered) / (self.count - 1)
+        return math.sqrt(max(0.0, residual_variance) / self.count) / abs(self.mean_wagered)
+
+    def confidence_interval(self, z: float = 1.96) -> List[float]:
+        """Confidence interval for the house edge"""
+        margin = z * self.house_edge_std_error
+        return [self.house_edge - margin, self.house_edge + margin]
+
+    def to_dict(self) -> Dict:
+        return {
+            'hands': self.count,
+            'mean_net': self.mean_net,
+            'std_net': self.std,
+            'house_edge': self.house_edge,
+            'house_edge_std_error': self.house_edge_std_error,
+            'confidence_interval_95': self.confidence_interval(),
+            'max_drawdown': self.max_drawdown,
+            'peak_bankroll': self.peak_bankroll,
+            'min_bankroll': self.min_bankroll,
+            'max_bankroll': self.max_bankroll,
+            'trajectory_stride': self.stride,
+        }
@@ -1,103 +1,24 @@
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+from ev_solver import RuleSet, get_strategy_tables
 
 class BasicStrategy:
-    def __init__(self):
-        # Updated hard totals strategy based on professional blackjack strategy charts
-        self.hard_strategy = {
-            # Player 5-8: Always hit
-            5: {2: 'hit', 3: 'hit', 4: 'hit', 5: 'hit', 6: 'hit', 7: 'hit', 8: 'hit', 9: 'hit', 10: 'hit', 11: 'hit'},
-            6: {2: 'hit', 3: 'hit', 4: 'hit', 5: 'hit', 6: 'hit', 7: 'hit', 8: 'hit', 9: 'hit', 10: 'hit', 11: 'hit'},
-            7: {2: 'hit', 3: 'hit', 4: 'hit', 5: 'hit', 6: 'hit', 7: 'hit', 8: 'hit', 9: 'hit', 10: 'hit', 11: 'hit'},
-            8: {2: 'hit', 3: 'hit', 4: 'hit', 5: 'hit', 6: 'hit', 7: 'hit', 8: 'hit', 9: 'hit', 10: 'hit', 11: 'hit'},
-            
-            # Player 9: Double vs 3-6, otherwise hit
-            9: {2: 'hit', 3: 'double', 4: 'double', 5: 'double', 6: 'double', 7: 'hit', 8: 'hit', 9: 'hit', 10: 'hit', 11: 'hit'},
-            
-            # Player 10: Double vs 2-9, hit vs 10/A
-            10: {2: 'double', 3: 'double', 4: 'double', 5: 'double', 6: 'double', 7: 'double', 8: 'double', 9: 'double', 10: 'hit', 11: 'hit'},
-            
-            # Player 11: Double vs 2-10, hit vs A
-            11: {2: 'double', 3: 'double', 4: 'double', 5: 'double', 6: 'double', 7: 'double', 8: 'double', 9: 'double', 10: 'double', 11: 'hit'},
-            
-            # Player 12: Hit vs 2,3 and 7-A, Stand vs 4-6
-            12: {2: 'hit', 3: 'hit', 4: 'stand', 5: 'stand', 6: 'stand', 7: 'hit', 8: 'hit', 9: 'hit', 10: 'hit', 11: 'hit'},
-            
-            # Player 13-16: Stand vs 2-6, hit vs 7-A
-            13: {2: 'stand', 3: 'stand', 4: 'stand', 5: 'stand', 6: 'stand', 7: 'hit', 8: 'hit', 9: 'hit', 10: 'hit', 11: 'hit'},
-            14: {2: 'stand', 3: 'stand', 4: 'stand', 5: 'stand', 6: 'stand', 7: 'hit', 8: 'hit', 9: 'hit', 10: 'hit', 11: 'hit'},
-            15: {2: 'stand', 3: 'stand', 4: 'stand', 5: 'stand', 6: 'stand', 7: 'hit', 8: 'hit', 9: 'hit', 10: 'hit', 11: 'hit'},
-            16: {2: 'stand', 3: 'stand', 4: 'stand', 5: 'stand', 6: 'stand', 7: 'hit', 8: 'hit', 9: 'hit', 10: 'hit', 11: 'hit'},
-            
-            # Player 17-21: Always stand
-            17: {2: 'stand', 3: 'stand', 4: 'stand', 5: 'stand', 6: 'stand', 7: 'stand', 8: 'stand', 9: 'stand', 10: 'stand', 11: 'stand'},
-            18: {2: 'stand', 3: 'stand', 4: 'stand', 5: 'stand', 6: 'stand', 7: 'stand', 8: 'stand', 9: 'stand', 10: 'stand', 11: 'stand'},
-            19: {2: 'stand', 3: 'stand', 4: 'stand', 5: 'stand', 6: 'stand', 7: 'stand', 8: 'stand', 9: 'stand', 10: 'stand', 11: 'stand'},
-            20: {2: 'stand', 3: 'stand', 4: 'stand', 5: 'stand', 6: 'stand', 7: 'stand', 8: 'stand', 9: 'stand', 10: 'stand', 11: 'stand'},
-            21: {2: 'stand', 3: 'stand', 4: 'stand', 5: 'stand', 6: 'stand', 7: 'stand', 8: 'stand', 9: 'stand', 10: 'stand', 11: 'stand'},
-        }
-        
-        # Professional soft totals strategy (A,2 = 13, A,3 = 14, etc.)
-        self.soft_strategy = {
-            # A,2 (soft 13): Double vs 5-6, otherwise hit
-            13: {2: 'hit', 3: 'hit', 4: 'hit', 5: 'double', 6: 'double', 7: 'hit', 8: 'hit', 9: 'hit', 10: 'hit', 11: 'hit'},
-            
-            # A,3 (soft 14): Double vs 5-6, otherwise hit
-            14: {2: 'hit', 3: 'hit', 4: 'hit', 5: 'double', 6: 'double', 7: 'hit', 8: 'hit', 9: 'hit', 10: 'hit', 11: 'hit'},
-            
-            # A,4 (soft 15): Double vs 4-6, otherwise hit
-            15: {2: 'hit', 3: 'hit', 4: 'double', 5: 'double', 6: 'double', 7: 'hit', 8: 'hit', 9: 'hit', 10: 'hit', 11: 'hit'},
-            
-            # A,5 (soft 16): Double vs 4-6, otherwise hit
-            16: {2: 'hit', 3: 'hit', 4: 'double', 5: 'double', 6: 'double', 7: 'hit', 8: 'hit', 9: 'hit', 10: 'hit', 11: 'hit'},
-            
-            # A,6 (soft 17): Double vs 3-6, otherwise hit
-            17: {2: 'hit', 3: 'double', 4: 'double', 5: 'double', 6: 'double', 7: 'hit', 8: 'hit', 9: 'hit', 10: 'hit', 11: 'hit'},
-            
-            # A,7 (soft 18): Stand vs 2,7,8; Double vs 3-6; Hit vs 9,10,A
-            18: {2: 'stand', 3: 'double', 4: 'double', 5: 'double', 6: 'double', 7: 'stand', 8: 'stand', 9: 'hit', 10: 'hit', 11: 'hit'},
-            
-            # A,8 (soft 19): Always stand
-            19: {2: 'stand', 3: 'stand', 4: 'stand', 5: 'stand', 6: 'stand', 7: 'stand', 8: 'stand', 9: 'stand', 10: 'stand', 11: 'stand'},
-            
-            # A,9 (soft 20): Always stand
-            20: {2: 'stand', 3: 'stand', 4: 'stand', 5: 'stand', 6: 'stand', 7: 'stand', 8: 'stand', 9: 'stand', 10: 'stand', 11: 'stand'},
-            
-            # A,10 (soft 21): Always stand
-            21: {2: 'stand', 3: 'stand', 4: 'stand', 5: 'stand', 6: 'stand', 7: 'stand', 8: 'stand', 9: 'stand', 10: 'stand', 11: 'stand'},
-        }
-        
-        # Pair splitting strategy
-        self.pair_strategy = {
-            # A,A: Always split
-            11: {2: 'split', 3: 'split', 4: 'split', 5: 'split', 6: 'split', 7: 'split', 8: 'split', 9: 'split', 10: 'split', 11: 'split'},
-            
-            # 10,10: Never split
-            10: {2: 'stand', 3: 'stand', 4: 'stand', 5: 'stand', 6: 'stand', 7: 'stand', 8: 'stand', 9: 'stand', 10: 'stand', 11: 'stand'},
-            
-            # 9,9: Split vs 2-9 except 7, stand vs 7,10,A
-            9: {2: 'split', 3: 'split', 4: 'split', 5: 'split', 6: 'split', 7: 'stand', 8: 'split', 9: 'split', 10: 'stand', 11: 'stand'},
-            
-            # 8,8: Always split
-            8: {2: 'split', 3: 'split', 4: 'split', 5: 'split', 6: 'split', 7: 'split', 8: 'split', 9: 'split', 10: 'split', 11: 'split'},
-            
-            # 7,7: Split vs 2-7, hit vs 8-A
-            7: {2: 'split', 3: 'split', 4: 'split', 5: 'split', 6: 'split', 7: 'split', 8: 'hit', 9: 'hit', 10: 'hit', 11: 'hit'},
-            
-            # 6,6: Split vs 2-6, hit vs 7-A
-            6: {2: 'split', 3: 'split', 4: 'split', 5: 'split', 6: 'split', 7: 'hit', 8: 'hit', 9: 'hit', 10: 'hit', 11: 'hit'},
-            
-            # 5,5: Never split (treat as 10)
-            5: {2: 'double', 3: 'double', 4: 'double', 5: 'double', 6: 'double', 7: 'double', 8: 'double', 9: 'double', 10: 'hit', 11: 'hit'},
-            
-            # 4,4: Hit vs all (or split vs 5-6 in some variations)
-            4: {2: 'hit', 3: 'hit', 4: 'hit', 5: 'hit', 6: 'hit', 7: 'hit', 8: 'hit', 9: 'hit', 10: 'hit', 11: 'hit'},
-            
-            # 3,3: Split vs 2-7, hit vs 8-A
-            3: {2: 'split', 3: 'split', 4: 'split', 5: 'split', 6: 'split', 7: 'split', 8: 'hit', 9: 'hit', 10: 'hit', 11: 'hit'},
-            
-            # 2,2: Split vs 2-7, hit vs 8-A
-            2: {2: 'split', 3: 'split', 4: 'split', 5: 'split', 6: 'split', 7: 'split', 8: 'hit', 9: 'hit', 10: 'hit', 11: 'hit'},
-        }
+    def __init__(self, rules: Optional[RuleSet] = None):
+        # Tables generated by the EV solver (S17, 6 decks, DAS by default)
+        tables = get_strategy_tables(rules)
+        
+        # Hard totals, soft totals (A,2 = 13, A,3 = 14, etc.) and pair splitting
+        self.hard_strategy = _int_keyed(tables['hard'])
+        self.soft_strategy = _int_keyed(tables['soft'])
+        self.pair_strategy = _int_keyed(tables['pairs'])
+        
+        # Best play when doubling is not allowed (more than two cards)
+        self.hard_no_double = _int_keyed(tables['no_double']['hard'])
+        self.soft_no_double = _int_keyed(tables['no_double']['soft'])
+        
+        # Late surrender plays by hard total
+        self.surrender_strategy = _int_keyed(
+            {total: row for total, row in tables['surrender'].items() if total.isdigit()}
+        )
     
     def get_hard_action(self, player_total: int, dealer_upcard: int, can_double: bool = True) -> str:
         """Get action for hard totals"""
@@ -111,9 +32,9 @@ class BasicStrategy:
         
         action = self.hard_strategy[player_total].get(dealer_upcard, 'hit')
         
-        # If can't double, convert double to hit
+        # If can't double, take the best non-doubling play
         if action == 'double' and not can_double:
-            return 'hit'
+            return self.hard_no_double[player_total][dealer_upcard]
         
         return action
     
@@ -129,12 +50,9 @@ class BasicStrategy:
         
         action = self.soft_strategy[player_total].get(dealer_upcard, 'hit')
         
-        # If can't double, convert double to hit (except soft 18 vs 2,7,8 which becomes stand)
+        # If can't double, take the best non-doubling play (e.g. stand on soft 18)
         if action == 'double' and not can_double:
-            if player_total == 18 and dealer_upcard in [2, 7, 8]:
-                return 'stand'
-            else:
-                return 'hit'
+            return self.soft_no_double[player_total][dealer_upcard]
         
         return action
     
@@ -253,3 +171,9 @@ class BasicStrategy:
                 return f"Double on {player_total}: Favorable situation for extra bet"
         
         return f"Recommended action: {action}"
+
+
+def _int_keyed(table: Dict) -> Dict[int, Dict[int, str]]:
+    """Convert a generated JSON table to {player_total: {dealer_upcard: action}}"""
+    return {int(total): {int(upcard): action for upcard, action in row.items()}
+            for total, row in table.items()}
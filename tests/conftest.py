@@ -0,0 +1,8 @@
+import os
+import sys
+
+# Modules live at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Keep the app's session store in memory instead of a shared SQLite file
+os.environ.setdefault('SESSION_DB', 'memory')
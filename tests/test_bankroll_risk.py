@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from bankroll_risk import BetRamp, RiskSimulator, diffusion_risk_of_ruin, outcome_distributions
+
+
+def _flat_game(distribution, bet=1.0):
+    return RiskSimulator(BetRamp({0: bet}), {0: 1.0}, {0: distribution})
+
+
+def test_ramp_bets_by_step_and_minimum_below_it():
+    ramp = BetRamp({1: 20, 3: 80}, min_bet=10)
+    assert ramp.bets([-2, 1, 2.5, 3, 9]).tolist() == [10, 20, 20, 80, 80]
+
+
+def test_certain_losses_ruin_every_path_on_schedule():
+    results = _flat_game({-1: 1.0}, bet=10).simulate(100, 50, num_paths=200, seed=1)
+    assert results['risk_of_ruin'] == 1.0
+    assert results['ruin_hand_quantiles']['p50'] == 10
+    assert results['final_bankroll_mean'] == 0
+
+
+def test_simulated_ruin_matches_gamblers_ruin():
+    # Win 55%, lose 45%: ruin from 10 units is (0.45 / 0.55) ** 10
+    game = _flat_game({1: 0.55, -1: 0.45})
+    results = game.simulate(10, 1000, num_paths=10000, seed=2)
+    assert results['risk_of_ruin'] == pytest.approx((0.45 / 0.55) ** 10, abs=4 * results['risk_of_ruin_std_error'])
+    assert game.theoretical_risk_of_ruin(10) == pytest.approx((0.45 / 0.55) ** 10, rel=0.05)
+
+
+def test_samples_follow_the_result_distribution():
+    game = _flat_game({1.5: 0.05, 1: 0.4, 0: 0.1, -1: 0.45})
+    samples = game.sample((200000,), np.random.default_rng(3))
+    for result, probability in ((1.5, 0.05), (1, 0.4), (0, 0.1), (-1, 0.45)):
+        assert np.mean(samples == result) == pytest.approx(probability, abs=0.005)
+
+
+def test_losing_game_is_always_ruined_in_the_long_run():
+    assert diffusion_risk_of_ruin(-0.01, 1.3, 1000) == 1.0
+    assert diffusion_risk_of_ruin(0.01, 0.0, 1000) == 0.0
+
+
+def test_outcome_distributions_bucket_hands_by_count():
+    frequencies, distributions = outcome_distributions(np.array([-0.5, 0.2, 0.7, 1.5]), np.array([-1, 1, 1, 0]))
+    assert frequencies == {-1.0: 0.25, 0.0: 0.5, 1.0: 0.25}
+    assert distributions[0.0] == {1.0: 1.0}
@@ -0,0 +1,57 @@
+import math
+
+import numpy as np
+import pytest
+
+from batch_engine import BatchSimulator
+from monte_carlo import MonteCarloSimulator
+
+
+def _run(engine, num_hands, seed, strategy_type='Basic Strategy Only'):
+    return MonteCarloSimulator().run_simulation(num_hands=num_hands, engine=engine, seed=seed,
+                                                strategy_type=strategy_type, use_cache=False)
+
+
+@pytest.mark.parametrize('strategy_type', ['Basic Strategy Only', 'Card Counting', 'ML Optimized'])
+def test_batch_and_scalar_engines_agree_on_the_house_edge(strategy_type):
+    scalar = _run('scalar', 40000, 11, strategy_type)['statistics']
+    batch = _run('batch', 400000, 11, strategy_type)['statistics']
+
+    spread = math.hypot(scalar['house_edge_std_error'], batch['house_edge_std_error'])
+    assert abs(scalar['house_edge'] - batch['house_edge']) < 4 * spread
+
+
+def test_batch_house_edge_matches_the_simulator_rules():
+    # The simulator's rules (six decks, H17, 3:2, DAS, late surrender) give the
+    # house about half a percent; 400k hands pin it to about 0.2%
+    batch = _run('batch', 400000, 11)['statistics']
+    assert -0.002 < batch['house_edge'] < 0.012
+
+
+def test_batch_and_scalar_engines_agree_on_outcome_rates():
+    scalar = _run('scalar', 40000, seed=5)
+    batch = _run('batch', 400000, seed=5)
+    for name in ('hands_won', 'hands_lost', 'hands_pushed'):
+        assert abs(scalar[name] / 40000 - batch[name] / 400000) < 0.015
+
+
+def test_batch_runs_repeat_under_a_fixed_seed():
+    first = _run('batch', 50000, seed=21)
+    second = _run('batch', 50000, seed=21)
+    assert first['net_result'] == second['net_result']
+    assert first['cumulative_winnings'] == second['cumulative_winnings']
+    assert _run('batch', 50000, seed=22)['net_result'] != first['net_result']
+
+
+def test_slabs_come_from_whole_shoes():
+    engine = BatchSimulator()
+    slabs, cards_seen = engine.deal_slabs(2000, 6, 0.75, np.random.default_rng(3))
+    assert slabs.shape == (2000, engine.cards_per_hand)
+    assert slabs.min() >= 2 and slabs.max() <= 11
+
+    # Every shoe starts at zero cards seen and never deals more aces or tens than it holds
+    shoe_starts = np.flatnonzero(cards_seen == 0)
+    assert shoe_starts[0] == 0
+    for shoe in np.split(slabs, shoe_starts[1:]):
+        assert (shoe == 11).sum() <= 24
+        assert (shoe == 10).sum() <= 96
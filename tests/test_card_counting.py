@@ -0,0 +1,39 @@
+import random
+
+import pytest
+
+from card_counting import CardCounter, CountTracker
+from game_engine import Card
+from shoe import Shoe
+
+
+@pytest.fixture
+def counter():
+    return CardCounter()
+
+
+def test_red_7_counts_only_red_sevens_from_cards(counter):
+    counter.current_system = 'Red 7'
+    red, black = Card('Hearts', '7'), Card('Spades', '7')
+    assert counter.get_count_info([red, black])['running_count'] == 1
+    assert counter.count_card(black, 'Red 7') == 0
+    assert counter.count_card(red, 'Red 7') == 1
+
+
+def test_red_7_counts_every_seven_without_suits(counter):
+    counter.current_system = 'Red 7'
+    assert counter.get_count_info([7, 7])['running_count'] == 2
+
+
+@pytest.mark.parametrize('system', ['Hi-Lo', 'Hi-Opt II', 'Omega II', 'Red 7'])
+def test_recounting_dealt_cards_matches_the_tracker(counter, system):
+    shoe = Shoe(2, rng=random.Random(4))
+    tracker = CountTracker(2)
+    shoe.attach(tracker)
+    dealt = [Card.from_id(shoe.deal()) for _ in range(60)]
+
+    counter.current_system = system
+    recounted = counter.get_count_info(dealt, num_decks=2)
+    tracked = counter.get_count_info(tracker=tracker)
+    assert recounted['running_count'] == tracked['running_count']
+    assert recounted['true_count'] == tracked['true_count']
@@ -0,0 +1,44 @@
+import copy
+import pickle
+
+import pytest
+
+from game_engine import Card, Deck
+from simple_complete_app import SimpleCard, SimpleDeck
+
+
+@pytest.mark.parametrize('card_class', [Card, SimpleCard])
+def test_every_way_of_getting_a_card_returns_the_shared_instance(card_class):
+    card = card_class.from_id(51)
+    suit = card_class.SUITS[3]
+    assert card_class(suit, 'A') is card
+    assert pickle.loads(pickle.dumps(card)) is card
+    assert copy.deepcopy(card) is card
+    assert len(set(map(id, card_class.deck()))) == 52
+
+
+def test_cards_are_immutable_and_slotted():
+    card = Card('Hearts', '7')
+    with pytest.raises(AttributeError):
+        card.rank = '8'
+    with pytest.raises(AttributeError):
+        del card.value
+    assert not hasattr(card, '__dict__')
+
+
+def test_cards_carry_their_value_and_count_tags():
+    assert Card('Spades', 'K').get_value() == 10
+    assert Card('Spades', 'A').get_value() == 11
+    assert Card('Hearts', '7').get_count_value('Red 7') == 1
+    assert Card('Clubs', '7').get_count_value('Red 7') == 0
+    assert SimpleCard('hearts', '5').to_dict() == {'suit': 'hearts', 'rank': '5'}
+
+
+def test_unknown_cards_are_rejected():
+    with pytest.raises(ValueError):
+        Card('Hearts', '1')
+
+
+def test_decks_deal_shared_instances():
+    assert Deck(1).deal_card() in Card.deck()
+    assert SimpleDeck(1).deal_card() in SimpleCard.deck()
@@ -0,0 +1,19 @@
+from monte_carlo import MonteCarloSimulator
+
+
+def _compare(strategies, num_hands, **options):
+    return MonteCarloSimulator().compare_strategies(strategies, num_hands=num_hands, seed=3, **options)
+
+
+def test_paired_differences_are_more_precise_than_independent_runs():
+    difference = _compare(['Basic Strategy Only', 'ML Optimized'], 20000)['differences']['ML Optimized']
+    assert 0 < difference['std_error'] < difference['independent_std_error']
+    assert difference['variance_reduction'] > 1
+
+
+def test_comparison_without_hands_reports_zero_error_bars():
+    results = _compare(['Basic Strategy Only', 'Card Counting'], 0, target_std_error=0.01)
+    difference = results['differences']['Card Counting']
+    assert results['hands'] == 0
+    assert difference['std_error'] == 0.0
+    assert difference['independent_std_error'] == 0.0
@@ -0,0 +1,33 @@
+import pytest
+
+from dealer_outcomes import DealerOutcomeTables, player_win_probability, stand_outcome
+
+
+@pytest.fixture
+def tables():
+    return DealerOutcomeTables(cache_path=None)
+
+
+def test_dealer_busts_about_42_percent_of_the_time_under_a_6(tables):
+    assert tables.get_distribution(6)['bust'] == pytest.approx(0.42, abs=0.005)
+    assert tables.get_distribution(6, num_decks=6)['bust'] == pytest.approx(0.42, abs=0.005)
+    # Hitting soft 17 gives the dealer more chances to bust
+    assert tables.get_distribution(6, hit_soft_17=True)['bust'] > tables.get_distribution(6)['bust']
+
+
+@pytest.mark.parametrize('upcard', range(2, 12))
+def test_every_distribution_sums_to_one(tables, upcard):
+    assert sum(tables.get_distribution(upcard, num_decks=6).values()) == pytest.approx(1.0)
+    assert tables.get_distribution(upcard, no_blackjack=True)['blackjack'] == 0.0
+
+
+def test_standing_win_probability_matches_the_dealer_table(tables):
+    distribution = tables.get_distribution(10, no_blackjack=True)
+    assert player_win_probability(16, 10, 'stand') == pytest.approx(stand_outcome(16, distribution)['win'])
+
+
+def test_best_play_wins_more_often_than_a_poor_one():
+    assert player_win_probability(20, 6, 'stand') > player_win_probability(20, 6, 'hit')
+    assert player_win_probability(11, 6, 'hit') > player_win_probability(11, 6, 'stand')
+    # A soft 18 cannot bust by hitting; counted as hard, a hit often would
+    assert player_win_probability(18, 10, 'hit', is_soft=True) > player_win_probability(18, 10, 'hit')
@@ -0,0 +1,141 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from decision_table import (ACTION_CODES, DOUBLE, HARD, HIT, SPLIT, STAND, SURRENDER,
+                            DecisionTable, DeviationOverlay)
+from strategy_tables import BasicStrategy
+
+UPCARDS = range(2, 12)
+
+
+@pytest.fixture(scope='module')
+def basic():
+    return BasicStrategy()
+
+
+@pytest.fixture(scope='module')
+def table(basic):
+    return DecisionTable(basic)
+
+
+def test_hard_and_soft_cells_match_basic_strategy(basic, table):
+    for upcard, can_double in itertools.product(UPCARDS, (False, True)):
+        for total in range(4, 22):
+            expected = ACTION_CODES[basic.get_hard_action(total, upcard, can_double)]
+            assert table.decide_one(total, False, upcard, can_double) == expected
+        for total in range(13, 22):
+            expected = ACTION_CODES[basic.get_soft_action(total, upcard, can_double)]
+            assert table.decide_one(total, True, upcard, can_double) == expected
+
+
+def test_pairs_split_per_chart_and_otherwise_play_their_total(basic, table):
+    for pair_value, upcard in itertools.product(range(2, 12), UPCARDS):
+        action = table.decide_one(2 * pair_value, pair_value == 11, upcard, pair_value=pair_value)
+        if basic.get_pair_action(pair_value, upcard) == 'split':
+            assert action == SPLIT
+        elif pair_value == 11:
+            assert action == ACTION_CODES[basic.get_soft_action(12, upcard)]
+        else:
+            assert action == ACTION_CODES[basic.get_hard_action(2 * pair_value, upcard)]
+
+
+def test_surrender_only_for_allowed_hard_hands(basic, table):
+    for total, row in basic.surrender_strategy.items():
+        for upcard, action in row.items():
+            expected = SURRENDER if action == 'surrender' else table.decide_one(total, False, upcard)
+            assert table.decide_one(total, False, upcard, can_surrender=True) == expected
+    assert table.decide_one(16, False, 10, can_surrender=False) != SURRENDER
+    assert table.decide_one(16, True, 10, can_surrender=True) != SURRENDER
+    assert table.decide_one(16, False, 10, pair_value=8, can_surrender=True) == SPLIT
+
+
+def test_busted_totals_stand(table):
+    assert table.decide_one(26, False, 10) == STAND
+    assert table.decide_one(40, False, 10) == STAND
+
+
+def _random_hands(n, seed=0):
+    rng = np.random.default_rng(seed)
+    pair_value = np.where(rng.random(n) < 0.2, rng.integers(2, 12, n), 0)
+    soft = (pair_value == 0) & (rng.random(n) < 0.3)
+    total = np.where(soft, rng.integers(13, 22, n), rng.integers(4, 22, n))
+    total = np.where(pair_value > 0, 2 * pair_value, total)
+    soft = soft | (pair_value == 11)
+    return {
+        'total': total,
+        'soft': soft,
+        'upcard': rng.integers(2, 12, n),
+        'can_double': rng.random(n) < 0.5,
+        'pair_value': pair_value,
+        'true_count': rng.uniform(-6, 6, n),
+        'can_surrender': rng.random(n) < 0.5
+    }
+
+
+def _overlay():
+    return (DeviationOverlay()
+            .add_plays([(16, 10, 0, 'stand'), (10, 10, 4, 'double'), (12, 3, 2, 'stand')])
+            .add_plays([(12, 4, 0, 'hit'), (13, 2, -1, 'hit')], above=False)
+            .add_plays([(16, 9, 5, 'stand'), (11, 11, 1, 'double')], strict=True))
+
+
+@pytest.mark.parametrize('overlay', [None, 'counting', 'custom'])
+def test_batch_decisions_match_single_decisions(table, overlay):
+    if overlay == 'counting':
+        from monte_carlo import MonteCarloSimulator
+        table = MonteCarloSimulator().counting_table
+    elif overlay == 'custom':
+        table = table.with_overlay(_overlay())
+
+    hands = _random_hands(4000)
+    batch = table.decide(hands['total'], hands['soft'], hands['upcard'], hands['can_double'],
+                         hands['pair_value'], hands['true_count'], hands['can_surrender'])
+    single = [table.decide_one(int(total), bool(soft), int(upcard), bool(can_double),
+                               int(pair_value), float(true_count), bool(can_surrender))
+              for total, soft, upcard, can_double, pair_value, true_count, can_surrender
+              in zip(*hands.values())]
+    assert batch.tolist() == single
+
+
+def test_overlay_thresholds_and_layers(table):
+    counted = table.with_overlay(_overlay())
+    # At or above the count
+    assert counted.decide_one(16, False, 10, true_count=0) == STAND
+    assert counted.decide_one(16, False, 10, true_count=-0.5) == table.decide_one(16, False, 10)
+    # At or below the count
+    assert counted.decide_one(12, False, 4, true_count=0) == HIT
+    assert counted.decide_one(12, False, 4, true_count=0.5) == table.decide_one(12, False, 4)
+    # Strictly beyond the count
+    assert counted.decide_one(16, False, 9, true_count=5) == table.decide_one(16, False, 9)
+    assert counted.decide_one(16, False, 9, true_count=5.01) == STAND
+    # The first play listed for a cell wins within a layer
+    first_wins = DeviationOverlay().add_plays([(15, 10, 0, 'stand'), (15, 10, 0, 'surrender')])
+    assert table.with_overlay(first_wins).decide_one(15, False, 10, true_count=1) == STAND
+    # Later layers override earlier ones
+    layered = DeviationOverlay().add_plays([(15, 10, 0, 'stand')]).add_plays([(15, 10, 2, 'hit')])
+    assert table.with_overlay(layered).decide_one(15, False, 10, true_count=1) == STAND
+    assert table.with_overlay(layered).decide_one(15, False, 10, true_count=3) == HIT
+
+
+def test_overlay_needs_a_true_count(table):
+    counted = table.with_overlay(_overlay())
+    assert counted.decide_one(16, False, 10) == table.decide_one(16, False, 10)
+    assert counted.decide(np.array([16]), np.array([False]), np.array([10])).tolist() == \
+        [table.decide_one(16, False, 10)]
+
+
+def test_overlay_double_on_soft_hand_without_double_falls_back_to_soft_play(table):
+    soft_double = table.with_overlay(DeviationOverlay().add_plays([(18, 2, 0, 'double')]))
+    assert soft_double.decide_one(18, True, 2, True, true_count=1) == DOUBLE
+    assert soft_double.decide_one(18, True, 2, False, true_count=1) == table.decide_one(18, True, 2, False)
+
+
+def test_with_first_action_leaves_the_original_alone(table):
+    before = table.actions.copy()
+    forced = table.with_first_action(HARD, 16, 10, SURRENDER)
+    assert forced.decide_one(16, False, 10, True, can_surrender=False) == SURRENDER
+    assert forced.decide_one(16, False, 10, False) == table.decide_one(16, False, 10, False)
+    assert np.array_equal(table.actions, before)
+    assert table.decide_one(16, False, 10, True) != SURRENDER
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from card_counting import CardCounter
+from deviation_indices import ACTIONS, MAX_BUCKET, MIN_BUCKET, _worker_engine, find_index, simulate_chunk
+from ev_solver import RuleSet
+
+
+@pytest.mark.parametrize('rules', [
+    RuleSet(double_after_split=False),
+    RuleSet(hit_soft_17=True, surrender=False)
+])
+def test_worker_engine_plays_the_generator_rules(rules):
+    engine, _ = _worker_engine(rules)
+    assert engine.hit_soft_17 == rules.hit_soft_17
+    assert engine.double_after_split == rules.double_after_split
+    assert engine.surrender == rules.surrender
+
+
+def test_find_index_reads_the_crossover_of_a_rising_gain():
+    counts = np.full(MAX_BUCKET - MIN_BUCKET + 1, 1000.0)
+    true_counts = np.arange(MIN_BUCKET, MAX_BUCKET + 1) + 0.5
+    found = find_index(counts, 0.01 * (true_counts - 2))
+    assert found['index'] == 2
+    assert found['direction'] == 'above'
+
+
+def test_find_index_ignores_a_flat_gain():
+    counts = np.full(MAX_BUCKET - MIN_BUCKET + 1, 1000.0)
+    assert find_index(counts, np.full(len(counts), -0.05)) is None
+
+
+def test_hi_lo_index_for_standing_16_against_10_is_near_zero():
+    counts, sums = simulate_chunk(RuleSet(), [('hard', 16, 10, ['hit', 'stand'])], 120000, 0.75,
+                                  np.random.SeedSequence(2))
+    system = CardCounter().system_names.index('Hi-Lo')
+    means = sums[0, system] / np.maximum(counts[0, system], 1)[:, None]
+    found = find_index(counts[0, system], means[:, ACTIONS.index('stand')] - means[:, ACTIONS.index('hit')])
+    assert found['direction'] == 'above'
+    assert -1 <= found['index'] <= 1
@@ -0,0 +1,115 @@
+import numpy as np
+import pytest
+
+from batch_engine import _best_totals
+from ev_solver import RuleSet, get_strategy_tables
+from simple_complete_app import SimpleCard, SimpleGameSession, SimpleHand, app
+
+
+@pytest.fixture
+def client():
+    return app.test_client()
+
+
+def _new_session(client, bankroll=1000):
+    return client.post('/api/new_session', json={'starting_bankroll': bankroll}).get_json()['session_id']
+
+
+def _deal(client, session_id):
+    """Deal until a hand needs decisions (a dealt blackjack settles at once)"""
+    while True:
+        state = client.post('/api/place_bet', json={'session_id': session_id,
+                                                    'bet_amount': 10}).get_json()['game_state']
+        if state['game_phase'] == 'playing':
+            return state
+
+
+def _hand(*ranks):
+    hand = SimpleHand()
+    for rank in ranks:
+        hand.add_card(SimpleCard('spades', rank))
+    return hand
+
+
+def test_multi_ace_hand_is_played_as_soft():
+    session = SimpleGameSession()
+    session.player_hands = [_hand('A', 'A', '5')]
+    session.player_hands[0].bet = 10
+    session.dealer_hand = _hand('4', '9')
+    session.game_phase = 'playing'
+
+    # Soft 17 hits against a 4 once it can no longer double; hard 17 would stand
+    assert session.table_strategy_action(get_strategy_tables(RuleSet())) == 'hit'
+    _, soft = _best_totals(np.array([7]), np.array([2]))
+    assert soft.tolist() == [session.player_hands[0].is_soft()]
+
+
+def test_drill_balances_the_bankroll(client):
+    session_id = _new_session(client, bankroll=100000)
+    response = client.post('/api/drill', json={'session_id': session_id, 'hands': 50, 'bet_amount': 10})
+    assert response.status_code == 200
+    data = response.get_json()
+
+    drill = data['drill']
+    assert drill['hands'] == len(data['rounds']) == 50
+    assert drill['net'] == sum(round_['net'] for round_ in data['rounds'])
+    assert data['game_state']['current_bankroll'] == 100000 + drill['net']
+    assert drill['hands_won'] + drill['hands_lost'] + drill['hands_pushed'] >= 50
+    assert data['game_state']['game_phase'] == 'complete'
+
+
+def test_drill_stops_when_the_bankroll_runs_out(client):
+    session_id = _new_session(client, bankroll=30)
+    data = client.post('/api/drill', json={'session_id': session_id, 'hands': 500,
+                                           'bet_amount': 10}).get_json()
+    # A lucky run may last all 500 hands; otherwise it stops once a bet no longer fits
+    bankroll = data['game_state']['current_bankroll']
+    assert data['drill']['hands'] == 500 or bankroll < 10
+    assert bankroll >= 0
+
+
+@pytest.mark.parametrize('bet_amount', [-10, 0, 'ten', None, True, float('nan')])
+def test_drill_rejects_bad_bets(client, bet_amount):
+    session_id = _new_session(client)
+    response = client.post('/api/drill', json={'session_id': session_id, 'hands': 5,
+                                               'bet_amount': bet_amount})
+    assert response.status_code == 400
+    state = client.post('/api/player_action', json={'session_id': session_id,
+                                                    'action': 'get_hint'}).get_json()
+    assert state['game_state']['current_bankroll'] == 1000
+
+
+@pytest.mark.parametrize('hands', [0, 501, 'many', True])
+def test_drill_rejects_bad_hand_counts(client, hands):
+    session_id = _new_session(client)
+    response = client.post('/api/drill', json={'session_id': session_id, 'hands': hands})
+    assert response.status_code == 400
+
+
+def test_place_bet_rejects_negative_bets(client):
+    session_id = _new_session(client)
+    response = client.post('/api/place_bet', json={'session_id': session_id, 'bet_amount': -50})
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize('starting_bankroll', [-100, 0, 'lots', None, True, float('inf')])
+def test_new_session_rejects_bad_bankrolls(client, starting_bankroll):
+    response = client.post('/api/new_session', json={'starting_bankroll': starting_bankroll})
+    assert response.status_code == 400
+
+
+def test_auto_play_finishes_the_hand(client):
+    session_id = _new_session(client)
+    _deal(client, session_id)
+    data = client.post('/api/player_actions', json={'session_id': session_id,
+                                                    'auto_play': True}).get_json()
+    assert data['game_state']['game_phase'] == 'complete'
+
+
+def test_batched_actions_stop_at_the_first_rejected_action(client):
+    session_id = _new_session(client)
+    _deal(client, session_id)
+    data = client.post('/api/player_actions', json={'session_id': session_id,
+                                                    'actions': ['stand', 'hit']}).get_json()
+    assert data['applied'] == ['stand']
+    assert data['rejected'] == {'index': 1, 'action': 'hit'}
@@ -0,0 +1,68 @@
+import pytest
+
+from ev_solver import RuleSet, StrategySolver
+
+# Published 6-deck S17 DAS late-surrender basic strategy, dealer 2 through A
+# (H hit, S stand, D double, P split; surrender listed separately)
+HARD_CHART = {
+    8: 'HHHHHHHHHH',
+    9: 'HDDDDHHHHH',
+    10: 'DDDDDDDDHH',
+    11: 'DDDDDDDDDH',
+    12: 'HHSSSHHHHH',
+    13: 'SSSSSHHHHH',
+    14: 'SSSSSHHHHH',
+    15: 'SSSSSHHHHH',
+    16: 'SSSSSHHHHH',
+    17: 'SSSSSSSSSS'
+}
+SOFT_CHART = {
+    13: 'HHHDDHHHHH',
+    14: 'HHHDDHHHHH',
+    15: 'HHDDDHHHHH',
+    16: 'HHDDDHHHHH',
+    17: 'HDDDDHHHHH',
+    18: 'SDDDDSSHHH',
+    19: 'SSSSSSSSSS',
+    20: 'SSSSSSSSSS'
+}
+PAIR_CHART = {
+    2: 'PPPPPPHHHH',
+    3: 'PPPPPPHHHH',
+    4: 'HHHPPHHHHH',
+    5: 'DDDDDDDDHH',
+    6: 'PPPPPHHHHH',
+    7: 'PPPPPPHHHH',
+    8: 'PPPPPPPPPP',
+    9: 'PPPPPSPPSS',
+    10: 'SSSSSSSSSS',
+    11: 'PPPPPPPPPP'
+}
+SURRENDER = {'15': {'10'}, '16': {'9', '10', '11'}}
+
+LETTERS = {'hit': 'H', 'stand': 'S', 'double': 'D', 'split': 'P'}
+
+
+@pytest.fixture(scope='module')
+def tables():
+    return StrategySolver(RuleSet()).solve()
+
+
+def _row(table, total):
+    return ''.join(LETTERS[table[str(total)][str(upcard)]] for upcard in range(2, 12))
+
+
+@pytest.mark.parametrize('hand_class, chart', [('hard', HARD_CHART), ('soft', SOFT_CHART), ('pairs', PAIR_CHART)])
+def test_solved_tables_match_the_published_chart(tables, hand_class, chart):
+    assert {total: _row(tables[hand_class], total) for total in chart} == chart
+
+
+def test_solved_surrender_matches_the_published_chart(tables):
+    assert {total: set(upcards) for total, upcards in tables['surrender'].items()} == SURRENDER
+
+
+def test_hitting_soft_17_changes_the_published_plays():
+    h17 = StrategySolver(RuleSet(hit_soft_17=True)).solve()
+    assert h17['hard']['11']['11'] == 'double'
+    assert h17['soft']['18']['2'] == 'double'
+    assert h17['soft']['19']['6'] == 'double'
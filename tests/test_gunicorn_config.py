@@ -0,0 +1,23 @@
+import os
+import runpy
+from types import SimpleNamespace
+
+import pytest
+
+CONFIG = runpy.run_path(os.path.join(os.path.dirname(__file__), '..', 'gunicorn.conf.py'))
+
+
+def _server(workers):
+    return SimpleNamespace(cfg=SimpleNamespace(workers=workers))
+
+
+def test_config_runs_one_threaded_worker():
+    assert CONFIG['workers'] == 1
+    assert CONFIG['worker_class'] == 'gthread'
+    assert CONFIG['threads'] > 1
+
+
+def test_more_than_one_worker_is_refused():
+    CONFIG['on_starting'](_server(1))
+    with pytest.raises(RuntimeError):
+        CONFIG['on_starting'](_server(4))
@@ -0,0 +1,38 @@
+import random
+
+import pytest
+
+from game_engine import Card, Hand
+from simple_complete_app import SimpleCard, SimpleHand
+
+
+def _recount(cards):
+    """Best total and softness computed from scratch"""
+    total = sum(card.value for card in cards)
+    aces = sum(card.value == 11 for card in cards)
+    while total > 21 and aces:
+        total -= 10
+        aces -= 1
+    return total, aces > 0
+
+
+@pytest.mark.parametrize('hand_class, card_class', [(Hand, Card), (SimpleHand, SimpleCard)])
+def test_running_totals_match_a_recount(hand_class, card_class):
+    rng = random.Random(6)
+    for _ in range(500):
+        hand = hand_class()
+        for _ in range(rng.randint(1, 7)):
+            hand.add_card(card_class.from_id(rng.randrange(52)))
+            assert (hand.get_value(), hand.is_soft()) == _recount(hand.cards)
+        while len(hand.cards) > 1:
+            hand.pop_card()
+            assert (hand.get_value(), hand.is_soft()) == _recount(hand.cards)
+
+
+def test_popping_a_split_card_restores_the_one_card_total():
+    hand = Hand()
+    hand.add_card(Card('Hearts', 'A'))
+    hand.add_card(Card('Spades', 'A'))
+    assert hand.get_value() == 12 and hand.is_soft()
+    assert hand.pop_card() is Card('Spades', 'A')
+    assert hand.get_value() == 11 and hand.is_soft()
@@ -0,0 +1,81 @@
+import time
+
+import pytest
+
+import simple_complete_app
+from simple_complete_app import app, simulation_jobs
+from simulation_jobs import JobCancelled, SimulationJob
+
+
+@pytest.fixture
+def client():
+    return app.test_client()
+
+
+def _finished_job(client, num_hands=2000):
+    job_id = client.post('/api/monte_carlo/jobs', json={'num_hands': num_hands}).get_json()['job_id']
+    job = simulation_jobs.get(job_id)
+    deadline = time.time() + 30
+    while job.to_dict()['status'] != 'completed' and time.time() < deadline:
+        time.sleep(0.01)
+    return job
+
+
+def _events(body):
+    return [block for block in body.split('\n\n') if block]
+
+
+def test_stream_ends_with_done_event_carrying_the_job_version(client):
+    job = _finished_job(client)
+    body = client.get(f'/api/monte_carlo/jobs/{job.job_id}/stream').get_data(as_text=True)
+    events = _events(body)
+    assert events[0].startswith('retry: ')
+    assert events[-1].startswith(f'id: {job.version}\nevent: done\n')
+
+
+def test_stream_closes_after_its_time_limit(client, monkeypatch):
+    job = _finished_job(client)
+    monkeypatch.setattr(simple_complete_app, 'MONTE_CARLO_STREAM_MAX_SECONDS', 0)
+    body = client.get(f'/api/monte_carlo/jobs/{job.job_id}/stream',
+                      headers={'Last-Event-ID': str(job.version)}).get_data(as_text=True)
+    assert [event.split(':')[0] for event in _events(body)] == ['retry']
+
+
+def test_reconnect_resumes_after_last_event_id(client, monkeypatch):
+    job = _finished_job(client)
+    monkeypatch.setattr(simple_complete_app, 'MONTE_CARLO_STREAM_MAX_SECONDS', 0.2)
+    resumed = client.get(f'/api/monte_carlo/jobs/{job.job_id}/stream',
+                         headers={'Last-Event-ID': str(job.version)}).get_data(as_text=True)
+    assert 'event: done' not in resumed
+
+    fresh = client.get(f'/api/monte_carlo/jobs/{job.job_id}/stream',
+                       headers={'Last-Event-ID': 'bogus'}).get_data(as_text=True)
+    assert 'event: done' in fresh
+
+
+def test_cancelled_job_stops_before_the_risk_paths_finish(monkeypatch):
+    chunks = []
+    simulate = simple_complete_app.RiskSimulator.simulate
+
+    def counting_simulate(self, *args, on_chunk=None, **kwargs):
+        def checked():
+            chunks.append(1)
+            on_chunk()
+        return simulate(self, *args, on_chunk=checked, **kwargs)
+
+    monkeypatch.setattr(simple_complete_app.RiskSimulator, 'simulate', counting_simulate)
+    job = SimulationJob({})
+    job.cancel()
+    with pytest.raises(JobCancelled):
+        simple_complete_app.run_monte_carlo({'num_hands': 50000}, job)
+    assert chunks == [1]
+
+
+def test_job_can_be_cancelled_over_http(client):
+    job_id = client.post('/api/monte_carlo/jobs', json={'num_hands': 5000000}).get_json()['job_id']
+    assert client.post(f'/api/monte_carlo/jobs/{job_id}/cancel').status_code == 200
+    job = simulation_jobs.get(job_id)
+    deadline = time.time() + 30
+    while job.to_dict()['status'] not in ('cancelled', 'completed') and time.time() < deadline:
+        time.sleep(0.01)
+    assert job.to_dict()['status'] == 'cancelled'
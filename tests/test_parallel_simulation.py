@@ -0,0 +1,19 @@
+import pytest
+
+from monte_carlo import MonteCarloSimulator
+
+
+def _parallel(backend, max_workers, seed=9):
+    return MonteCarloSimulator().run_parallel_simulation(num_simulations=4, hands_per_sim=2000, engine='batch',
+                                                         seed=seed, backend=backend, max_workers=max_workers)
+
+
+@pytest.mark.parametrize('backend', ['process', 'thread'])
+def test_seeded_parallel_run_does_not_depend_on_the_worker_count(backend):
+    assert _parallel(backend, 1) == _parallel(backend, 3)
+
+
+def test_parallel_simulations_play_different_shoes():
+    results = _parallel('thread', 2)
+    assert results['std_house_edge'] > 0
+    assert results != _parallel('thread', 2, seed=10)
@@ -0,0 +1,24 @@
+import pytest
+
+from monte_carlo import MonteCarloSimulator
+
+
+def _run(engine, num_hands, **targets):
+    return MonteCarloSimulator().run_simulation(num_hands=num_hands, engine=engine, seed=1, use_cache=False,
+                                                check_interval=5000, **targets)['precision']
+
+
+@pytest.mark.parametrize('engine', ['scalar', 'batch'])
+def test_run_stops_once_the_target_error_is_met(engine):
+    precision = _run(engine, 200000, target_std_error=0.01)
+    assert precision['converged']
+    assert precision['std_error'] <= 0.01
+    assert precision['hands_played'] < 200000
+    assert precision['hands_played'] % 5000 == 0
+
+
+def test_unreachable_target_plays_the_whole_budget():
+    precision = _run('batch', 20000, target_ci_width=0.0001)
+    assert not precision['converged']
+    assert precision['hands_played'] == 20000
+    assert precision['ci_width'] == pytest.approx(2 * 1.96 * precision['std_error'])
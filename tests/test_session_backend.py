@@ -0,0 +1,94 @@
+import multiprocessing
+
+import pytest
+
+from session_store import SessionConflict, SessionStore, SQLiteSessionBackend
+from simple_complete_app import SimpleGameSession
+
+
+def _store(path, **options):
+    return SessionStore(backend=SQLiteSessionBackend(str(path)), **options)
+
+
+def _increment(session, version):
+    session['count'] += 1
+    return True
+
+
+def _worker(path, session_id, changes):
+    store = _store(path)
+    for _ in range(changes):
+        store.modify(session_id, _increment, retries=50)
+
+
+def test_stores_on_one_file_share_sessions(tmp_path):
+    path = tmp_path / 'sessions.sqlite3'
+    first, second = _store(path), _store(path)
+    first.put('a', {'count': 1})
+    assert second.get('a') == {'count': 1}
+
+    second.put('a', {'count': 2})
+    # The first store's cached copy is stale and is reloaded
+    assert first.get('a') == {'count': 2}
+    assert first.get_versioned('a')[1] == 2
+
+
+def test_stale_writes_are_refused(tmp_path):
+    path = tmp_path / 'sessions.sqlite3'
+    first, second = _store(path), _store(path)
+    first.put('a', {'count': 0})
+    second.put('a', {'count': 5}, expected_version=1)
+    with pytest.raises(SessionConflict):
+        first.put('a', {'count': 1}, expected_version=1)
+
+
+def test_modify_reruns_a_change_on_the_newer_version(tmp_path):
+    path = tmp_path / 'sessions.sqlite3'
+    first, second = _store(path), _store(path)
+    first.put('a', {'count': 0})
+
+    def interleaved(session, version):
+        if version == 1:
+            second.modify('a', _increment)  # Another worker saves in between
+        session['count'] += 10
+        return True
+
+    assert first.modify('a', interleaved) == {'count': 11}
+    assert second.get('a') == {'count': 11}
+    assert first.stats()['conflicts'] == 1
+
+
+def test_deleted_and_purged_sessions_are_gone_everywhere(tmp_path):
+    path = tmp_path / 'sessions.sqlite3'
+    first, second = _store(path), _store(path, idle_ttl=0, purge_interval=0)
+    first.put('a', {'count': 0})
+    first.put('b', {'count': 0})
+    assert second.get('a') is not None
+    first.delete('a')
+    assert second.get('a') is None
+
+    second.put('c', {'count': 0})  # Saving sweeps idle sessions
+    assert first.get('b') is None
+
+
+def test_game_sessions_round_trip_through_the_backend(tmp_path):
+    path = tmp_path / 'sessions.sqlite3'
+    options = {'dumps': SimpleGameSession.to_snapshot, 'loads': SimpleGameSession.from_snapshot}
+    first, second = _store(path, **options), _store(path, **options)
+    session = SimpleGameSession()
+    session.new_hand(10)
+    first.put(session.session_id, session)
+    assert second.get(session.session_id).to_dict() == session.to_dict()
+
+
+def test_concurrent_processes_never_lose_a_change(tmp_path):
+    path = tmp_path / 'sessions.sqlite3'
+    _store(path).put('shared', {'count': 0})
+    context = multiprocessing.get_context('fork')
+    workers = [context.Process(target=_worker, args=(path, 'shared', 50)) for _ in range(3)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(60)
+    assert [worker.exitcode for worker in workers] == [0, 0, 0]
+    assert _store(path).get('shared') == {'count': 150}
@@ -0,0 +1,125 @@
+import threading
+
+import pytest
+
+from simple_complete_app import app, sessions
+
+
+@pytest.fixture
+def client():
+    return app.test_client()
+
+
+def _new_session(client):
+    data = client.post('/api/new_session', json={'starting_bankroll': 1000}).get_json()
+    return data['session_id'], data['version']
+
+
+def _bet(client, session_id, **fields):
+    return client.post('/api/place_bet', json={'session_id': session_id, 'bet_amount': 10, **fields})
+
+
+def _deal(client, session_id):
+    """Deal until a hand needs decisions (a dealt blackjack settles at once)"""
+    while True:
+        data = _bet(client, session_id).get_json()
+        if data['game_state']['game_phase'] == 'playing':
+            return data
+
+
+def test_retried_request_is_applied_once(client):
+    session_id, _ = _new_session(client)
+    first = _bet(client, session_id, request_id='bet-1').get_json()
+    retry = _bet(client, session_id, request_id='bet-1').get_json()
+
+    assert not first['replayed'] and retry['replayed']
+    assert retry['version'] == first['version']
+    assert retry['game_state'] == first['game_state']
+    assert retry['game_state']['stats']['total_wagered'] == 10
+
+
+def test_new_request_id_acts_again(client):
+    session_id, _ = _new_session(client)
+    _bet(client, session_id, request_id='bet-1')
+    state = sessions.get(session_id)
+    while state.game_phase == 'playing':
+        client.post('/api/player_action', json={'session_id': session_id, 'action': 'stand'})
+        state = sessions.get(session_id)
+    data = _bet(client, session_id, request_id='bet-2').get_json()
+    assert not data['replayed']
+    assert data['game_state']['stats']['total_wagered'] == 20
+
+
+def test_stale_expected_version_gets_409_with_current_state(client):
+    session_id, version = _new_session(client)
+    data = _bet(client, session_id, expected_version=version).get_json()
+    assert data['version'] == version + 1
+
+    response = _bet(client, session_id, expected_version=version)
+    assert response.status_code == 409
+    conflict = response.get_json()
+    assert conflict['version'] == version + 1
+    assert conflict['game_state'] == data['game_state']
+
+
+def test_retry_of_an_applied_request_is_not_a_conflict(client):
+    session_id, version = _new_session(client)
+    first = _bet(client, session_id, request_id='bet-1', expected_version=version).get_json()
+    retry = _bet(client, session_id, request_id='bet-1', expected_version=version)
+    assert retry.status_code == 200
+    assert retry.get_json()['replayed']
+    assert retry.get_json()['version'] == first['version']
+
+
+@pytest.mark.parametrize('request_id', ['', 7, 'x' * 65])
+def test_invalid_request_ids_are_rejected(client, request_id):
+    session_id, _ = _new_session(client)
+    assert _bet(client, session_id, request_id=request_id).status_code == 400
+
+
+def test_concurrent_changes_from_one_version_apply_once():
+    client = app.test_client()
+    session_id, _ = _new_session(client)
+    version = _deal(client, session_id)['version']
+    statuses = []
+
+    def hit():
+        response = app.test_client().post('/api/player_action', json={
+            'session_id': session_id, 'action': 'hit', 'expected_version': version})
+        statuses.append(response.status_code)
+
+    threads = [threading.Thread(target=hit) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(statuses) == [200] + [409] * 7
+    assert sessions.get_versioned(session_id)[1] == version + 1
+
+
+def test_concurrent_requests_without_versions_all_apply():
+    client = app.test_client()
+    session_id, _ = _new_session(client)
+
+    def bet_and_stand(index):
+        for round_number in range(10):
+            local = app.test_client()
+            local.post('/api/place_bet', json={'session_id': session_id, 'bet_amount': 10,
+                                               'request_id': f'bet-{index}-{round_number}'})
+            local.post('/api/player_action', json={'session_id': session_id, 'action': 'stand',
+                                                   'request_id': f'stand-{index}-{round_number}'})
+
+    threads = [threading.Thread(target=bet_and_stand, args=(index,)) for index in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    session = sessions.get(session_id)
+    stats = session.stats
+    settled = stats['hands_won'] + stats['hands_lost'] + stats['hands_pushed']
+    open_bets = sum(hand.bet for hand in session.player_hands) if session.game_phase == 'playing' else 0
+    assert stats['total_wagered'] == 10 * session.hands_played + open_bets
+    assert session.current_bankroll == 1000 + session.session_profit - open_bets
+    assert settled >= session.hands_played
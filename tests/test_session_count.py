@@ -0,0 +1,52 @@
+from simple_complete_app import SimpleCard, SimpleGameSession
+
+
+def _recount(session):
+    return sum(SimpleCard.from_id(card_id).get_count_value('Hi-Lo') for card_id in session.deck.shoe.dealt())
+
+
+def _play_hands(session, hands):
+    for _ in range(hands):
+        session.new_hand(10)
+        while session.game_phase == 'playing':
+            session.player_action('stand')
+
+
+def test_running_count_follows_the_shoe():
+    session = SimpleGameSession(starting_bankroll=100000)
+    _play_hands(session, 20)
+    assert session.running_count == _recount(session)
+    assert session.to_dict()['running_count'] == session.running_count
+    info = session.get_count_info()
+    assert info['cards_seen'] == session.deck.shoe.cursor
+    assert 'side_counts' in info
+
+
+def test_running_count_resets_when_the_shoe_is_shuffled():
+    session = SimpleGameSession(starting_bankroll=100000)
+    _play_hands(session, 5)
+    session.deck.reset()
+    assert session.running_count == 0
+    assert session.get_true_count() == 0
+
+
+def test_shoe_reshuffle_mid_session_restarts_the_count():
+    session = SimpleGameSession(starting_bankroll=1000000)
+    shuffled = False
+    for _ in range(200):
+        cursor = session.deck.shoe.cursor
+        _play_hands(session, 1)
+        shuffled = shuffled or session.deck.shoe.cursor < cursor
+        assert session.running_count == _recount(session)
+    assert shuffled
+
+
+def test_restored_session_rebuilds_its_count():
+    session = SimpleGameSession(starting_bankroll=100000)
+    _play_hands(session, 15)
+    restored = SimpleGameSession.from_snapshot(session.to_snapshot())
+    assert restored.running_count == session.running_count
+    assert restored.get_count_info() == session.get_count_info()
+
+    restored.new_hand(10)
+    assert restored.running_count == _recount(restored)
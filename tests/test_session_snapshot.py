@@ -0,0 +1,80 @@
+import pickle
+
+import pytest
+
+from simple_complete_app import (SNAPSHOT_HEADER, SNAPSHOT_TOTALS, SNAPSHOT_VERSION,
+                                 SimpleGameSession)
+
+
+def _session_mid_hand():
+    """A session with a split hand in play and some history"""
+    for _ in range(500):
+        session = SimpleGameSession(starting_bankroll=1000.5)
+        for _ in range(3):
+            session.new_hand(10)
+            while session.game_phase == 'playing':
+                session.player_action('stand')
+        session.new_hand(12.5)
+        if session.game_phase == 'playing' and session.player_hands[0].can_split():
+            session.player_action('split')
+            session.player_hands[1].is_split = True
+            session.last_request_id = 'retry-key'
+            return session
+    pytest.fail('never dealt a pair')
+
+
+def _as_v1(data):
+    """The same snapshot in the version 1 layout (no request id)"""
+    offset = SNAPSHOT_HEADER.size + SNAPSHOT_TOTALS.size
+    return data[:3] + bytes((1,)) + data[4:offset] + data[offset + 1 + data[offset]:]
+
+
+def test_round_trip_keeps_the_game_state():
+    session = _session_mid_hand()
+    restored = SimpleGameSession.from_snapshot(session.to_snapshot())
+
+    state = session.to_dict()
+    state['stats'] = dict(state['stats'], decisions=[])
+    assert restored.to_dict() == state
+    assert restored.last_request_id == 'retry-key'
+    assert bytes(restored.deck.shoe.cards) == bytes(session.deck.shoe.cards)
+    assert restored.deck.shoe.cursor == session.deck.shoe.cursor
+    assert restored.player_hands[1].is_split
+    assert restored.to_snapshot() == session.to_snapshot()
+
+
+def test_restored_session_plays_on_identically():
+    session = _session_mid_hand()
+    restored = SimpleGameSession.from_snapshot(session.to_snapshot())
+    for game in (session, restored):
+        while game.game_phase == 'playing':
+            game.player_action('hit' if game.player_hands[game.current_hand].get_value() < 17 else 'stand')
+    assert restored.to_dict()['player_hands'] == session.to_dict()['player_hands']
+    assert restored.current_bankroll == session.current_bankroll
+
+
+def test_snapshot_is_far_smaller_than_a_pickle():
+    session = _session_mid_hand()
+    assert len(session.to_snapshot()) * 5 < len(pickle.dumps(session))
+
+
+def test_version_1_snapshots_still_load():
+    session = _session_mid_hand()
+    restored = SimpleGameSession.from_snapshot(_as_v1(session.to_snapshot()))
+    assert restored.last_request_id is None
+    assert restored.to_dict()['player_hands'] == session.to_dict()['player_hands']
+
+
+@pytest.mark.parametrize('version', [0, SNAPSHOT_VERSION + 1, 255])
+def test_unknown_versions_are_rejected(version):
+    data = bytearray(_session_mid_hand().to_snapshot())
+    data[3] = version
+    with pytest.raises(ValueError):
+        SimpleGameSession.from_snapshot(bytes(data))
+
+
+def test_other_data_is_rejected():
+    data = _session_mid_hand().to_snapshot()
+    for corrupt in (b'', b'XYZ' + data[3:], data[:40], data[:-1], data + b'\x00'):
+        with pytest.raises(ValueError):
+            SimpleGameSession.from_snapshot(corrupt)
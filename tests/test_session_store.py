@@ -0,0 +1,85 @@
+import time
+
+import pytest
+
+from session_store import SessionConflict, SessionStore, approximate_size
+
+
+def _store(**limits):
+    return SessionStore(size_of=lambda session: session.get('size', 1), **limits)
+
+
+def test_idle_sessions_expire():
+    store = _store(idle_ttl=0.05)
+    store.put('a', {})
+    assert store.get('a') is not None
+    time.sleep(0.1)
+    assert store.get('a') is None
+    assert 'a' not in store
+    assert store.stats()['evictions']['expired'] == 1
+
+
+def test_using_a_session_keeps_it_alive():
+    store = _store(idle_ttl=0.15)
+    store.put('a', {})
+    for _ in range(4):
+        time.sleep(0.05)
+        assert store.get('a') is not None
+
+
+def test_least_recently_used_session_goes_over_capacity():
+    store = _store(max_sessions=2)
+    store.put('a', {})
+    store.put('b', {})
+    store.get('a')
+    store.put('c', {})
+    assert 'b' not in store
+    assert 'a' in store and 'c' in store
+    assert store.stats()['evictions']['capacity'] == 1
+
+
+def test_memory_cap_evicts_oldest_but_keeps_the_newest():
+    store = _store(max_bytes=100)
+    store.put('a', {'size': 40})
+    store.put('b', {'size': 40})
+    store.put('c', {'size': 40})
+    assert len(store) == 2 and 'a' not in store
+    assert store.stats()['bytes'] == 80
+
+    store.put('huge', {'size': 500})
+    assert len(store) == 1 and 'huge' in store
+    assert store.stats()['evictions']['memory'] == 3
+
+
+def test_put_refreshes_the_size_estimate():
+    store = _store()
+    session = {'size': 10}
+    store.put('a', session)
+    session['size'] = 30
+    store.put('a', session)
+    assert store.stats()['bytes'] == 30
+
+
+def test_versions_and_conflicts():
+    store = _store()
+    assert store.put('a', {}) == 1
+    assert store.put('a', {}, expected_version=1) == 2
+    with pytest.raises(SessionConflict):
+        store.put('a', {}, expected_version=1)
+    assert store.get_versioned('a')[1] == 2
+
+
+def test_stats_count_hits_and_misses():
+    store = _store()
+    store.put('a', {})
+    store.get('a')
+    store.get('missing')
+    stats = store.stats()
+    assert (stats['hits'], stats['misses'], stats['hit_rate']) == (1, 1, 0.5)
+    assert store.delete('a') and not store.delete('a')
+
+
+def test_approximate_size_counts_shared_objects_once():
+    shared = list(range(1000))
+    assert approximate_size([shared, shared]) < 2 * approximate_size(shared)
+    assert approximate_size({'cards': shared}) > approximate_size(shared)
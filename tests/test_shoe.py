@@ -0,0 +1,52 @@
+import pickle
+import random
+from collections import Counter
+
+from game_engine import Deck
+from shoe import CARD_VALUES, Shoe, card_rank, card_suit
+
+
+def test_shoe_deals_every_card_once_per_shuffle():
+    shoe = Shoe(2, rng=random.Random(1), min_cards=0)
+    dealt = [shoe.deal() for _ in range(104)]
+    assert Counter(dealt) == Counter({card_id: 2 for card_id in range(52)})
+    assert shoe.remaining == 0 and shoe.penetration() == 1.0
+
+
+def test_shoe_reshuffles_below_its_minimum():
+    shoe = Shoe(1, rng=random.Random(2), min_cards=20)
+    for _ in range(33):
+        shoe.deal()
+    assert shoe.remaining == 19
+    shoe.deal()
+    assert shoe.remaining == 51
+
+
+def test_restored_shoe_deals_the_same_cards():
+    shoe = Shoe(6, rng=random.Random(3))
+    for _ in range(40):
+        shoe.deal()
+    restored = Shoe.restore(shoe.dealt() + shoe.undealt(), shoe.cursor)
+    assert restored.dealt() == shoe.dealt()
+    assert [restored.deal() for _ in range(50)] == [shoe.deal() for _ in range(50)]
+
+
+def test_pickled_shoe_keeps_its_order_and_position():
+    shoe = Shoe(1, rng=random.Random(4))
+    shoe.deal()
+    copy = pickle.loads(pickle.dumps(shoe))
+    assert copy.cursor == 1 and copy.undealt() == shoe.undealt()
+
+
+def test_card_ids_encode_suit_and_rank():
+    assert (card_suit(0), card_rank(0), CARD_VALUES[0]) == (0, '2', 2)
+    assert (card_suit(51), card_rank(51), CARD_VALUES[51]) == (3, 'A', 11)
+    assert CARD_VALUES[13 + 10] == 10  # Queen
+
+
+def test_deck_views_follow_the_shoe():
+    deck = Deck(1, rng=random.Random(5))
+    first = deck.deal_card()
+    assert deck.dealt_cards == [first]
+    assert len(deck.cards) == 51
+    assert deck.cards[-1].card_id == deck.shoe.undealt()[0]  # Next card last
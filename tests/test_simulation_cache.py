@@ -0,0 +1,76 @@
+import threading
+import time
+
+from monte_carlo import MonteCarloSimulator
+from simulation_cache import SimulationResultCache
+
+
+def test_unseeded_runs_are_never_cached():
+    simulator = MonteCarloSimulator()
+    first = simulator.run_simulation(num_hands=500, engine='batch')
+    second = simulator.run_simulation(num_hands=500, engine='batch')
+    assert not first['from_cache'] and not second['from_cache']
+    assert len(simulator.results_cache) == 0
+
+
+def test_seeded_runs_are_served_from_cache():
+    simulator = MonteCarloSimulator()
+    first = simulator.run_simulation(num_hands=500, engine='batch', seed=3)
+    second = simulator.run_simulation(num_hands=500, engine='batch', seed=3)
+    assert not first['from_cache'] and second['from_cache']
+    assert second['net_result'] == first['net_result']
+
+
+def test_cache_is_consistent_under_concurrent_use(tmp_path):
+    cache = SimulationResultCache(max_entries=8, cache_dir=str(tmp_path))
+    errors = []
+
+    def worker(offset):
+        try:
+            for index in range(200):
+                params = {'seed': (offset + index) % 20}
+                cache.put(params, {'value': params['seed']})
+                cached = cache.get(params)
+                assert cached is None or cached['value'] == params['seed']
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(offset,)) for offset in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(cache) <= 8
+    assert cache.hits + cache.misses == 8 * 200
+
+
+def test_seeded_time_boxed_runs_are_not_cached():
+    simulator = MonteCarloSimulator()
+    simulator.run_simulation(num_hands=500, engine='batch', seed=3, time_budget=1.0)
+    assert len(simulator.results_cache) == 0
+
+
+def test_disk_tier_keeps_the_most_recently_used_files(tmp_path):
+    cache = SimulationResultCache(max_entries=1, cache_dir=str(tmp_path), max_disk_entries=3)
+    for seed in range(3):
+        cache.put({'seed': seed}, {'value': seed})
+        time.sleep(0.01)
+    cache.clear()
+    assert cache.get({'seed': 0}) == {'value': 0}  # Read back from disk, so recently used
+    time.sleep(0.01)
+    cache.put({'seed': 3}, {'value': 3})
+
+    cache.clear()
+    assert len(list(tmp_path.glob('*.pkl'))) == 3
+    assert cache.get({'seed': 1}) is None
+    assert cache.get({'seed': 0}) == {'value': 0}
+
+
+def test_expired_disk_entries_are_deleted(tmp_path):
+    cache = SimulationResultCache(max_age=0.01, cache_dir=str(tmp_path))
+    cache.put({'seed': 1}, {'value': 1})
+    time.sleep(0.02)
+    assert cache.get({'seed': 1}) is None
+    assert list(tmp_path.glob('*.pkl')) == []
@@ -0,0 +1,72 @@
+import threading
+import time
+
+import pytest
+
+from simulation_jobs import JobQueueFull, SimulationJobManager
+
+
+def _wait(job, statuses=('completed', 'failed', 'cancelled')):
+    deadline = time.time() + 10
+    while job.status not in statuses and time.time() < deadline:
+        time.sleep(0.005)
+    return job.status
+
+
+def _blocked_runner(release):
+    def runner(job):
+        while not release.wait(0.005):
+            job.report(0.5)
+        return {'done': True}
+    return runner
+
+
+def test_completed_job_keeps_its_result():
+    manager = SimulationJobManager()
+    job = manager.submit(lambda job: {'value': 42}, {})
+    assert _wait(job) == 'completed'
+    assert job.to_dict()['result'] == {'value': 42}
+    assert job.to_dict()['progress'] == 1.0
+
+
+def test_failed_job_reports_its_error():
+    def runner(job):
+        raise ValueError('bad parameters')
+
+    job = SimulationJobManager().submit(runner, {})
+    assert _wait(job) == 'failed'
+    assert job.error == 'bad parameters'
+
+
+def test_running_job_stops_at_its_next_report():
+    manager = SimulationJobManager()
+    job = manager.submit(_blocked_runner(threading.Event()), {})
+    assert _wait(job, ('running',)) == 'running'
+    manager.cancel(job.job_id)
+    assert _wait(job) == 'cancelled'
+    assert job.result is None
+
+
+def test_queued_job_cancelled_before_it_starts_never_runs():
+    manager = SimulationJobManager(max_workers=1)
+    release = threading.Event()
+    blocker = manager.submit(_blocked_runner(release), {})
+    started = []
+    queued = manager.submit(lambda job: started.append(job), {})
+    manager.cancel(queued.job_id)
+    assert queued.status == 'cancelled'
+
+    release.set()
+    assert _wait(blocker) == 'completed'
+    manager.executor.shutdown(wait=True)
+    assert started == []
+
+
+def test_full_queue_refuses_new_jobs():
+    manager = SimulationJobManager(max_workers=1, max_pending=2)
+    release = threading.Event()
+    for _ in range(2):
+        manager.submit(_blocked_runner(release), {})
+    with pytest.raises(JobQueueFull):
+        manager.submit(_blocked_runner(release), {})
+    release.set()
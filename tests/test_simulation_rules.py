@@ -0,0 +1,32 @@
+import numpy as np
+
+from batch_engine import BatchSimulator
+from decision_table import DecisionTable
+from ev_solver import RuleSet
+from monte_carlo import MonteCarloSimulator
+from strategy_tables import BasicStrategy
+
+
+def _table(**rules):
+    return DecisionTable(BasicStrategy(RuleSet(**rules))).actions
+
+
+def test_simulator_plays_the_strategy_for_its_dealer_rules():
+    simulator = MonteCarloSimulator()
+    assert simulator.batch_engine.hit_soft_17
+    assert simulator.batch_engine.basic_strategy is simulator.basic_strategy
+    assert np.array_equal(simulator.decision_table.actions, _table(hit_soft_17=True))
+    # The H17 chart doubles 11 against an ace, the S17 chart hits it
+    assert simulator.decision_table.decide_one(11, False, 11) != DecisionTable(BasicStrategy()).decide_one(11, False, 11)
+
+
+def test_simulator_rules_reach_both_engines():
+    simulator = MonteCarloSimulator(rules=RuleSet(hit_soft_17=False, double_after_split=False))
+    engine = simulator.batch_engine
+    assert (engine.hit_soft_17, engine.double_after_split, engine.surrender) == (False, False, True)
+    assert np.array_equal(simulator.decision_table.actions, _table(double_after_split=False))
+
+
+def test_batch_engine_defaults_to_the_strategy_for_its_rules():
+    assert np.array_equal(BatchSimulator().decision_table.actions, _table(hit_soft_17=True))
+    assert np.array_equal(BatchSimulator(hit_soft_17=False).decision_table.actions, _table())
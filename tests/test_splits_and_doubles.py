@@ -0,0 +1,121 @@
+import numpy as np
+
+from batch_engine import BatchSimulator
+from decision_table import DOUBLE, HIT, SPLIT, STAND, SURRENDER, DecisionTable, DeviationOverlay
+from game_engine import Card, Deck, Hand
+from monte_carlo import MonteCarloSimulator
+
+
+def _always_double_ten():
+    """Overlay that doubles hard 10 against a ten at any count"""
+    return DeviationOverlay().add_plays([(10, 10, -100, 'double')])
+
+
+def test_count_overlay_never_replaces_a_split():
+    table = MonteCarloSimulator().counting_table
+    for true_count in (-2, 0, 1, 3, 5):
+        assert table.decide_one(16, False, 10, True, 8, true_count, can_surrender=True) == SPLIT
+        action = table.decide(np.array([16]), np.array([False]), np.array([10]), np.array([True]),
+                              np.array([8]), np.array([float(true_count)]),
+                              can_surrender=np.array([True]))
+        assert action.tolist() == [SPLIT]
+
+
+def test_overlay_double_falls_back_when_doubling_is_not_allowed():
+    table = DecisionTable().with_overlay(_always_double_ten())
+    assert table.decide_one(10, False, 10, True, true_count=5) == DOUBLE
+    assert table.decide_one(10, False, 10, False, true_count=5) == HIT
+
+    action = table.decide(np.array([10, 10]), np.array([False, False]), np.array([10, 10]),
+                          np.array([True, False]), true_count=np.array([5.0, 5.0]))
+    assert action.tolist() == [DOUBLE, HIT]
+
+
+def test_overlay_double_on_soft_hand_falls_back_to_stand():
+    overlay = DeviationOverlay().add_plays([(18, 6, -100, 'double')])
+    table = DecisionTable().with_overlay(overlay)
+    assert table.decide_one(18, True, 6, False, true_count=0) == STAND
+
+
+class _DoubleOnTen:
+    """Table stub that asks for a double on every hard 10, however many cards"""
+
+    def decide(self, total, soft, upcard, can_double=True, pair_value=0, true_count=None,
+               can_surrender=False):
+        total = np.asarray(total)
+        return np.where(total == 10, DOUBLE, np.where(total >= 17, STAND, HIT))
+
+
+def test_batch_engine_does_not_double_three_card_hands():
+    engine = BatchSimulator(surrender=False)
+    # Player 2,3 against 10,7; hits 5 (three-card 10), then 10
+    slab = np.array([[2, 10, 3, 7, 5, 10, 2, 2, 2, 2, 2, 2]])
+    result = engine.play(slab, decision_table=_DoubleOnTen())
+    assert result['multiplier'].tolist() == [1]
+    assert result['net'].tolist() == [1]
+
+
+def test_batch_engine_doubles_two_card_hands():
+    engine = BatchSimulator(surrender=False)
+    # Player 6,4 against 10,7 doubles and draws 10
+    slab = np.array([[6, 10, 4, 7, 10, 2, 2, 2, 2, 2, 2, 2]])
+    result = engine.play(slab, decision_table=_DoubleOnTen())
+    assert result['multiplier'].tolist() == [2]
+    assert result['net'].tolist() == [2]
+
+
+def test_scalar_simulator_does_not_double_three_card_hands():
+    simulator = MonteCarloSimulator()
+    deck = Deck(num_decks=1)
+    # Card ids are suit * 13 + rank index ('2' is 0, '5' is 3, '7' is 5, '10' is 8)
+    order = [0, 1, 8, 5, 3, 21]
+    deck.shoe.cards = bytearray(order + [card_id for card_id in range(52) if card_id not in order])
+    deck.shoe.cursor = 0
+
+    def double_on_ten(hand, *args):
+        value = hand.get_value()
+        return DOUBLE if value == 10 else STAND if value >= 17 else HIT
+
+    simulator._get_optimal_action = double_on_ten
+    result = simulator._simulate_hand(deck, 10, 'Basic Strategy Only', 0, 0)
+    assert result['bet'] == 10
+    assert result['player_value'] == 20
+    assert result['outcome'] == 'win'
+
+
+def _stacked_deck(order):
+    deck = Deck(num_decks=1)
+    deck.shoe.cards = bytearray(order + [card_id for card_id in range(52) if card_id not in order])
+    deck.shoe.cursor = 0
+    return deck
+
+
+def test_both_engines_keep_hitting_a_multi_ace_soft_17():
+    # Player A,5 against 2 (hole 10) hits an ace: A,A,5 is soft 17 and hits
+    # again, drawing a 3 for soft 20; the dealer draws 5 for 17
+    result = MonteCarloSimulator()._simulate_hand(_stacked_deck([12, 3, 0, 8, 25, 1, 16]),
+                                                  10, 'Basic Strategy Only', 0, 0)
+    assert (result['player_value'], result['dealer_value'], result['outcome']) == (20, 17, 'win')
+
+    slab = np.array([[11, 2, 5, 10, 11, 3, 5, 2, 2, 2, 2, 2]])
+    assert BatchSimulator().play(slab, decision_table=DecisionTable())['net'].tolist() == [1]
+
+
+def test_both_engines_hit_a_multi_ace_soft_17_dealer_under_h17():
+    # Player 10,8 against A,A; the dealer draws 5 (soft 17), hits and draws a 3 for 20
+    simulator = MonteCarloSimulator()
+    assert simulator.batch_engine.hit_soft_17
+    result = simulator._simulate_hand(_stacked_deck([8, 6, 12, 25, 3, 1]), 10, 'Basic Strategy Only', 0, 0)
+    assert (result['player_value'], result['dealer_value'], result['outcome']) == (18, 20, 'loss')
+
+    slab = np.array([[10, 11, 8, 11, 5, 3, 2, 2, 2, 2, 2, 2]])
+    assert BatchSimulator().play(slab, decision_table=DecisionTable())['net'].tolist() == [-1]
+
+
+def test_hand_with_two_aces_counting_one_as_eleven_is_soft():
+    hand = Hand()
+    for card_id in (12, 25, 3):
+        hand.add_card(Card.from_id(card_id))
+    assert (hand.get_value(), hand.is_soft()) == (17, True)
+    hand.add_card(Card.from_id(8))
+    assert (hand.get_value(), hand.is_soft()) == (17, False)
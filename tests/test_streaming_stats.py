@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from simulation_stats import StreamingStats
+
+
+def _hands(n, seed=1):
+    rng = np.random.default_rng(seed)
+    wagered = rng.choice([100.0, 200.0, 400.0], size=n)
+    outcome = rng.choice([-1, 0, 1], size=n, p=[0.48, 0.09, 0.43])
+    return wagered * outcome, wagered, outcome
+
+
+def _scalar(net, wagered, outcome, max_points=50):
+    stats = StreamingStats(max_points)
+    for values in zip(net.tolist(), wagered.tolist(), outcome.tolist()):
+        stats.update(*values)
+    return stats
+
+
+def _batched(net, wagered, outcome, chunk, max_points=50):
+    stats = StreamingStats(max_points)
+    for start in range(0, len(net), chunk):
+        end = start + chunk
+        stats.update_batch(net[start:end], wagered[start:end], outcome[start:end])
+    return stats
+
+
+@pytest.mark.parametrize('chunk', [1, 7, 128, 5000])
+def test_batches_match_hand_by_hand_updates(chunk):
+    hands = _hands(3000)
+    scalar = _scalar(*hands)
+    batched = _batched(*hands, chunk=chunk)
+
+    for name in ('count', 'hands_won', 'hands_lost', 'hands_pushed', 'stride'):
+        assert getattr(batched, name) == getattr(scalar, name)
+    for name in ('mean_net', 'mean_wagered', 'm2_net', 'm2_wagered', 'co_moment',
+                 'total_net', 'bankroll', 'max_drawdown', 'min_bankroll', 'max_bankroll'):
+        assert getattr(batched, name) == pytest.approx(getattr(scalar, name))
+    assert batched.trajectory == pytest.approx(scalar.trajectory)
+
+
+def test_moments_match_numpy():
+    net, wagered, outcome = _hands(2000)
+    stats = _batched(net, wagered, outcome, chunk=300)
+    assert stats.m2_net / stats.count == pytest.approx(net.var())
+    assert stats.co_moment / stats.count == pytest.approx(np.cov(net, wagered, bias=True)[0, 1])
+
+
+def test_trajectory_samples_every_stride_hands():
+    net, wagered, outcome = _hands(1000)
+    stats = _batched(net, wagered, outcome, chunk=64, max_points=20)
+    assert len(stats.trajectory) < 20
+    expected = np.cumsum(net)[stats.stride - 1::stats.stride][:len(stats.trajectory)]
+    assert stats.trajectory == pytest.approx(expected.tolist())
@@ -0,0 +1,89 @@
+import pytest
+
+from bankroll_risk import BetRamp
+from monte_carlo import MonteCarloSimulator
+from simple_complete_app import ENGINE_RAMP_COUNTS, app, monte_carlo_ramp
+
+
+@pytest.fixture
+def client():
+    return app.test_client()
+
+
+def _timed_run(num_hands, time_budget):
+    return MonteCarloSimulator().run_simulation(num_hands=num_hands, engine='batch', seed=7,
+                                                 use_cache=False, time_budget=time_budget)
+
+
+def test_small_hand_cap_is_played_in_full():
+    results = _timed_run(300, 0.5)
+    assert results['statistics']['hands'] == 300
+    assert not results['time_budget']['exhausted']
+
+
+def test_hand_cap_remainder_below_min_chunk_is_played():
+    results = _timed_run(2300, 5.0)
+    assert results['statistics']['hands'] == 2300
+    assert not results['time_budget']['exhausted']
+
+
+def test_short_budget_stops_before_the_cap():
+    results = _timed_run(10000000, 0.2)
+    assert 0 < results['statistics']['hands'] < 10000000
+    assert results['time_budget']['exhausted']
+
+
+@pytest.mark.parametrize('budget', ['fast', True, [], {'ms': 100}])
+def test_invalid_time_budget_is_rejected(client, budget):
+    response = client.post('/api/monte_carlo', json={'time_budget_ms': budget})
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize('max_hands', ['many', 0, 2.5])
+def test_invalid_timed_hand_cap_is_rejected(client, max_hands):
+    response = client.post('/api/monte_carlo', json={'time_budget_ms': 100, 'max_hands': max_hands})
+    assert response.status_code == 400
+
+
+def test_timed_run_over_http(client):
+    response = client.post('/api/monte_carlo', json={'time_budget_ms': 100, 'max_hands': 300})
+    assert response.status_code == 200
+    assert response.get_json()['total_hands'] == 300
+
+
+@pytest.mark.parametrize('engine', ['scalar', 'batch'])
+def test_bet_ramp_replaces_the_counting_bets(engine):
+    results = MonteCarloSimulator().run_simulation(num_hands=2000, engine=engine, seed=7, use_cache=False,
+                                                   strategy_type='Card Counting',
+                                                   bet_ramp=BetRamp({-100: 50}, min_bet=50))
+    # Every hand starts at 50; doubles and splits add to some
+    assert 50 <= results['average_bet'] < 60
+
+
+def test_count_strategies_bet_their_own_ramps():
+    average_bets = {}
+    for betting_strategy in ('basic_count', 'aggressive_count'):
+        results = MonteCarloSimulator().run_simulation(
+            num_hands=20000, engine='batch', seed=7, use_cache=False, strategy_type='Card Counting',
+            bet_ramp=monte_carlo_ramp(betting_strategy, ENGINE_RAMP_COUNTS, unit=10)
+        )
+        average_bets[betting_strategy] = results['average_bet']
+    assert average_bets['aggressive_count'] > average_bets['basic_count']
+
+
+@pytest.mark.parametrize('options', [
+    {'betting_strategy': 'martingale'},
+    {'betting_strategy': 'basic_count', 'counting_system': 'KO'}
+])
+def test_unsupported_timed_options_are_rejected(client, options):
+    response = client.post('/api/monte_carlo', json=dict(options, time_budget_ms=100, max_hands=300))
+    assert response.status_code == 400
+
+
+def test_timed_run_reports_the_count_it_used(client):
+    flat = client.post('/api/monte_carlo', json={'time_budget_ms': 100, 'max_hands': 300,
+                                                 'counting_system': 'KO'}).get_json()
+    counted = client.post('/api/monte_carlo', json={'time_budget_ms': 100, 'max_hands': 300,
+                                                    'betting_strategy': 'kelly'}).get_json()
+    assert flat['counting_system'] == 'None'
+    assert counted['counting_system'] == 'Hi-Lo'